@@ -3,22 +3,50 @@
 
 This script loads a graph saved in JSON format, runs the critic to
 produce an audit report and writes the report to a markdown file.
+
+With ``--memory`` the report gains a section that breaks the graph's
+memory down by structure and profiles a reasoning cycle on a copy of
+the graph (load, memetic evolution, quarantine, audit and save) stage
+by stage, see ``ultimai.memory``.
 """
 
 from __future__ import annotations
 
 import argparse
 import json
+import tempfile
 from pathlib import Path
 
 from ultimai.graph import ReasoningGraph
-from ultimai.critic import Critic
+from ultimai.critic import Critic, report_markdown
+from ultimai.memory import MemoryProfiler, markdown_section
+from ultimai.meta_synthesizer import MetaConfig, MetaSynthesizer
+
+
+def profile_cycle(graph_path: Path, iterations: int):
+    """Run one reasoning cycle on ``graph_path`` under a ``MemoryProfiler``."""
+    profiler = MemoryProfiler()
+    synth = MetaSynthesizer(MetaConfig(memetic_iterations=iterations), instrumentation=profiler)
+    try:
+        synth.load_data(json_path=str(graph_path))
+        synth.run_memetic()
+        synth.run_quarantine()
+        synth.audit()
+        with tempfile.TemporaryDirectory() as tmp:
+            synth.save_graph(str(Path(tmp) / "graph.json"))
+    finally:
+        profiler.stop()
+    return profiler.stages
 
 
 def main() -> None:
     parser = argparse.ArgumentParser(description="Generate an audit report for a reasoning graph")
     parser.add_argument('--graph', required=True, help='Path to the graph JSON file')
     parser.add_argument('--output', required=True, help='Output markdown file')
+    parser.add_argument('--memory', action='store_true',
+                        help='Add a memory accounting section (profiles one reasoning cycle)')
+    parser.add_argument('--memory-iterations', type=int, default=1,
+                        help='Memetic iterations in the profiled cycle (default 1)')
     args = parser.parse_args()
     rg = ReasoningGraph()
     rg.load(Path(args.graph))
@@ -27,9 +55,10 @@ def main() -> None:
     out_path = Path(args.output)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     with open(out_path, 'w', encoding='utf-8') as f:
-        f.write('# Audit Report\n\n')
-        for key, value in report.items():
-            f.write(f'**{key}**: {value}\n\n')
+        f.write(report_markdown(report))
+        if args.memory:
+            stages = profile_cycle(Path(args.graph), args.memory_iterations)
+            f.write(markdown_section(rg, stages))
     print(f"Report saved to {out_path}")
 
 
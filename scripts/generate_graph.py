@@ -4,82 +4,140 @@
 This script reads the seed data from a JSON file in `data/seeds.json`,
 builds a reasoning graph using the `ReasoningGraph` class and writes the
 resulting graph to JSON.  It will attempt to render an image if
-Graphviz or matplotlib is available.  When neither is available, it
-falls back to a simple textual representation.
+Graphviz or matplotlib is available.  Large graphs, and environments
+with neither, use the built-in renderer (``ultimai.render``) with a
+grid-approximated force-directed layout; ``--renderer text`` writes a
+simple textual representation instead.
 """
 
 from __future__ import annotations
 
 import argparse
 from pathlib import Path
+from typing import Optional
 
 from ultimai.ingestion import ingest_json
 from ultimai.graph import ReasoningGraph
+from ultimai.lod import summarise, write_text
+from ultimai.render import render
+from ultimai.utils import lazy_import
+
+RENDERERS = ('auto', 'graphviz', 'matplotlib', 'builtin', 'text')
+
+# Above this many nodes ``auto`` skips Graphviz and matplotlib, whose
+# layouts do not scale, and uses the built-in renderer.
+AUTO_BUILTIN_NODES = 2000
 
 # Use the same visualisation helpers as in the legacy script
-try:
-    import networkx as nx  # type: ignore
-except ImportError:
+nx = lazy_import("networkx")
+if nx is None:
     from ultimai import networkx_stub as nx  # type: ignore
 
 
-def draw_graph(g: nx.DiGraph, output: str) -> None:  # type: ignore
-    """Attempt to draw the graph using pygraphviz or matplotlib."""
-    # Attempt Graphviz via pygraphviz
+def draw_with_graphviz(g: nx.DiGraph, output: str) -> bool:  # type: ignore
     try:
-        import pygraphviz as pgv  # type: ignore
-        if hasattr(nx, 'nx_agraph'):
-            A = nx.nx_agraph.to_agraph(g)
-            A.layout('dot')
-            A.draw(output)
-            print(f"Graph image saved to {output} using Graphviz")
-            return
+        import pygraphviz as pgv  # type: ignore  # noqa: F401
     except ImportError:
-        pass
-    # Fallback to matplotlib
+        return False
+    if not hasattr(nx, 'nx_agraph'):
+        return False
+    A = nx.nx_agraph.to_agraph(g)
+    A.layout('dot')
+    A.draw(output)
+    print(f"Graph image saved to {output} using Graphviz")
+    return True
+
+
+def draw_with_matplotlib(g: nx.DiGraph, output: str) -> bool:  # type: ignore
     try:
         import matplotlib.pyplot as plt  # type: ignore
-        if hasattr(nx, 'spring_layout') and hasattr(nx, 'draw'):
-            pos = nx.spring_layout(g, seed=42)
-            labels = {n: data.get('label', n) for n, data in g.nodes(data=True)}  # type: ignore
-            plt.figure(figsize=(8, 6))
-            nx.draw(g, pos, labels=labels, with_labels=True, node_size=500, font_size=8)
-            # Avoid tight_layout warning on headless runners; remove axis for cleaner look
-            plt.axis("off")
-            try:
-                plt.savefig(output, bbox_inches="tight")
-                print(f"Graph image saved to {output} using matplotlib")
-            except Exception as e:
-                print(f"Matplotlib failed ({e}); kept text fallback at {output}.txt")
-            finally:
-                plt.close()
-            return
     except ImportError:
-        pass
-    # Final fallback: write a text representation
+        return False
+    if not (hasattr(nx, 'spring_layout') and hasattr(nx, 'draw')):
+        return False
+    pos = nx.spring_layout(g, seed=42)
+    labels = {n: data.get('label', n) for n, data in g.nodes(data=True)}  # type: ignore
+    plt.figure(figsize=(8, 6))
+    nx.draw(g, pos, labels=labels, with_labels=True, node_size=500, font_size=8)
+    # Avoid tight_layout warning on headless runners; remove axis for cleaner look
+    plt.axis("off")
+    try:
+        plt.savefig(output, bbox_inches="tight")
+        print(f"Graph image saved to {output} using matplotlib")
+    except Exception as e:
+        print(f"Matplotlib failed ({e})")
+        return False
+    finally:
+        plt.close()
+    return True
+
+
+def draw_with_builtin(g: nx.DiGraph, output: str) -> bool:  # type: ignore
+    render(g, Path(output))
+    print(f"Graph image saved to {output} using the built-in renderer")
+    return True
+
+
+def draw_text(g: nx.DiGraph, output: str) -> None:  # type: ignore
     text_output = output + ".txt"
-    with open(text_output, 'w', encoding='utf-8') as f:
-        f.write("Nodes:\n")
-        for n, attrs in g.nodes(data=True):  # type: ignore
-            f.write(f"  {n}: {attrs}\n")
-        f.write("Edges:\n")
-        for u, v, attrs in g.edges(data=True):  # type: ignore
-            f.write(f"  {u} -> {v}: {attrs}\n")
+    # ``g`` is already summarised by ``draw_graph``; nothing is collapsed here.
+    write_text(g, text_output, max_nodes=g.number_of_nodes())
     print(f"Graph text saved to {text_output}")
 
 
+def draw_graph(g: nx.DiGraph, output: str, renderer: str = 'auto',  # type: ignore
+               max_nodes: int = 500, expand: int = 0, focus: Optional[str] = None) -> None:
+    """Draw the graph with the chosen renderer.
+
+    Graphs with more than ``max_nodes`` nodes are first reduced to a
+    level-of-detail summary (``ultimai.lod.summarise``): communities
+    become super-nodes except the ``expand`` largest ones and the
+    neighbourhood of ``focus``.  ``auto`` tries Graphviz, then
+    matplotlib, then the built-in renderer, and goes straight to the
+    built-in renderer for graphs larger than ``AUTO_BUILTIN_NODES``.  A
+    renderer that is not installed falls back to the text representation.
+    """
+    g = summarise(g, max_nodes=max_nodes, expand=expand, focus=focus)
+    if renderer == 'text':
+        draw_text(g, output)
+        return
+    if renderer == 'auto':
+        chain = [draw_with_builtin]
+        if g.number_of_nodes() <= AUTO_BUILTIN_NODES:
+            chain = [draw_with_graphviz, draw_with_matplotlib, draw_with_builtin]
+    else:
+        chain = [{'graphviz': draw_with_graphviz, 'matplotlib': draw_with_matplotlib,
+                  'builtin': draw_with_builtin}[renderer]]
+    for draw in chain:
+        if draw(g, output):
+            return
+    draw_text(g, output)
+
+
 def main() -> None:
     parser = argparse.ArgumentParser(description="Generate a reasoning graph from seed data")
     parser.add_argument('--input', required=True, help='Path to JSON seed file')
     parser.add_argument('--output', required=True, help='Output JSON file for the graph')
+    parser.add_argument('--renderer', choices=RENDERERS, default='auto',
+                        help='How to draw the image written next to the JSON file')
+    parser.add_argument('--image-format', choices=('png', 'svg'), default='png',
+                        help='Image format (the built-in renderer supports both)')
+    parser.add_argument('--max-nodes', type=int, default=500,
+                        help='Summarise larger graphs into clusters before drawing')
+    parser.add_argument('--expand', type=int, default=0,
+                        help='Number of largest clusters to draw in full')
+    parser.add_argument('--focus', help='Node whose neighbourhood is drawn in full')
     args = parser.parse_args()
     rg = ingest_json(args.input)
+    if args.focus is not None and not rg.graph.has_node(args.focus):
+        parser.error(f"--focus {args.focus!r} is not a node of {args.input}")
     out_path = Path(args.output)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     rg.save(out_path)
     # Attempt to draw an image alongside the JSON
-    image_path = out_path.with_suffix('.png')
-    draw_graph(rg.graph, str(image_path))  # type: ignore
+    image_path = out_path.with_suffix('.' + args.image_format)
+    draw_graph(rg.graph, str(image_path), args.renderer,  # type: ignore
+               max_nodes=args.max_nodes, expand=args.expand, focus=args.focus)
 
 
 if __name__ == '__main__':
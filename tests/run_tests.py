@@ -5,57 +5,138 @@ This runner discovers modules in ``tests/`` whose names start with
 injects a temporary directory for functions expecting a single
 argument (``tmp_path``) and reports summary statistics.  The runner
 exits with status 1 if any test fails.
+
+Each test is timed and the slowest are listed at the end.  With
+``--jobs N`` tests are distributed over ``N`` worker processes; every
+test still gets its own ``tmp_path`` and each worker its own directory
+for ``tempfile``.  ``--budget SECONDS`` fails every test that takes
+longer, so performance regressions show up as test failures::
+
+    python tests/run_tests.py --jobs 4 --slowest 10 --budget 5
 """
 
 from __future__ import annotations
 
+import argparse
 import importlib
 import inspect
+import os
 import sys
+import tempfile
+import time
+from dataclasses import dataclass
 from pathlib import Path
 import pkgutil
 import traceback
 from tempfile import TemporaryDirectory
+from typing import List, Optional, Tuple
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_ROOT = TESTS_DIR.parent
+
+
+@dataclass
+class TestResult:
+    module: str
+    name: str
+    passed: bool
+    seconds: float = 0.0
+    error: str = ""
 
 
-def run() -> None:
-    tests_dir = Path(__file__).parent
+def _setup_path() -> None:
     # Ensure package import works from this directory
-    project_root = tests_dir.parent
-    if str(project_root) not in sys.path:
-        sys.path.insert(0, str(project_root))
-    failed = 0
-    total = 0
-    for module_info in pkgutil.iter_modules([str(tests_dir)]):
+    for path in (str(PROJECT_ROOT), str(TESTS_DIR)):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+
+def discover() -> Tuple[List[Tuple[str, str]], List[TestResult]]:
+    """Return the ``(module, function)`` tests and the modules that failed to import."""
+    _setup_path()
+    tests: List[Tuple[str, str]] = []
+    broken: List[TestResult] = []
+    for module_info in pkgutil.iter_modules([str(TESTS_DIR)]):
         if not module_info.name.startswith('test_'):
             continue
         module_name = module_info.name
         try:
             module = importlib.import_module(module_name)
         except Exception:
-            print(f"Failed to import {module_name}\n{traceback.format_exc()}")
-            failed += 1
+            broken.append(TestResult(module_name, "<import>", False, error=traceback.format_exc()))
             continue
         for name, func in inspect.getmembers(module, inspect.isfunction):
-            if not name.startswith('test_'):
-                continue
-            total += 1
+            if name.startswith('test_'):
+                tests.append((module_name, name))
+    return tests, broken
+
+
+def run_one(test: Tuple[str, str]) -> TestResult:
+    """Run one test function in this process and time it."""
+    module_name, name = test
+    _setup_path()
+    seconds = 0.0
+    try:
+        func = getattr(importlib.import_module(module_name), name)
+        argcount = func.__code__.co_argcount
+        if argcount > 1:
+            raise ValueError(f"Unsupported signature for {name}")
+        with TemporaryDirectory() as tmpdir:
+            args = (Path(tmpdir),) if argcount == 1 else ()
+            start = time.perf_counter()
             try:
-                if func.__code__.co_argcount == 0:
-                    func()
-                elif func.__code__.co_argcount == 1:
-                    with TemporaryDirectory() as tmpdir:
-                        func(Path(tmpdir))
-                else:
-                    raise ValueError(f"Unsupported signature for {name}")
-                print(f"PASS {module_name}:{name}")
-            except Exception:
-                failed += 1
-                print(f"FAIL {module_name}:{name}\n{traceback.format_exc()}")
-    print(f"Executed {total} tests, {failed} failures")
+                func(*args)
+            finally:
+                seconds = time.perf_counter() - start
+    except Exception:
+        return TestResult(module_name, name, False, seconds, traceback.format_exc())
+    return TestResult(module_name, name, True, seconds)
+
+
+def _init_worker(root: str) -> None:
+    # Give every worker its own temporary directory so tests that use
+    # ``tempfile`` directly cannot collide across processes.
+    tempfile.tempdir = tempfile.mkdtemp(prefix=f"worker-{os.getpid()}-", dir=root)
+    _setup_path()
+
+
+def run(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run the ULTIMAI test suite")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help='Worker processes (0 = one per CPU; default 1 runs in this process)')
+    parser.add_argument('--slowest', type=int, default=10, help='Number of slowest tests to list')
+    parser.add_argument('--budget', type=float, help='Fail tests that take longer than this many seconds')
+    args = parser.parse_args(argv)
+
+    tests, results = discover()
+    jobs = args.jobs if args.jobs > 0 else (os.cpu_count() or 1)
+    if jobs == 1 or len(tests) <= 1:
+        results += [run_one(test) for test in tests]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with TemporaryDirectory() as root:
+            with ProcessPoolExecutor(max_workers=min(jobs, len(tests)), initializer=_init_worker,
+                                     initargs=(root,)) as pool:
+                results += list(pool.map(run_one, tests))
+    failed = 0
+    for result in results:
+        if result.passed and args.budget is not None and result.seconds > args.budget:
+            result.passed = False
+            result.error = f"took {result.seconds:.2f}s, over the {args.budget:.2f}s budget\n"
+        if result.passed:
+            print(f"PASS {result.module}:{result.name} ({result.seconds:.3f}s)")
+        else:
+            failed += 1
+            print(f"FAIL {result.module}:{result.name}\n{result.error}")
+    timed = sorted((r for r in results if r.seconds), key=lambda r: r.seconds, reverse=True)
+    if args.slowest and timed:
+        print(f"Slowest {min(args.slowest, len(timed))} tests:")
+        for result in timed[:args.slowest]:
+            print(f"  {result.seconds:8.3f}s  {result.module}:{result.name}")
+    print(f"Executed {len(tests)} tests, {failed} failures")
     if failed:
         raise SystemExit(1)
 
 
 if __name__ == '__main__':
-    run()
\ No newline at end of file
+    run()
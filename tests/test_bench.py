@@ -0,0 +1,43 @@
+"""Tests for the synthetic benchmark suite in ultimai.bench."""
+
+from pathlib import Path
+
+from ultimai.bench import (
+    STAGES,
+    BenchConfig,
+    compare,
+    generate_graph,
+    load_results,
+    run_suite,
+    save_results,
+    seed_rows,
+)
+
+
+def test_generators_are_seeded() -> None:
+    for kind in ("er", "scale_free", "clustered"):
+        rows = list(seed_rows(kind, 200, seed=3))
+        assert rows == list(seed_rows(kind, 200, seed=3))
+        assert rows != list(seed_rows(kind, 200, seed=4))
+        assert all(r["source_id"] != r["target_id"] for r in rows)
+        assert len({(r["source_id"], r["target_id"]) for r in rows}) == len(rows)
+    rg = generate_graph("scale_free", 500, seed=1)
+    assert rg.graph.number_of_nodes() == 500
+    hub = max(rg.graph.in_degree(n) for n in rg.graph.nodes)
+    assert hub > 20
+
+
+def test_suite_round_trip_and_compare(tmp_path: Path) -> None:
+    configs = [BenchConfig(generator="clustered", nodes=150, path_queries=20),
+               BenchConfig(generator="er", nodes=150, stages=("audit", "paths"), memory=False)]
+    results = run_suite(configs, workdir=tmp_path)
+    save_results(results, tmp_path / "bench.json")
+    baseline = load_results(tmp_path / "bench.json")
+    assert list(baseline["runs"]["clustered-150"]["stages"]) == list(STAGES)
+    assert set(baseline["runs"]["er-150"]["stages"]) == {"audit", "paths"}
+    assert "peak_bytes" in baseline["runs"]["clustered-150"]["stages"]["load"]
+    assert not any(row["regressed"] for row in compare(results, baseline))
+    baseline["runs"]["er-150"]["stages"]["audit"]["seconds"] = 0.0
+    results["runs"]["er-150"]["stages"]["audit"]["seconds"] = 1.0
+    flagged = [(r["run"], r["stage"]) for r in compare(results, baseline, tolerance=0.5) if r["regressed"]]
+    assert flagged == [("er-150", "audit")]
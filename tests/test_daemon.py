@@ -0,0 +1,84 @@
+"""Tests for the resident graph daemon in ultimai.daemon."""
+
+import asyncio
+import json
+from pathlib import Path
+
+from ultimai.daemon import GraphDaemon
+from ultimai.graph import ReasoningGraph, NodeData
+
+
+def test_daemon_keeps_named_graphs_resident(tmp_path: Path) -> None:
+    saved = tmp_path / "main.json"
+    rg = ReasoningGraph()
+    for node, score in (("A", 0.9), ("B", 0.1), ("C", 0.6)):
+        rg.add_node(node, NodeData(label=node, score=score))
+    rg.add_edge("A", "B")
+    rg.add_edge("B", "C")
+    rg.save(saved)
+    socket_path = str(tmp_path / "daemon.sock")
+
+    async def scenario() -> list:
+        daemon = GraphDaemon()
+        serving = asyncio.ensure_future(daemon.run(socket_path))
+        while not Path(socket_path).exists():
+            await asyncio.sleep(0.01)
+        reader, writer = await asyncio.open_unix_connection(socket_path)
+        requests = [
+            {"op": "load", "graph": "main", "path": str(saved)},
+            {"op": "path", "graph": "main", "start": "A", "end": "C"},
+            {"op": "stats", "graph": "other"},
+            {"op": "quarantine", "graph": "main", "threshold": 0.3},
+            {"op": "memetic", "graph": "main", "iterations": 2},
+            {"op": "report", "graph": "main"},
+            {"op": "graphs"},
+            {"op": "save", "graph": "main"},
+            {"op": "graphs"},
+            {"op": "shutdown"},
+        ]
+        responses = []
+        for req in requests:
+            writer.write(json.dumps(req).encode() + b"\n")
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+        writer.close()
+        await serving
+        return responses
+
+    load, path, missing, quarantine, memetic, report, dirty, save, clean, shutdown = \
+        asyncio.run(scenario())
+    assert load["result"]["num_nodes"] == 3 and not load["result"]["dirty"]
+    assert path["result"] == ["A", "B", "C"]
+    assert not missing["ok"] and "no graph named 'other'" in missing["error"]
+    assert quarantine["result"]["quarantined"] == ["B"]
+    assert memetic["ok"] and memetic["result"]["candidates"] > 0
+    assert report["result"].startswith("# Audit Report")
+    assert dirty["result"][0]["dirty"] and dirty["result"][0]["quarantined"] == 1
+    assert save["ok"] and not clean["result"][0]["dirty"]
+    assert shutdown["ok"] and not Path(socket_path).exists()
+    reloaded = ReasoningGraph()
+    reloaded.load(saved)
+    assert reloaded.graph.nodes["B"]["quarantined"] is True
+
+
+def test_sqlite_graph_is_saved_without_a_snapshot(tmp_path: Path) -> None:
+    from ultimai.daemon import ResidentGraph
+
+    rg = ReasoningGraph.open_sqlite(tmp_path / "live.db")
+    rg.add_node("A", NodeData(label="A", score=0.4))
+    rg.add_node("B", NodeData(label="B", score=0.6))
+    rg.add_edge("A", "B")
+
+    def no_snapshot() -> ReasoningGraph:
+        raise AssertionError("an SQLite graph must not be copied into memory to save it")
+
+    rg.snapshot = no_snapshot  # type: ignore[method-assign]
+    resident = ResidentGraph("main", rg, path=tmp_path / "live.db")
+    resident.save()
+    assert not resident.dirty
+    resident.save(tmp_path / "copy.db")
+    assert rg.graph.number_of_nodes() == 2  # the live database was not cleared
+    copy = ReasoningGraph.open_sqlite(tmp_path / "copy.db")
+    assert sorted(copy.graph.nodes) == ["A", "B"] and copy.graph.has_edge("A", "B")
+    copy.close()
+    rg.close()
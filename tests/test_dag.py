@@ -0,0 +1,42 @@
+"""Tests for topological order and chain analytics in ultimai.dag."""
+
+from ultimai.graph import ReasoningGraph, NodeData
+from ultimai.dag import CycleError, DagIndex, topological_sort
+
+
+def build_graph() -> ReasoningGraph:
+    rg = ReasoningGraph()
+    for node in "ABCDE":
+        rg.add_node(node, NodeData(label=node, score=0.5))
+    rg.add_edge("A", "B", weight=1.0)
+    rg.add_edge("B", "C", weight=0.5)
+    rg.add_edge("A", "C", weight=1.0)
+    rg.add_edge("D", "E", weight=1.0)
+    return rg
+
+
+def test_topological_order_depths_and_scores() -> None:
+    rg = build_graph()
+    order = topological_sort(rg.graph)
+    assert order.index("A") < order.index("B") < order.index("C")
+    dag = rg.dag()
+    assert dag.is_dag and dag.longest_chain(rg.graph) == ["A", "B", "C"]
+    assert dag.chain_depth("C") == 2 and dag.chain_depth("E") == 1
+    scores = dag.upstream_scores(rg.graph)
+    assert scores["B"] == 0.5 and scores["C"] == 0.5 * (0.5 + 0.5) + 0.5
+
+
+def test_incremental_updates_and_cycles() -> None:
+    rg = build_graph()
+    dag = rg.dag()
+    rg.add_edge("C", "D")
+    assert rg.dag() is dag and dag.chain_depth("E") == 4
+    rg.add_edge("E", "A")
+    assert rg.dag().cycles == [set("ABCDE")]
+    assert rg.dag().depths() == DagIndex(rg.graph).depths()
+    try:
+        topological_sort(rg.graph)
+    except CycleError as exc:
+        assert exc.cycle[0] == exc.cycle[-1]
+    else:
+        raise AssertionError("expected a cycle")
@@ -0,0 +1,83 @@
+"""Tests for justification paths and KG export in ultimai.explainability."""
+
+import gzip
+import json
+from pathlib import Path
+
+from ultimai.graph import ReasoningGraph, NodeData
+from ultimai.explainability import (
+    export_as_kg,
+    export_kg_stream,
+    get_justification_path,
+    get_justification_paths,
+    get_justification_paths_batch,
+    iter_relations,
+)
+from ultimai.paths import TreeCache
+
+
+def build_graph() -> ReasoningGraph:
+    rg = ReasoningGraph()
+    for node in "ABCDE":
+        rg.add_node(node, NodeData(label=node, score=0.5))
+    rg.add_edge("A", "B", weight=0.1)
+    rg.add_edge("B", "E", weight=0.1)
+    rg.add_edge("A", "C", weight=0.9)
+    rg.add_edge("C", "D", weight=0.9)
+    rg.add_edge("D", "E", weight=0.9)
+    return rg
+
+
+def test_unweighted_and_weighted_paths() -> None:
+    rg = build_graph()
+    assert get_justification_path(rg, "A", "E") == ["A", "B", "E"]
+    assert get_justification_path(rg, "A", "E", weighted=True) == ["A", "C", "D", "E"]
+    assert get_justification_path(rg, "A", "E", weighted=True, max_depth=2) == ["A", "B", "E"]
+    assert get_justification_path(rg, "A", "E", max_depth=1) == []
+    assert get_justification_path(rg, "E", "A") == []
+    assert get_justification_path(rg, "A", "missing") == []
+
+
+def test_k_shortest_paths() -> None:
+    rg = build_graph()
+    assert get_justification_paths(rg, "A", "E", k=3) == [["A", "B", "E"], ["A", "C", "D", "E"]]
+    assert get_justification_paths(rg, "A", "E", k=1, weighted=True) == [["A", "C", "D", "E"]]
+
+
+def test_batch_queries_share_cached_trees() -> None:
+    rg = build_graph()
+    cache = TreeCache(maxsize=4)
+    pairs = [("A", "E"), ("A", "D"), ("A", "A"), ("B", "E"), ("E", "A"), ("X", "A")]
+    results = get_justification_paths_batch(rg, pairs, cache=cache)
+    assert results[("A", "E")] == ["A", "B", "E"]
+    assert results[("A", "D")] == ["A", "C", "D"]
+    assert results[("A", "A")] == ["A"]
+    assert results[("E", "A")] == [] and results[("X", "A")] == []
+    assert cache.misses == 3
+    get_justification_paths_batch(rg, [("A", "E")], cache=cache)
+    assert cache.hits == 1
+    rg.add_edge("A", "E")
+    assert get_justification_paths_batch(rg, [("A", "E")], cache=cache)[("A", "E")] == ["A", "E"]
+    weighted = get_justification_paths_batch(rg, [("A", "D")], weighted=True, cache=cache)
+    assert weighted[("A", "D")] == get_justification_path(rg, "A", "D", weighted=True)
+
+
+def test_streaming_kg_export(tmp_path: Path) -> None:
+    rg = build_graph()
+    rg.add_node("F", NodeData(label='say "hi"', type="claim"))
+    rg.add_edge("E", "F", relation="contradicts")
+    assert export_as_kg(rg)["relations"] == list(iter_relations(rg))
+    counts = export_kg_stream(rg, tmp_path / "kg.jsonl.gz")
+    assert counts == (6, 6)
+    with gzip.open(tmp_path / "kg.jsonl.gz", "rt", encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    assert [r["kind"] for r in records].count("entity") == 6
+    assert export_kg_stream(rg, tmp_path / "kg.nt", relations={"contradicts"}, types={"claim"}) == (1, 0)
+    triples = (tmp_path / "kg.nt").read_text(encoding="utf-8")
+    assert '"say \\"hi\\""' in triples and "<urn:ultimai:type/claim>" in triples
+    assert export_kg_stream(rg, tmp_path / "kg.csv", relations=["influences"]) == (5, 5)
+    back = ReasoningGraph()
+    back.from_csv(tmp_path / "kg.csv")
+    assert back.graph.number_of_edges() == 5 and back.graph.has_edge("A", "C")
+    rg.add_node("G", NodeData(label="isolated"))
+    assert export_kg_stream(rg, tmp_path / "all.csv") == (6, 6)
@@ -1,7 +1,9 @@
 """Tests for the ReasoningGraph in ultimai.graph."""
 
-from ultimai.graph import ReasoningGraph, NodeData
+from ultimai.graph import ReasoningGraph, NodeData, nx
+import json
 import math
+import random
 
 
 def test_add_nodes_and_edges() -> None:
@@ -28,4 +30,208 @@ def test_centrality_and_metrics() -> None:
     bc = rg.compute_betweenness_centrality()
     pr = rg.compute_pagerank()
     assert len(dc) == len(bc) == len(pr) == 3
-    assert math.isclose(sum(dc.values()), len(dc), rel_tol=1e-6)
\ No newline at end of file
+    assert math.isclose(sum(dc.values()), len(dc), rel_tol=1e-6)
+
+def test_symbols_are_shared_and_compact_save_round_trips(tmp_path) -> None:
+    rg = ReasoningGraph()
+    rg.add_node("A", NodeData(label="A", type="".join(["con", "cept"]), score=0.5))
+    rg.add_node("B", NodeData(label="B", score=0.5))
+    rg.add_edge("A", "B", relation="".join(["sup", "ports"]))
+    rg.add_edge("B", "A", relation="supports")
+    assert rg.graph.nodes["A"]["type"] is rg.graph.nodes["B"]["type"]
+    assert rg.graph.get_edge_data("A", "B")["relation"] is rg.graph.get_edge_data("B", "A")["relation"]
+    path = tmp_path / "graph.json"
+    rg.save(path, compact=True)
+    data = json.loads(path.read_text())
+    links = data["edges"] if "edges" in data else data["links"]  # NetworkX 3.4+ writes "edges"
+    assert links[0]["relation"] == data["graph"]["symbols"].index("supports")
+    loaded = ReasoningGraph()
+    loaded.load(path)
+    assert loaded.graph.nodes["A"]["type"] == "concept"
+    assert loaded.graph.get_edge_data("A", "B")["relation"] == "supports"
+    assert list(loaded.graph.edges(data=True)) == list(rg.graph.edges(data=True))
+
+
+def test_compact_save_keeps_integer_edge_endpoints(tmp_path) -> None:
+    from ultimai.symbols import symbols
+    rg = ReasoningGraph()
+    rg.add_node(0, NodeData(label="zero", source="f.csv", score=0.5))
+    rg.add_node(1, NodeData(label="one", source="f.csv", score=0.5))
+    rg.add_edge(1, 0, relation="supports")
+    path = tmp_path / "graph.json"
+    rg.save(path, compact=True)
+    size = len(symbols)
+    loaded = ReasoningGraph()
+    loaded.load(path)
+    assert sorted(loaded.graph.edges()) == [(1, 0)]
+    assert loaded.graph.nodes[0]["source"] == "f.csv"
+    assert loaded.graph.get_edge_data(1, 0)["relation"] == "supports"
+    # Edge endpoints are not symbols, so loading does not grow the table.
+    assert len(symbols) == size
+
+
+def test_indexed_graph_loads_lazily(tmp_path) -> None:
+    rg = ReasoningGraph()
+    for i in range(50):
+        rg.add_node(f"N{i}", NodeData(label=f"Node {i}", score=i / 50))
+    for i in range(49):
+        rg.add_edge(f"N{i}", f"N{i + 1}", relation="supports", weight=0.5)
+    path = tmp_path / "graph.dat"
+    rg.save_indexed(path)
+    lazy = ReasoningGraph.open_indexed(path, cache_size=4)
+    assert lazy.graph.number_of_nodes() == 50
+    assert lazy.graph.number_of_edges() == 49
+    assert lazy.get_neighbors("N10") == ["N11"]
+    assert lazy.graph.nodes["N3"]["label"] == "Node 3"
+    assert lazy.graph.has_node("N49") and not lazy.graph.has_node("missing")
+    assert len(lazy.graph._cache) <= 4
+    sub = lazy.subgraph(["N1", "N2", "N3"])
+    assert sub.graph.number_of_edges() == 2
+    assert sorted(lazy.graph.nodes) == sorted(rg.graph.nodes)
+    try:
+        lazy.graph.nodes["N3"]["score"] = 1.0
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("lazy node attributes must be read-only")
+    # Saving over the open file replaces it and reopens the new one.
+    lazy.save_indexed(path)
+    assert lazy.get_neighbors("N10") == ["N11"]
+    old = lazy.graph
+    with lazy:
+        assert lazy.graph.number_of_nodes() == 50
+    try:
+        old.has_node("N1")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a closed lazy graph must not be readable")
+
+
+def test_incremental_save_appends_patches(tmp_path) -> None:
+    rg = ReasoningGraph()
+    rg.add_node("A", NodeData(label="A", score=0.5))
+    rg.add_node("B", NodeData(label="B", score=0.5))
+    rg.add_edge("A", "B")
+    if not hasattr(rg.graph, "changes_since"):
+        return  # NetworkX graphs cannot report changes; every save is full
+    path = tmp_path / "graph.json"
+    rg.save(path, incremental=True)
+    base = path.read_text()
+    rg.graph.nodes["B"]["score"] = 0.9
+    rg.add_edge("B", "A", relation="suggests", weight=0.3)
+    rg.save(path, incremental=True)
+    assert path.read_text() == base
+    patch = json.loads((tmp_path / "graph.json.patch").read_text())
+    assert [n["id"] for n in patch["nodes"]] == ["B"]
+    assert [(e["source"], e["target"]) for e in patch["links"]] == [("B", "A")]
+    loaded = ReasoningGraph()
+    loaded.load(path)
+    assert loaded.graph.nodes["B"]["score"] == 0.9
+    assert loaded.graph.get_edge_data("B", "A")["relation"] == "suggests"
+    loaded.save(path)
+    assert not (tmp_path / "graph.json.patch").exists()
+
+
+def test_incremental_save_ignores_reads(tmp_path) -> None:
+    rg = ReasoningGraph()
+    for i in range(100):
+        rg.add_node(str(i), NodeData(label=str(i), score=0.5, metadata={"k": 1}))
+    if not hasattr(rg.graph, "changes_since"):
+        return
+    path = tmp_path / "graph.json"
+    rg.save(path, incremental=True)
+    assert sum(rg.graph.nodes[str(i)]["score"] for i in range(100)) == 50
+    rg.save(path, incremental=True)
+    assert not (tmp_path / "graph.json.patch").exists()
+    rg.graph.nodes["3"]["metadata"]["k"] = 2
+    rg.graph.nodes["4"]["score"] = 0.5  # unchanged value
+    rg.save(path, incremental=True)
+    patch = json.loads((tmp_path / "graph.json.patch").read_text())
+    assert [n["id"] for n in patch["nodes"]] == ["3"]
+
+
+def test_incremental_save_records_removals(tmp_path) -> None:
+    rg = ReasoningGraph()
+    for n in "ABC":
+        rg.add_node(n, NodeData(label=n, score=0.5))
+    rg.add_edge("A", "B")
+    rg.add_edge("B", "C")
+    if not hasattr(rg.graph, "changes_since"):
+        return
+    path = tmp_path / "graph.json"
+    rg.save(path, incremental=True)
+    rg.graph.remove_edge("A", "B")
+    rg.graph.remove_node("C")
+    rg.save(path, incremental=True, max_patches=2)
+    rg.add_node("D", NodeData(label="D", score=0.5))
+    rg.save(path, incremental=True, max_patches=2)
+    assert len((tmp_path / "graph.json.patch").read_text().splitlines()) == 2
+    loaded = ReasoningGraph()
+    loaded.load(path)
+    assert sorted(loaded.graph.nodes) == ["A", "B", "D"]
+    assert loaded.graph.number_of_edges() == 0
+    loaded.add_node("E", NodeData(label="E", score=0.5))
+    loaded.save(path, incremental=True, max_patches=2)  # patch file is full
+    assert not (tmp_path / "graph.json.patch").exists()
+
+
+def test_snapshots_and_transactions_are_isolated() -> None:
+    rg = ReasoningGraph()
+    rg.add_node("A", NodeData(label="A", score=0.2))
+    rg.add_node("B", NodeData(label="B", score=0.8))
+    snap = rg.snapshot()
+    rg.graph.nodes["A"]["score"] = 0.9
+    rg.add_edge("A", "B")
+    assert snap.graph.nodes["A"]["score"] == 0.2
+    assert snap.graph.number_of_edges() == 0
+    try:
+        snap.add_edge("B", "A")
+    except (TypeError, nx.NetworkXError):  # stub snapshots / nx.freeze
+        pass
+    else:
+        raise AssertionError("snapshots must be read-only")
+    if not hasattr(rg.graph, "cow_copy"):
+        return  # other backends run transactions in place
+    before = rg.snapshot()
+    with rg.transaction() as draft:
+        draft.graph.nodes["B"]["quarantined"] = True
+        draft.add_edge("B", "A")
+        assert "quarantined" not in rg.graph.nodes["B"]
+    assert rg.version == 1 and rg.graph.nodes["B"]["quarantined"] is True
+    assert rg.graph.has_edge("B", "A") and not before.graph.has_edge("B", "A")
+    try:
+        with rg.transaction() as draft:
+            draft.graph.nodes["A"]["score"] = 0.0
+            raise RuntimeError("abort")
+    except RuntimeError:
+        pass
+    assert rg.graph.nodes["A"]["score"] == 0.9 and rg.version == 1
+
+
+def test_components_communities_and_partitioned_cycle() -> None:
+    from ultimai.meta_synthesizer import MetaConfig, MetaSynthesizer
+
+    rg = ReasoningGraph()
+    for cluster in ("a", "b"):
+        for i in range(4):
+            rg.add_node(f"{cluster}{i}", NodeData(label=f"{cluster}{i}", score=0.5))
+        for i in range(4):
+            for j in range(i + 1, 4):
+                rg.add_edge(f"{cluster}{i}", f"{cluster}{j}")
+    rg.add_node("lonely", NodeData(label="lonely", score=0.5))
+    assert sorted(len(c) for c in rg.weakly_connected_components()) == [1, 4, 4]
+    assert len(rg.strongly_connected_components()) == 9
+    rg.add_edge("a3", "b0", relation="bridge")
+    communities = sorted(sorted(c) for c in rg.communities(seed=1))
+    assert ["a0", "a1", "a2", "a3"] in communities and ["lonely"] in communities
+    parts = rg.partition("communities", max_parts=2)
+    assert len(parts) == 2 and sum(p.graph.number_of_nodes() for p in parts) == 9
+
+    ms = MetaSynthesizer(MetaConfig(memetic_iterations=3, partition="components"))
+    ms.graph = rg
+    random.seed(0)
+    ms.run_memetic()
+    assert len(ms.partition_reports) == 2
+    assert ms.graph.graph.get_edge_data("a3", "b0")["relation"] == "bridge"
+    assert ms.graph.graph.number_of_nodes() == 9 and ms.graph.version == 1
@@ -0,0 +1,33 @@
+"""Tests for import times and lazy loading of the ultimai package."""
+
+import ultimai
+from ultimai.bench.imports import IMPORT_BUDGETS, heavy_imports, measure_import_time
+
+# The suite allows several times the budgets that ``python -m ultimai.bench
+# imports`` enforces, so a busy machine does not fail it but an import that
+# pulls in a heavy dependency still does.
+BUDGET_SLACK = 5
+
+
+def test_imports_load_no_heavy_modules() -> None:
+    for module in IMPORT_BUDGETS:
+        assert heavy_imports(module) == [], module
+
+
+def test_import_times_within_budget() -> None:
+    for module, budget in IMPORT_BUDGETS.items():
+        seconds = measure_import_time(module, runs=5)
+        limit = budget * BUDGET_SLACK
+        assert seconds <= limit, f"importing {module} took {seconds * 1000:.1f} ms (limit {limit * 1000:.0f} ms)"
+
+
+def test_lazy_package_attributes() -> None:
+    assert "MetaSynthesizer" in dir(ultimai)
+    from ultimai.graph import ReasoningGraph
+    assert ultimai.ReasoningGraph is ReasoningGraph
+    try:
+        ultimai.NoSuchThing
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("expected AttributeError")
@@ -0,0 +1,41 @@
+"""Tests for the ingestion helpers in ultimai.ingestion."""
+
+from pathlib import Path
+import json
+
+from ultimai.ingestion import ingest, ingest_many
+
+
+def write_shards(tmp_path: Path) -> list:
+    first = tmp_path / 'a.json'
+    first.write_text(json.dumps([
+        {"source_id": "A", "source_label": "Alpha", "target_id": "B", "target_label": "Beta",
+         "relation": "influences", "source_score": 0.6, "target_score": 0.7},
+    ]))
+    second = tmp_path / 'b.csv'
+    second.write_text(
+        "source_id,source_label,target_id,target_label,relation,source_score,target_score\n"
+        "B,Other Beta,C,Gamma,contradicts,0.1,0.5\n"
+        "A,Alpha,C,Gamma,resolves,0.6,0.5\n"
+    )
+    return [str(first), str(second)]
+
+
+def test_ingest_many_first_writer_wins(tmp_path: Path) -> None:
+    paths = write_shards(tmp_path)
+    rg = ingest_many(paths)
+    assert set(rg.graph.nodes) == {"A", "B", "C"}
+    assert rg.graph.nodes["B"]["label"] == "Beta"
+    assert rg.graph.nodes["B"]["score"] == 0.7
+    assert rg.graph.number_of_edges() == 3
+    assert rg.graph.get_edge_data("A", "C")["relation"] == "resolves"
+
+
+def test_ingest_many_parallel_matches_serial(tmp_path: Path) -> None:
+    paths = write_shards(tmp_path)
+    serial = ingest_many(paths, workers=1)
+    parallel = ingest_many(paths, workers=2)
+    assert list(serial.graph.nodes(data=True)) == list(parallel.graph.nodes(data=True))
+    assert list(serial.graph.edges(data=True)) == list(parallel.graph.edges(data=True))
+    single = ingest(paths[0])
+    assert list(single.graph.nodes) == ["A", "B"]
@@ -0,0 +1,44 @@
+"""Tests for stage spans and metric exporters in ultimai.instrumentation."""
+
+import json
+from pathlib import Path
+
+from ultimai.instrumentation import NULL, JsonlExporter, PrometheusExporter, Recorder
+from ultimai.meta_synthesizer import MetaConfig, MetaSynthesizer
+
+
+def test_full_cycle_spans_and_exports(tmp_path: Path) -> None:
+    csv_path = tmp_path / "input.csv"
+    csv_path.write_text(
+        "source_id,source_label,target_id,target_label,relation,source_score,target_score\n"
+        "A,Alpha,B,Beta,influences,0.6,0.7\n"
+        "B,Beta,C,Gamma,contradicts,0.7,0.2\n"
+    )
+    recorder = Recorder([JsonlExporter(tmp_path / "spans.jsonl"),
+                         PrometheusExporter(tmp_path / "metrics.prom")])
+    synth = MetaSynthesizer(MetaConfig(memetic_iterations=2), instrumentation=recorder)
+    synth.full_cycle(csv_path=str(csv_path), save_path=str(tmp_path / "graph.json"))
+
+    spans = {span.name: span for span in recorder.spans}
+    assert set(spans) == {"load_data", "memetic.evolve", "run_memetic", "run_quarantine",
+                          "audit", "save_graph", "full_cycle"}
+    assert spans["memetic.evolve"].parent == "run_memetic"
+    assert spans["audit"].parent == "full_cycle" and spans["full_cycle"].parent is None
+    assert (spans["load_data"].nodes, spans["load_data"].edges) == (3, 2)
+    assert recorder.counters["memetic_candidates_evaluated"] == 12
+    assert recorder.counters["memetic_critic_calls"] == 15
+    assert recorder.gauges["memetic_critic_calls_per_second"] > 0
+
+    lines = [json.loads(line) for line in (tmp_path / "spans.jsonl").read_text().splitlines()]
+    assert [line["type"] for line in lines] == ["span"] * 7 + ["metrics"]
+    prom = (tmp_path / "metrics.prom").read_text()
+    assert 'ultimai_stage_runs_total{stage="audit"} 1' in prom
+    assert "# TYPE ultimai_memetic_critic_calls_total counter" in prom
+    assert 'ultimai_stage_nodes{stage="save_graph"} 3' in prom
+
+
+def test_null_instrumentation_shares_one_span() -> None:
+    assert NULL.span("a") is NULL.span("b", object())
+    with NULL.span("a"):
+        NULL.count("x")
+    NULL.flush()
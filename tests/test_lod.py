@@ -0,0 +1,48 @@
+"""Tests for level-of-detail summaries in ultimai.lod."""
+
+from pathlib import Path
+
+from ultimai.graph import ReasoningGraph, NodeData
+from ultimai.lod import summarise, write_text
+
+
+def build_graph(clusters: int = 5, size: int = 20) -> ReasoningGraph:
+    rg = ReasoningGraph()
+    for c in range(clusters):
+        for i in range(size):
+            rg.add_node(f"{c}.{i}", NodeData(label=f"{c}.{i}", score=0.5))
+        for i in range(size - 1):
+            rg.add_edge(f"{c}.{i}", f"{c}.{i + 1}")
+        if c:
+            rg.add_edge(f"{c - 1}.0", f"{c}.0")
+    return rg
+
+
+def test_summary_collapses_clusters_and_keeps_focus() -> None:
+    rg = build_graph()
+    assert summarise(rg.graph, max_nodes=100) is rg.graph
+    summary = summarise(rg.graph, max_nodes=10, method="components")
+    assert summary.number_of_nodes() == 1
+    (cluster, attrs), = summary.nodes(data=True)
+    assert attrs["size"] == 100 and attrs["internal_edges"] == 99 and attrs["score"] == 0.5
+    summary = summarise(rg.graph, max_nodes=30, method="communities", expand=1, focus="4.10",
+                        max_clusters=3)
+    kept = [n for n, a in summary.nodes(data=True) if a.get("type") != "cluster"]
+    assert "4.10" in kept and "4.9" in kept and len(kept) <= 30
+    clusters = [a for _, a in summary.nodes(data=True) if a.get("type") == "cluster"]
+    assert len(clusters) <= 3
+    assert sum(a["size"] for a in clusters) + len(kept) == 100
+    try:
+        summarise(rg.graph, max_nodes=30, focus="missing")
+    except ValueError as exc:
+        assert "missing" in str(exc)
+    else:
+        raise AssertionError("an unknown focus must be rejected")
+
+
+def test_text_output_is_bounded(tmp_path: Path) -> None:
+    rg = build_graph(clusters=50)
+    write_text(rg.graph, str(tmp_path / "g.txt"), max_nodes=20, method="components")
+    lines = (tmp_path / "g.txt").read_text(encoding="utf-8").splitlines()
+    assert lines[0].startswith("Summary: 1000 nodes and 999 edges")
+    assert len(lines) < 10
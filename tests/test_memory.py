@@ -0,0 +1,39 @@
+"""Tests for memory accounting in ultimai.memory."""
+
+from ultimai.graph import ReasoningGraph, NodeData
+from ultimai.memory import CATEGORIES, MemoryProfiler, estimate_graph_memory, markdown_section
+
+
+def build_graph(n: int = 200) -> ReasoningGraph:
+    rg = ReasoningGraph()
+    for i in range(n):
+        rg.add_node(f"n{i}", NodeData(label=f"Node {i}", score=0.5, metadata={"note": "x" * 100}))
+    for i in range(n - 1):
+        rg.add_edge(f"n{i}", f"n{i + 1}", relation="supports", weight=0.5)
+    return rg
+
+
+def test_estimate_breaks_graph_down() -> None:
+    small, large = estimate_graph_memory(build_graph(100)), estimate_graph_memory(build_graph(400))
+    assert small["total"] == sum(small[c] for c in CATEGORIES)
+    assert all(small[c] > 0 for c in CATEGORIES)
+    assert large["metadata"] > 3 * small["metadata"]
+    assert large["edge_attributes"] > 3 * small["edge_attributes"]
+
+
+def test_profiler_keeps_outer_peak_across_nested_spans() -> None:
+    profiler = MemoryProfiler()
+    try:
+        with profiler.span("outer"):
+            blob = bytearray(4_000_000)
+            del blob
+            with profiler.span("inner"):
+                kept = [bytearray(1000) for _ in range(100)]
+    finally:
+        profiler.stop()
+    inner, outer = profiler.stages
+    assert (inner.name, inner.parent, outer.name) == ("inner", "outer", "outer")
+    assert outer.peak >= 4_000_000 > inner.peak
+    assert inner.allocated >= 100_000 and kept
+    text = markdown_section(build_graph(10), profiler.stages)
+    assert "| edge_attributes |" in text and "| outer / inner |" in text
@@ -0,0 +1,63 @@
+"""Tests for the declarative pipeline runner in ultimai.pipeline."""
+
+import json
+import shutil
+from pathlib import Path
+
+from ultimai.pipeline import file_digest, load_spec, run_pipeline
+
+DATA = Path(__file__).resolve().parent.parent / "data"
+
+
+def write_spec(tmp_path: Path) -> Path:
+    shutil.copy(DATA / "seeds.json", tmp_path / "seeds.json")
+    spec = {
+        "extends": str(DATA / "config.yaml"),
+        "seed": 3,
+        "state": str(tmp_path / "state.json"),
+        "stages": [
+            {"stage": "ingest", "input": str(tmp_path / "seeds.json")},
+            "memetic",
+            {"stage": "quarantine", "threshold": 0.5},
+            {"stage": "report", "output": str(tmp_path / "out" / "report.md")},
+            {"stage": "export", "output": str(tmp_path / "out" / "kg.jsonl")},
+            {"stage": "save", "output": str(tmp_path / "out" / "graph.json")},
+        ],
+    }
+    path = tmp_path / "pipeline.json"
+    path.write_text(json.dumps(spec), encoding="utf-8")
+    return path
+
+
+def statuses(result) -> list:
+    return [stage.status for stage in result.stages]
+
+
+def test_pipeline_skips_unchanged_stages(tmp_path: Path) -> None:
+    spec = load_spec(write_spec(tmp_path))
+    assert spec["memetic_iterations"] == 2  # inherited from data/config.yaml
+    first = run_pipeline(spec)
+    assert statuses(first) == ["run"] * 6
+    assert first.audit is not None
+    graph = tmp_path / "out" / "graph.json"
+    digest = file_digest(graph)
+
+    # Nothing changed: no stage runs and the graph is not even loaded.
+    second = run_pipeline(spec)
+    assert statuses(second) == ["restored"] * 3 + ["skipped"] * 3
+
+    # A damaged output is rebuilt from the saved graph.
+    (tmp_path / "out" / "report.md").write_text("stale", encoding="utf-8")
+    third = run_pipeline(spec)
+    assert third.ran == ["report"]
+    assert (tmp_path / "out" / "report.md").read_text(encoding="utf-8").startswith("# Audit Report")
+
+    # Seeded runs are reproducible, so a forced run writes the same graph.
+    run_pipeline(spec, force=True)
+    assert file_digest(graph) == digest
+
+    # New seed data invalidates every stage.
+    seeds = json.loads((tmp_path / "seeds.json").read_text(encoding="utf-8"))
+    seeds.append(dict(seeds[0], target_id="NEW", target_label="New"))
+    (tmp_path / "seeds.json").write_text(json.dumps(seeds), encoding="utf-8")
+    assert statuses(run_pipeline(spec)) == ["run"] * 6
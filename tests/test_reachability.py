@@ -0,0 +1,70 @@
+"""Tests for the reachability index in ultimai.reachability."""
+
+import random
+
+from ultimai.graph import ReasoningGraph, NodeData
+from ultimai.explainability import has_justification
+from ultimai.reachability import ReachabilityIndex
+from ultimai.reasoning_modulator import MemeticEngine
+from ultimai.paths import shortest_path_tree
+
+
+def random_graph(n: int, m: int, seed: int) -> ReasoningGraph:
+    rnd = random.Random(seed)
+    rg = ReasoningGraph()
+    for i in range(n):
+        rg.add_node(str(i), NodeData(label=str(i), score=rnd.random()))
+    for _ in range(m):
+        rg.add_edge(str(rnd.randrange(n)), str(rnd.randrange(n)))
+    return rg
+
+
+def assert_matches_search(rg: ReasoningGraph, index: ReachabilityIndex) -> None:
+    nodes = list(rg.graph.nodes)
+    for u in nodes:
+        reached = shortest_path_tree(rg.graph, u)
+        for v in nodes:
+            assert index.reachable(u, v) == (v in reached), (u, v)
+
+
+def test_index_matches_search_and_tracks_inserts() -> None:
+    rg = random_graph(40, 50, seed=3)
+    index = ReachabilityIndex(rg.graph)
+    assert_matches_search(rg, index)
+    rnd = random.Random(4)
+    for _ in range(20):
+        rg.add_edge(str(rnd.randrange(40)), str(rnd.randrange(40)))
+    rg.add_edge("0", "new")
+    index.sync(rg.graph)
+    assert_matches_search(rg, index)
+
+
+def test_index_follows_memetic_suggestions() -> None:
+    random.seed(7)
+    rg = random_graph(15, 10, seed=5)
+    index = ReachabilityIndex(rg.graph)
+    MemeticEngine(rg).run(iterations=5)
+    assert has_justification(rg, "0", "0", index)
+    index.sync(rg.graph)
+    assert_matches_search(rg, index)
+
+
+def test_edge_log_keeps_only_unreplayed_edges() -> None:
+    rg = random_graph(20, 30, seed=6)
+    if not hasattr(rg.graph, "track_edges"):
+        return  # only the stub DiGraph logs edges
+    index = ReachabilityIndex(rg.graph)
+    log = rg.graph.track_edges()
+    assert log.entries == []
+    copy = rg.graph.cow_copy()
+    for i in range(10):
+        copy.add_edge(str(i), str(i + 1))
+    assert len(copy.track_edges().entries) == 10
+    assert log.entries == []  # the copy appended to its own entries
+    index.sync(copy)
+    assert copy.track_edges().entries == []
+    rg.graph = copy
+    assert_matches_search(rg, index)
+    del index
+    copy.add_edge("0", "19")
+    assert copy.track_edges().entries == []  # no index left to read it
@@ -0,0 +1,34 @@
+"""Tests for the built-in layout and renderers in ultimai.layout and ultimai.render."""
+
+from pathlib import Path
+
+from ultimai.graph import ReasoningGraph, NodeData
+from ultimai.layout import force_layout
+from ultimai.render import render
+
+
+def build_graph() -> ReasoningGraph:
+    rg = ReasoningGraph()
+    for i in range(30):
+        rg.add_node(f"n{i}", NodeData(label=f"<n{i}>", score=i / 30))
+    for i in range(29):
+        rg.add_edge(f"n{i}", f"n{i + 1}")
+    return rg
+
+
+def test_layout_is_seeded() -> None:
+    rg = build_graph()
+    pos = force_layout(rg.graph, iterations=20, seed=7, use_numpy=False)
+    assert set(pos) == set(rg.graph.nodes)
+    assert pos == force_layout(rg.graph, iterations=20, seed=7, use_numpy=False)
+    assert pos != force_layout(rg.graph, iterations=20, seed=8, use_numpy=False)
+
+
+def test_svg_and_png_output(tmp_path: Path) -> None:
+    rg = build_graph()
+    pos = force_layout(rg.graph, iterations=10, use_numpy=False)
+    svg = render(rg.graph, tmp_path / "g.svg", pos).read_text(encoding="utf-8")
+    assert svg.count("<circle") == 30 and svg.count("<line") == 29
+    assert "&lt;n0&gt;" in svg
+    png = render(rg.graph, tmp_path / "g.png", pos, width=64, height=64).read_bytes()
+    assert png.startswith(b"\x89PNG\r\n\x1a\n") and png.endswith(b"IEND\xaeB`\x82")
@@ -0,0 +1,44 @@
+"""Tests for the concept search index in ultimai.search."""
+
+from ultimai.graph import ReasoningGraph, NodeData
+from ultimai.explainability import find_concepts, summarise_concept
+
+
+def build_graph() -> ReasoningGraph:
+    rg = ReasoningGraph()
+    rg.add_node("a", NodeData(label="Memetic evolution", source="notes/evolution.md", score=0.4))
+    rg.add_node("b", NodeData(label="Evolutionary critic", type="agent", score=0.9))
+    rg.add_node("c", NodeData(label="Quarantine rules", source="notes/rules.md", score=0.7))
+    return rg
+
+
+def test_search_terms_prefixes_and_ranking() -> None:
+    rg = build_graph()
+    rg.enable_search_index()
+    assert rg.search("evolution") == ["a"]
+    assert rg.search("evol", prefix=True, ranked=True) == ["b", "a"]
+    assert rg.search("notes rules") == ["c"]
+    assert rg.search("agent", fields=["type"]) == ["b"]
+    assert rg.search("evolution critic") == []
+    rg.add_node("d", NodeData(label="Critic ensemble", score=0.95))
+    assert find_concepts(rg, "crit") == ["d", "b"]
+    rg.add_node("b", NodeData(label="Renamed", score=0.9))
+    assert rg.search("critic") == ["d"]
+    assert summarise_concept(rg, "c") == "**Quarantine rules** (source: notes/rules.md) score: 0.70"
+
+
+def test_index_updates_and_copies_are_independent() -> None:
+    import copy
+
+    rg = build_graph()
+    index = rg.enable_search_index()
+    assert rg.search("qu", prefix=True) == ["c"]
+    rg.add_node("c", NodeData(label="Renamed", score=0.7))
+    rg.add_node("e", NodeData(label="Quarantine again", score=0.1))
+    rg.add_node("f", NodeData(label="Quartz", score=0.1))
+    assert rg.search("qua", prefix=True) == ["e", "f"]
+    assert index._vocab["label"].count("quarantine") == 1
+    clone = copy.deepcopy(rg)
+    clone.add_node("g", NodeData(label="Quarantine copy", score=0.1))
+    assert rg.search("quarantine") == ["e"]
+    assert clone.search("quarantine") == ["e", "g"]
@@ -0,0 +1,117 @@
+"""Tests for the asyncio query server in ultimai.server."""
+
+import asyncio
+import json
+
+from ultimai.graph import ReasoningGraph, NodeData
+from ultimai.server import GraphServer
+
+
+def build_graph() -> ReasoningGraph:
+    rg = ReasoningGraph()
+    for node in "ABC":
+        rg.add_node(node, NodeData(label=node, score=0.5))
+    rg.add_edge("A", "B")
+    rg.add_edge("B", "C")
+    return rg
+
+
+def test_server_answers_requests_over_socket() -> None:
+    async def scenario() -> list:
+        server = GraphServer(build_graph(), max_concurrency=2)
+        tcp = await server.start(port=0)
+        port = tcp.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        requests = [
+            {"id": 1, "op": "path", "start": "A", "end": "C"},
+            {"id": 2, "op": "neighbors", "node": "B", "direction": "both"},
+            {"id": 3, "op": "audit"},
+            {"id": 4, "op": "neighbors", "node": "missing"},
+            {"id": 5, "op": "nope"},
+            {"id": 6, "op": "metrics"},
+        ]
+        responses = []
+        for req in requests:
+            writer.write(json.dumps(req).encode() + b"\n")
+            await writer.drain()
+            responses.append(json.loads(await reader.readline()))
+        writer.close()
+        await server.close()
+        return responses
+
+    path, neighbors, audit, missing, unknown, metrics = asyncio.run(scenario())
+    assert path == {"id": 1, "ok": True, "result": ["A", "B", "C"]}
+    assert sorted(neighbors["result"]) == ["A", "C"]
+    assert audit["result"]["num_nodes"] == 3
+    assert not missing["ok"] and "unknown node" in missing["error"]
+    assert not unknown["ok"]
+    assert metrics["result"]["path"]["count"] == 1
+    assert metrics["result"]["neighbors"]["errors"] == 1
+
+
+def test_multi_hop_and_k_path_requests_use_the_executor() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    class CountingExecutor(ThreadPoolExecutor):
+        calls = 0
+
+        def submit(self, fn, *args, **kwargs):  # type: ignore[override]
+            CountingExecutor.calls += 1
+            return super().submit(fn, *args, **kwargs)
+
+    async def scenario() -> list:
+        server = GraphServer(build_graph(), executor=CountingExecutor(max_workers=1))
+        results = [await server.handle_request(req) for req in (
+            {"op": "neighbors", "node": "A"},
+            {"op": "path", "start": "A", "end": "C"},
+            {"op": "neighbors", "node": "A", "k": 2},
+            {"op": "path", "start": "A", "end": "C", "k": 2},
+        )]
+        await server.close()
+        return results
+
+    results = asyncio.run(scenario())
+    assert all(r["ok"] for r in results)
+    assert sorted(results[2]["result"]) == ["B", "C"]
+    assert results[3]["result"] == [["A", "B", "C"]]
+    assert CountingExecutor.calls == 2
+
+
+def test_costly_paths_and_first_search_use_the_executor() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+    import ultimai.server as server_module
+
+    class CountingExecutor(ThreadPoolExecutor):
+        calls = 0
+
+        def submit(self, fn, *args, **kwargs):  # type: ignore[override]
+            CountingExecutor.calls += 1
+            return super().submit(fn, *args, **kwargs)
+
+    rg = build_graph()
+
+    async def run(server: GraphServer, request: dict) -> int:
+        before = CountingExecutor.calls
+        response = await server.handle_request(request)
+        assert response["ok"], response
+        return CountingExecutor.calls - before
+
+    async def scenario() -> list:
+        server = GraphServer(rg, executor=CountingExecutor(max_workers=1))
+        routed = [
+            await run(server, {"op": "path", "start": "A", "end": "C", "weighted": True}),
+            await run(server, {"op": "path", "start": "A", "end": "C", "max_depth": 3}),
+            await run(server, {"op": "path", "start": "A", "end": "C"}),
+            await run(server, {"op": "search", "query": "A"}),
+            await run(server, {"op": "search", "query": "B"}),
+        ]
+        await server.close()
+        return routed
+
+    inline_nodes = server_module.INLINE_NODES
+    server_module.INLINE_NODES = 2
+    try:
+        assert asyncio.run(scenario()) == [1, 0, 1, 1, 0]
+    finally:
+        server_module.INLINE_NODES = inline_nodes
+    assert rg.search_index is not None
@@ -0,0 +1,88 @@
+"""Tests for the SQLite storage engine in ultimai.sqlite_store."""
+
+from pathlib import Path
+import random
+
+from ultimai.graph import ReasoningGraph, NodeData
+from ultimai.critic import Critic
+from ultimai.quarantine import Quarantine
+from ultimai.reasoning_modulator import MemeticEngine
+
+
+def build_graph(rg: ReasoningGraph) -> ReasoningGraph:
+    rg.add_node("A", NodeData(label="A", score=0.8))
+    rg.add_node("B", NodeData(label="B", score=0.5))
+    rg.add_node("C", NodeData(label="C", score=0.2))
+    rg.add_edge("A", "B", relation="supports", weight=0.9)
+    rg.add_edge("B", "C")
+    return rg
+
+
+def test_sqlite_graph_matches_in_memory(tmp_path: Path) -> None:
+    memory = build_graph(ReasoningGraph())
+    stored = build_graph(ReasoningGraph.open_sqlite(tmp_path / "graph.db"))
+    assert list(stored.graph.nodes(data=True)) == list(memory.graph.nodes(data=True))
+    assert list(stored.graph.edges(data=True)) == list(memory.graph.edges(data=True))
+    assert dict(stored.graph.degree()) == dict(memory.graph.degree())
+    assert stored.get_neighbors("A") == ["B"]
+    assert Critic().audit_graph(stored) == Critic().audit_graph(memory)
+
+
+def test_sqlite_quarantine_and_memetic_persist(tmp_path: Path) -> None:
+    path = tmp_path / "graph.db"
+    rg = build_graph(ReasoningGraph.open_sqlite(path))
+    assert rg.graph.nodes_with_score_below(0.5) == ["C"]
+    quarantine = Quarantine(threshold=0.5)
+    assert quarantine.evaluate(rg) == ["C"]
+    random.seed(1)
+    MemeticEngine(rg).run(iterations=2)
+    rg.graph.close()
+    reopened = ReasoningGraph()
+    reopened.load(path)
+    assert reopened.graph.nodes["C"]["quarantined"] is True
+    assert set(reopened.graph.nodes) == {"A", "B", "C"}
+    for _, attrs in reopened.graph.nodes(data=True):
+        assert 0.0 <= attrs["score"] <= 1.0
+
+
+def test_sqlite_graph_is_shared_across_threads(tmp_path: Path) -> None:
+    import sys
+    from concurrent.futures import ThreadPoolExecutor
+    rg = ReasoningGraph.open_sqlite(tmp_path / "graph.db", batch_size=1)
+
+    def work(i: int) -> None:
+        rg.add_node(f"N{i}", NodeData(label=f"N{i}", score=i / 400))
+        if i:
+            rg.add_edge(f"N{i - 1}", f"N{i}")
+        list(rg.graph.nodes_iter(data=True))
+        rg.graph.get_edge_data(f"N{i - 1}", f"N{i}")
+
+    # Switch threads as often as possible to interleave statements.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            list(pool.map(work, range(400)))
+    finally:
+        sys.setswitchinterval(interval)
+    assert rg.graph.number_of_nodes() == 400
+    assert rg.graph.number_of_edges() == 399
+    assert len(rg.graph.nodes_with_score_below(0.5)) == 200
+
+
+def test_sqlite_round_trip_keeps_ids_and_missing_scores(tmp_path: Path) -> None:
+    memory = ReasoningGraph()
+    memory.graph.add_node("x")
+    memory.add_node(1, NodeData(label="one", score=0.1))
+    memory.add_node("n", NodeData(label="unscored"))
+    memory.add_edge(1, "x")
+    path = tmp_path / "graph.sqlite"
+    memory.save(path)
+    stored = ReasoningGraph()
+    stored.load(path)
+    assert list(stored.graph.nodes) == list(memory.graph.nodes) == ["x", 1, "n"]
+    assert list(stored.graph.edges) == [(1, "x")]
+    assert dict(stored.graph.nodes(data=True)) == dict(memory.graph.nodes(data=True))
+    results = [Quarantine(threshold=0.6).evaluate(rg) for rg in (memory, stored)]
+    assert results[0] == results[1] == ["x", 1]
+    stored.graph.close()
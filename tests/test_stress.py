@@ -1,6 +1,8 @@
 """Tests for the stress test module."""
 
-from ultimai.stress_test import run_stress_test
+import json
+
+from ultimai.stress_test import LOAD_STAGES, LoadConfig, build_load_graph, run_load_test, run_stress_test
 
 
 def test_stress_metrics() -> None:
@@ -10,4 +12,17 @@ def test_stress_metrics() -> None:
     assert metrics['num_nodes'] == 3
     assert metrics['num_edges'] >= 2
     assert metrics['quarantined'] >= 0
-    assert metrics['reintegrated'] >= 0
\ No newline at end of file
+    assert metrics['reintegrated'] >= 0
+
+def test_load_test_reports_throughput_and_percentiles() -> None:
+    config = LoadConfig(nodes=200, scores="low", duration=60.0, max_cycles=3, seed=1)
+    result = run_load_test(config)
+    assert result["cycles"] == 3 and result["workers"] == 1
+    assert result["num_nodes"] == build_load_graph(config).graph.number_of_nodes()
+    assert result["cycles_per_s"] > 0 and result["critic_evaluations"] == 3 * (2 + 8)
+    assert result["quarantined"] > 0
+    for stage in LOAD_STAGES:
+        stats = result["stages"][stage]
+        assert stats["count"] == 3
+        assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"] <= stats["max_ms"]
+    json.dumps(result)
@@ -0,0 +1,43 @@
+"""Tests for neighbourhood views in ultimai.views."""
+
+from ultimai.graph import ReasoningGraph, NodeData
+from ultimai.critic import Critic
+
+
+def build_graph() -> ReasoningGraph:
+    rg = ReasoningGraph()
+    for node in "ABCDE":
+        rg.add_node(node, NodeData(label=node, score=0.5))
+    rg.add_edge("A", "B", relation="supports")
+    rg.add_edge("B", "C", relation="supports")
+    rg.add_edge("C", "D", relation="contradicts")
+    rg.add_edge("E", "A", relation="supports")
+    return rg
+
+
+def test_neighbourhood_hops_direction_and_filter() -> None:
+    rg = build_graph()
+    assert list(rg.neighbourhood("A", k=1).graph.nodes) == ["A", "B", "E"]
+    assert list(rg.neighbourhood("A", k=3, direction="out").graph.nodes) == ["A", "B", "C", "D"]
+    view = rg.neighbourhood("A", k=3, direction="out", relation_filter=["supports"]).graph
+    assert list(view.nodes) == ["A", "B", "C"]
+    assert list(view.edges) == [("A", "B"), ("B", "C")]
+    assert view.out_degree("C") == 0 and view.in_degree("A") == 0
+    assert list(rg.neighbourhood("A", k=1, direction="in").graph.nodes) == ["A", "E"]
+
+
+def test_view_is_read_only_and_materialises() -> None:
+    rg = build_graph()
+    view = rg.neighbourhood("B", k=1)
+    try:
+        view.graph.nodes["B"]["score"] = 1.0
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("view attributes must be read-only")
+    report = Critic().audit_graph(view)
+    assert report["num_nodes"] == 3 and report["num_edges"] == 2
+    copy = view.materialise()
+    copy.graph.nodes["B"]["score"] = 1.0
+    assert rg.graph.nodes["B"]["score"] == 0.5
+    assert copy.graph.number_of_edges() == 2
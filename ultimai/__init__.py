@@ -1,10 +1,32 @@
-"""Top‑level package for the ULTIMAI reasoning infrastructure."""
+"""Top‑level package for the ULTIMAI reasoning infrastructure.
 
-from .graph import ReasoningGraph, NodeData
-from .quarantine import Quarantine
-from .critic import Critic
-from .reasoning_modulator import MemeticEngine
-from .meta_synthesizer import MetaSynthesizer
+The names below are imported from their submodules on first access
+(PEP 562), so ``import ultimai`` and short CLI invocations only pay for
+the modules they use.
+"""
+
+from __future__ import annotations
+
+import importlib
+
+# Type checkers treat this as true; ``typing`` itself is not imported.
+TYPE_CHECKING = False
+if TYPE_CHECKING:  # pragma: no cover
+    from .graph import ReasoningGraph, NodeData
+    from .quarantine import Quarantine
+    from .critic import Critic
+    from .reasoning_modulator import MemeticEngine
+    from .meta_synthesizer import MetaSynthesizer
+
+# Public name -> submodule that defines it.
+_EXPORTS = {
+    "ReasoningGraph": "graph",
+    "NodeData": "graph",
+    "Quarantine": "quarantine",
+    "Critic": "critic",
+    "MemeticEngine": "reasoning_modulator",
+    "MetaSynthesizer": "meta_synthesizer",
+}
 
 __all__ = [
     "ReasoningGraph",
@@ -13,4 +35,17 @@ __all__ = [
     "Critic",
     "MemeticEngine",
     "MetaSynthesizer",
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name: str) -> object:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
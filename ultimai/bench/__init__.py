@@ -0,0 +1,34 @@
+"""Synthetic benchmarks for ULTIMAI.
+
+``generators`` builds seeded Erdős–Rényi, scale-free and clustered
+graphs; ``runner`` times the stages of the reasoning cycle on them,
+records peak memory and compares results against a JSON baseline.  Run
+``python -m ultimai.bench --help`` for the command line.
+"""
+
+from .generators import GENERATORS, generate_graph, seed_rows, write_seeds
+from .runner import (
+    STAGES,
+    BenchConfig,
+    compare,
+    format_comparison,
+    load_results,
+    run_benchmark,
+    run_suite,
+    save_results,
+)
+
+__all__ = [
+    "GENERATORS",
+    "STAGES",
+    "BenchConfig",
+    "compare",
+    "format_comparison",
+    "generate_graph",
+    "load_results",
+    "run_benchmark",
+    "run_suite",
+    "save_results",
+    "seed_rows",
+    "write_seeds",
+]
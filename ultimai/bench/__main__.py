@@ -0,0 +1,98 @@
+"""Command line for the benchmark suite.
+
+    python -m ultimai.bench run --generators er scale_free --sizes 1000 100000 -o bench.json
+    python -m ultimai.bench compare bench.json baseline.json --tolerance 0.25
+    python -m ultimai.bench imports
+
+``compare`` exits with status 1 when a metric regressed, and
+``imports`` when a module takes longer to import than its budget, so
+both can gate CI.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .generators import GENERATORS
+from .imports import IMPORT_BUDGETS, check_budgets, heavy_imports
+from .runner import (
+    STAGES,
+    BenchConfig,
+    compare,
+    format_comparison,
+    load_results,
+    run_suite,
+    save_results,
+)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m ultimai.bench",
+                                     description="Benchmark ULTIMAI on synthetic graphs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="Run benchmarks and write a results file")
+    run.add_argument("--generators", nargs="+", default=["er"], choices=sorted(GENERATORS))
+    run.add_argument("--sizes", nargs="+", type=int, default=[1000])
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--avg-degree", type=float, default=4.0)
+    run.add_argument("--memetic-iterations", type=int, default=1)
+    run.add_argument("--path-queries", type=int, default=100)
+    run.add_argument("--stages", nargs="+", default=list(STAGES), choices=STAGES)
+    run.add_argument("--no-memory", action="store_true",
+                     help="Do not trace peak memory (faster, timings not comparable with traced runs)")
+    run.add_argument("-o", "--output", default="bench.json")
+    run.add_argument("--baseline", help="Compare against this results file after running")
+    run.add_argument("--tolerance", type=float, default=0.2)
+    cmp = sub.add_parser("compare", help="Compare a results file with a baseline")
+    cmp.add_argument("current")
+    cmp.add_argument("baseline")
+    cmp.add_argument("--tolerance", type=float, default=0.2,
+                     help="Allowed growth as a fraction of the baseline (default 0.2)")
+    cmp.add_argument("--min-seconds", type=float, default=0.01)
+    imp = sub.add_parser("imports", help="Check import times against their budgets")
+    imp.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.command == "imports":
+        failed = False
+        for module, result in check_budgets(IMPORT_BUDGETS, args.runs).items():
+            heavy = heavy_imports(module)
+            over = result["seconds"] > result["budget"]
+            failed = failed or over or bool(heavy)
+            note = "  OVER BUDGET" if over else ""
+            if heavy:
+                note += f"  loads {', '.join(heavy)}"
+            print(f"{module:<28} {result['seconds'] * 1000:7.1f} ms  (budget {result['budget'] * 1000:.0f} ms){note}")
+        return 1 if failed else 0
+
+    if args.command == "run":
+        configs = [BenchConfig(generator=gen, nodes=n, seed=args.seed, avg_degree=args.avg_degree,
+                               memetic_iterations=args.memetic_iterations,
+                               path_queries=args.path_queries, memory=not args.no_memory,
+                               stages=tuple(args.stages))
+                   for gen in args.generators for n in args.sizes]
+        results = run_suite(configs)
+        save_results(results, Path(args.output))
+        for name, result in results["runs"].items():
+            timings = ", ".join(f"{stage} {m['seconds']:.3f}s" for stage, m in result["stages"].items())
+            print(f"{name}: {result['num_nodes']} nodes, {result['num_edges']} edges; {timings}")
+        if not args.baseline:
+            return 0
+        current, baseline, tolerance, min_seconds = results, load_results(Path(args.baseline)), args.tolerance, 0.01
+    else:
+        current, baseline = load_results(Path(args.current)), load_results(Path(args.baseline))
+        tolerance, min_seconds = args.tolerance, args.min_seconds
+    rows = compare(current, baseline, tolerance=tolerance, min_seconds=min_seconds)
+    print(format_comparison(rows))
+    regressions = [row for row in rows if row["regressed"]]
+    if regressions:
+        print(f"{len(regressions)} regression(s) beyond {tolerance:.0%}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Seeded synthetic graph generators for benchmarks.
+
+Each generator yields directed edges between integer node indices
+``0..n-1`` and is deterministic for a given ``random.Random``:
+
+* ``erdos_renyi_edges`` – ``G(n, m)`` with uniformly random endpoints;
+* ``scale_free_edges`` – preferential attachment, every new node links
+  to earlier nodes chosen in proportion to their degree, which gives the
+  few large hubs typical of citation-like reasoning graphs;
+* ``clustered_edges`` – dense clusters of ``cluster_size`` nodes with a
+  ``mixing`` fraction of edges between clusters.
+
+``seed_rows`` turns the edges into rows of the seed JSON/CSV layout
+(see ``data/seeds.json``) with seeded labels, scores, relations and
+weights, so the ingestion path can be benchmarked on them;
+``generate_graph`` builds the same graph directly.  Sizes from 1e3 to
+1e6 nodes are practical; the mean total degree defaults to 4.
+"""
+
+from __future__ import annotations
+
+import csv
+import json
+import random
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple
+
+from ..graph import NodeData, ReasoningGraph
+
+Edge = Tuple[int, int]
+
+RELATIONS = ("supports", "influences", "contradicts", "resolves", "suggests")
+SEED_COLUMNS = ["source_id", "source_label", "target_id", "target_label", "relation",
+                "source_score", "target_score", "weight"]
+
+
+def _edge_count(n: int, avg_degree: float) -> int:
+    return min(int(n * avg_degree / 2), n * (n - 1))
+
+
+def erdos_renyi_edges(n: int, avg_degree: float, rng: random.Random) -> Iterator[Edge]:
+    """Yield ``n * avg_degree / 2`` distinct random edges without self loops."""
+    seen = set()
+    target = _edge_count(n, avg_degree)
+    while len(seen) < target:
+        u, v = rng.randrange(n), rng.randrange(n)
+        if u != v and (u, v) not in seen:
+            seen.add((u, v))
+            yield u, v
+
+
+def scale_free_edges(n: int, avg_degree: float, rng: random.Random) -> Iterator[Edge]:
+    """Yield a preferential-attachment graph; each node links to ``avg_degree / 2`` earlier nodes."""
+    m = max(1, int(round(avg_degree / 2)))
+    # Every endpoint of every edge appears once, so a uniform pick from
+    # ``ends`` picks a node in proportion to its degree.
+    ends: List[int] = []
+    for v in range(1, min(n, m + 1)):
+        yield v, v - 1
+        ends.extend((v, v - 1))
+    for v in range(m + 1, n):
+        targets = set()
+        while len(targets) < m:
+            targets.add(ends[rng.randrange(len(ends))])
+        for u in targets:
+            yield v, u
+            ends.extend((v, u))
+
+
+def clustered_edges(n: int, avg_degree: float, rng: random.Random, cluster_size: int = 50,
+                    mixing: float = 0.05) -> Iterator[Edge]:
+    """Yield edges mostly inside consecutive blocks of ``cluster_size`` nodes."""
+    seen = set()
+    target = _edge_count(n, avg_degree)
+    while len(seen) < target:
+        u = rng.randrange(n)
+        if rng.random() < mixing or n <= cluster_size:
+            v = rng.randrange(n)
+        else:
+            start = u - u % cluster_size
+            v = rng.randrange(start, min(n, start + cluster_size))
+        if u != v and (u, v) not in seen:
+            seen.add((u, v))
+            yield u, v
+
+
+GENERATORS: Dict[str, Callable[..., Iterator[Edge]]] = {
+    "er": erdos_renyi_edges,
+    "scale_free": scale_free_edges,
+    "clustered": clustered_edges,
+}
+
+
+def _edges(kind: str, n: int, avg_degree: float, rng: random.Random) -> Iterator[Edge]:
+    try:
+        generator = GENERATORS[kind]
+    except KeyError:
+        raise ValueError(f"unknown generator {kind!r}; expected one of {sorted(GENERATORS)}") from None
+    return generator(n, avg_degree, rng)
+
+
+def seed_rows(kind: str, n: int, seed: int = 0, avg_degree: float = 4.0) -> Iterator[Dict[str, Any]]:
+    """Yield the edges of a generated graph as seed rows."""
+    rng = random.Random(seed)
+    scores = [round(rng.random(), 4) for _ in range(n)]
+    for u, v in _edges(kind, n, avg_degree, rng):
+        yield {
+            "source_id": f"n{u}",
+            "source_label": f"Concept {u}",
+            "target_id": f"n{v}",
+            "target_label": f"Concept {v}",
+            "relation": RELATIONS[rng.randrange(len(RELATIONS))],
+            "source_score": scores[u],
+            "target_score": scores[v],
+            "weight": round(rng.uniform(0.1, 1.0), 4),
+        }
+
+
+def write_seeds(path: Path, rows: Iterable[Dict[str, Any]]) -> int:
+    """Write seed rows to a JSON or CSV file, chosen by the suffix; return the row count."""
+    path = Path(path)
+    rows = list(rows)
+    if path.suffix.lower() == ".csv":
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=SEED_COLUMNS)
+            writer.writeheader()
+            writer.writerows(rows)
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(rows, f)
+    return len(rows)
+
+
+def generate_graph(kind: str, n: int, seed: int = 0, avg_degree: float = 4.0) -> ReasoningGraph:
+    """Build the graph described by ``seed_rows(kind, n, seed, avg_degree)``."""
+    rg = ReasoningGraph()
+    g = rg.graph
+    for row in seed_rows(kind, n, seed, avg_degree):
+        for side in ("source", "target"):
+            node_id = row[f"{side}_id"]
+            if not g.has_node(node_id):
+                rg.add_node(node_id, NodeData(label=row[f"{side}_label"], score=row[f"{side}_score"],
+                                              metadata={}))
+        rg.add_edge(row["source_id"], row["target_id"], relation=row["relation"], weight=row["weight"])
+    return rg
@@ -0,0 +1,62 @@
+"""Import-time measurements and budgets.
+
+``measure_import_time`` imports a module in fresh interpreters with
+``-X importtime`` and returns the best cumulative time, so the result
+excludes interpreter start-up; ``check_budgets`` compares it with
+``IMPORT_BUDGETS``.  ``heavy_imports`` lists the optional or slow
+dependencies an import pulled in.  The test suite checks both, allowing
+several times the budgets because timings vary between machines.
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from typing import Dict, List, Optional
+
+# Seconds allowed for importing each module in a fresh interpreter.
+IMPORT_BUDGETS: Dict[str, float] = {
+    "ultimai": 0.05,
+    "ultimai.graph": 0.15,
+    "ultimai.meta_synthesizer": 0.2,
+}
+
+# Modules that no plain import of ULTIMAI should load.
+HEAVY_MODULES = ("networkx", "numpy", "pandas", "matplotlib", "pygraphviz", "sqlite3",
+                 "multiprocessing", "asyncio")
+
+
+def measure_import_time(module: str, runs: int = 3, python: Optional[str] = None) -> float:
+    """Return the best of ``runs`` cumulative import times of ``module``, in seconds."""
+    best = float("inf")
+    for _ in range(runs):
+        proc = subprocess.run([python or sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                              capture_output=True, text=True, check=True)
+        for line in reversed(proc.stderr.splitlines()):
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                best = min(best, int(fields[1]) / 1e6)
+                break
+        else:
+            raise RuntimeError(f"no import time reported for {module!r}")
+    return best
+
+
+def heavy_imports(module: str, python: Optional[str] = None) -> List[str]:
+    """Return the entries of ``HEAVY_MODULES`` executed by importing ``module``."""
+    # A module bound with ``utils.lazy_import`` is in ``sys.modules`` but
+    # has not run yet; it still has its lazy loader's module type.
+    code = (f"import json, sys; import {module}; "
+            f"print(json.dumps([m for m in {list(HEAVY_MODULES)!r} if m in sys.modules "
+            f"and type(sys.modules[m]).__name__ != '_LazyModule']))")
+    proc = subprocess.run([python or sys.executable, "-c", code], capture_output=True, text=True,
+                          check=True)
+    return json.loads(proc.stdout)
+
+
+def check_budgets(budgets: Optional[Dict[str, float]] = None, runs: int = 3) -> Dict[str, Dict[str, float]]:
+    """Measure every module of ``budgets`` and return ``{module: {"seconds", "budget"}}``."""
+    budgets = IMPORT_BUDGETS if budgets is None else budgets
+    return {module: {"seconds": measure_import_time(module, runs), "budget": budget}
+            for module, budget in budgets.items()}
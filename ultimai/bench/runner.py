@@ -0,0 +1,230 @@
+"""Stage timings, peak memory and baseline comparison for benchmarks.
+
+``run_benchmark`` generates one seeded graph (see ``generators``) and
+times each stage of the reasoning cycle on it:
+
+========== ==========================================================
+ingest     ``ingestion.ingest`` of the generated seed file
+save/load  ``ReasoningGraph.save`` and ``load`` of a node-link file
+evaluate   ``Critic.evaluate_graph``
+audit      ``Critic.audit_graph``
+memetic    ``MemeticEngine.run`` (copies the graph several times per
+           iteration, so keep ``memetic_iterations`` low on big graphs)
+quarantine ``Quarantine.evaluate`` and ``reintegrate``
+centrality degree centrality and PageRank (PageRank is skipped, and
+           listed under ``skipped``, when NetworkX cannot import NumPy)
+paths      batched justification paths between seeded node pairs
+========== ==========================================================
+
+With ``memory=True`` each stage also records the peak of memory
+allocated by Python while it ran, measured with ``tracemalloc``.
+Tracing slows Python code down, so timings taken with and without it
+are not comparable; the setting is stored with the results.
+
+Results are plain JSON.  ``compare`` matches the runs and stages of two
+result files and flags every metric that grew by more than
+``tolerance`` (a fraction of the baseline), ignoring differences below
+``min_seconds`` so that tiny stages do not flag on noise.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import random
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from ..critic import Critic
+from ..explainability import get_justification_paths_batch
+from ..graph import ReasoningGraph
+from ..ingestion import ingest
+from ..memory import peak_since, reset_peak
+from ..paths import TreeCache
+from ..quarantine import Quarantine
+from ..reasoning_modulator import MemeticEngine
+from .generators import seed_rows, write_seeds
+
+STAGES = ("ingest", "save", "load", "evaluate", "audit", "memetic", "quarantine",
+          "centrality", "paths")
+RESULTS_VERSION = 1
+
+
+@dataclass
+class BenchConfig:
+    generator: str = "er"
+    nodes: int = 1000
+    seed: int = 0
+    avg_degree: float = 4.0
+    memetic_iterations: int = 1
+    path_queries: int = 100
+    quarantine_threshold: float = 0.35
+    memory: bool = True
+    stages: Tuple[str, ...] = field(default=STAGES)
+
+    @property
+    def name(self) -> str:
+        return f"{self.generator}-{self.nodes}"
+
+
+@contextmanager
+def _measure(record: Dict[str, Any], memory: bool) -> Iterator[None]:
+    started = False
+    if memory:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            started = True
+        previous = reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        record["seconds"] = round(time.perf_counter() - t0, 6)
+        if memory:
+            record["peak_bytes"] = peak_since(previous) - base
+            if started:
+                tracemalloc.stop()
+
+
+def _pairs(rg: ReasoningGraph, count: int, seed: int) -> List[Tuple[str, str]]:
+    nodes = list(rg.graph.nodes)
+    if not nodes:
+        return []
+    rng = random.Random(seed)
+    # Few distinct sources, as for a user exploring a handful of concepts.
+    sources = [rng.choice(nodes) for _ in range(max(1, count // 10))]
+    return [(rng.choice(sources), rng.choice(nodes)) for _ in range(count)]
+
+
+def run_benchmark(config: BenchConfig, workdir: Optional[Path] = None) -> Dict[str, Any]:
+    """Run the configured stages on one generated graph and return the result record."""
+    unknown = set(config.stages) - set(STAGES)
+    if unknown:
+        raise ValueError(f"unknown stages {sorted(unknown)}; expected some of {STAGES}")
+    stages: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory(dir=workdir) as tmp:
+        seeds = Path(tmp) / "seeds.json"
+        write_seeds(seeds, seed_rows(config.generator, config.nodes, config.seed, config.avg_degree))
+
+        def stage(name: str):
+            # Ingestion and saving also run, unrecorded, when only later
+            # stages were selected.
+            if name not in config.stages:
+                return _measure({}, False)
+            return _measure(stages.setdefault(name, {}), config.memory)
+
+        with stage("ingest"):
+            rg = ingest(str(seeds))
+        graph_file = Path(tmp) / "graph.json"
+        if "save" in config.stages or "load" in config.stages:
+            with stage("save"):
+                rg.save(graph_file)
+            if "load" in config.stages:
+                with stage("load"):
+                    ReasoningGraph().load(graph_file)
+        critic = Critic()
+        if "evaluate" in config.stages:
+            with stage("evaluate"):
+                critic.evaluate_graph(rg)
+        if "audit" in config.stages:
+            with stage("audit"):
+                critic.audit_graph(rg)
+        if "memetic" in config.stages:
+            random.seed(config.seed)
+            with stage("memetic"):
+                MemeticEngine(rg).run(config.memetic_iterations)
+        if "quarantine" in config.stages:
+            quarantine = Quarantine(config.quarantine_threshold)
+            with stage("quarantine"):
+                quarantine.evaluate(rg)
+                quarantine.reintegrate(rg)
+        if "centrality" in config.stages:
+            with stage("centrality"):
+                rg.degree_centrality()
+                try:
+                    rg.compute_pagerank()
+                except ImportError:  # NetworkX's pagerank needs NumPy
+                    stages["centrality"]["skipped"] = ["pagerank"]
+        if "paths" in config.stages:
+            pairs = _pairs(rg, config.path_queries, config.seed)
+            with stage("paths"):
+                get_justification_paths_batch(rg, pairs, cache=TreeCache())
+    return {
+        "config": asdict(config),
+        "num_nodes": rg.graph.number_of_nodes(),
+        "num_edges": rg.graph.number_of_edges(),
+        "stages": stages,
+    }
+
+
+def run_suite(configs: Iterable[BenchConfig], workdir: Optional[Path] = None) -> Dict[str, Any]:
+    """Run every configuration and return a results document keyed by run name."""
+    runs = {config.name: run_benchmark(config, workdir) for config in configs}
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "runs": runs,
+    }
+
+
+def save_results(results: Dict[str, Any], path: Path) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as f:
+        results = json.load(f)
+    if results.get("version") != RESULTS_VERSION:
+        raise ValueError(f"{path}: unsupported benchmark results version {results.get('version')!r}")
+    return results
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2,
+            min_seconds: float = 0.01) -> List[Dict[str, Any]]:
+    """Compare two results documents stage by stage.
+
+    Returns one row per metric present in both, with ``regressed`` set
+    when ``current > baseline * (1 + tolerance)``; for timings the
+    difference must also exceed ``min_seconds``.
+    """
+    rows: List[Dict[str, Any]] = []
+    for name, run in current.get("runs", {}).items():
+        base_run = baseline.get("runs", {}).get(name)
+        if base_run is None:
+            continue
+        for stage_name, metrics in run["stages"].items():
+            base_metrics = base_run["stages"].get(stage_name)
+            if base_metrics is None:
+                continue
+            for metric in ("seconds", "peak_bytes"):
+                if metric not in metrics or metric not in base_metrics:
+                    continue
+                now, before = metrics[metric], base_metrics[metric]
+                ratio = now / before if before else (1.0 if now == before else float("inf"))
+                regressed = now > before * (1 + tolerance)
+                if metric == "seconds" and now - before < min_seconds:
+                    regressed = False
+                rows.append({"run": name, "stage": stage_name, "metric": metric,
+                             "baseline": before, "current": now, "ratio": round(ratio, 3),
+                             "regressed": regressed})
+    return rows
+
+
+def format_comparison(rows: List[Dict[str, Any]]) -> str:
+    """Render ``compare`` rows as an aligned text table."""
+    lines = [f"{'run':<22} {'stage':<11} {'metric':<10} {'baseline':>12} {'current':>12} {'ratio':>7}"]
+    for row in rows:
+        flag = "  REGRESSED" if row["regressed"] else ""
+        lines.append(f"{row['run']:<22} {row['stage']:<11} {row['metric']:<10} "
+                     f"{row['baseline']:>12.6g} {row['current']:>12.6g} {row['ratio']:>7.3f}{flag}")
+    return "\n".join(lines)
@@ -10,9 +10,11 @@ from __future__ import annotations
 from typing import Any, Dict, List
 import statistics
 
-try:
-    import networkx as nx  # type: ignore
-except ImportError:  # pragma: no cover
+from .utils import lazy_import
+
+# NetworkX is loaded on first use; the local stub stands in without it.
+nx = lazy_import("networkx")
+if nx is None:  # pragma: no cover
     from . import networkx_stub as nx  # type: ignore
 
 
@@ -66,4 +68,11 @@ class Critic:
         if dead_ends:
             recommendations.append(f"Extend reasoning from {len(dead_ends)} dead‑end nodes.")
         report['recommendations'] = recommendations
-        return report
\ No newline at end of file
+        return report
+
+def report_markdown(report: Dict[str, Any], title: str = "Audit Report") -> str:
+    """Format an ``audit_graph`` report as the markdown written by ``scripts/dump_report.py``."""
+    lines = [f"# {title}\n\n"]
+    for key, value in report.items():
+        lines.append(f"**{key}**: {value}\n\n")
+    return "".join(lines)
@@ -0,0 +1,400 @@
+"""Daemon that keeps named reasoning graphs resident between commands.
+
+Each command of the workflow CLI (``build-graph``, ``run-memetic``,
+``run-audit``, ``run-quarantine``) and of the report scripts reloads the
+graph from JSON, and ``run-memetic`` writes it back after every call.
+``GraphDaemon`` instead holds any number of graphs in memory under a
+name and serves them over a Unix socket with the protocol of
+``ultimai.server``; every request may name its graph with ``"graph"``
+(default ``"default"``).  All query operations of the server
+(``neighbors``, ``path``, ``audit``, ``centrality``, ...) are available,
+plus the daemon operations registered here with ``daemon_op``:
+
+============ ========================================================
+graphs       list the resident graphs
+load         load a saved graph (``path``) under a name
+ingest       build a graph from seed data (``input``), optionally save
+save         persist a graph to ``path`` or where it was loaded from
+drop         forget a graph, optionally saving it first
+memetic      run memetic evolution (``iterations``)
+quarantine   apply quarantine (``threshold``) and reintegration
+report       return the audit report as markdown
+render       write an image or text summary to ``output``
+shutdown     stop the daemon
+============ ========================================================
+
+Nothing is written to disk unless asked: by ``save``, by the ``save``
+flag of ``ingest``/``memetic``/``drop``, or every ``autosave`` seconds
+for graphs that changed and have a path.  Writers of one graph are
+serialised through ``ReasoningGraph.transaction`` and run in the thread
+pool, so queries keep being answered from the published version.
+
+Start it with ``python -m ultimai.daemon serve`` and use the client
+commands of the same module, for example::
+
+    python -m ultimai.daemon serve --load main=graph.json --autosave 300 &
+    python -m ultimai.daemon run-memetic --graph main --iterations 20
+    python -m ultimai.daemon run-quarantine --graph main --threshold 0.3
+    python -m ultimai.daemon report --graph main --output report.md
+    python -m ultimai.daemon save --graph main
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .critic import Critic, report_markdown
+from .graph import ReasoningGraph
+from .paths import graph_version
+from .quarantine import Quarantine
+from .reasoning_modulator import MemeticEngine
+from .server import GraphServer, RequestError, _param, request
+
+DEFAULT_GRAPH = "default"
+DEFAULT_SOCKET = os.environ.get(
+    "ULTIMAI_DAEMON_SOCKET",
+    str(Path(tempfile.gettempdir()) / f"ultimai-{os.getuid()}.sock"),
+)
+
+DaemonHandler = Callable[["GraphDaemon", Dict[str, Any]], Any]
+
+# op name -> handler(daemon, request); see ``daemon_op``.
+DAEMON_OPS: Dict[str, DaemonHandler] = {}
+
+
+def daemon_op(op: str) -> Callable[[DaemonHandler], DaemonHandler]:
+    """Register ``handler(daemon, request)`` as the implementation of ``op``."""
+    def decorator(handler: DaemonHandler) -> DaemonHandler:
+        DAEMON_OPS[op] = handler
+        return handler
+    return decorator
+
+
+@dataclass
+class ResidentGraph:
+    """A graph kept in memory by the daemon."""
+    name: str
+    rg: ReasoningGraph
+    path: Optional[Path] = None
+    quarantine: Quarantine = field(default_factory=Quarantine)
+    saved: Tuple[int, int] = (-1, -1)
+
+    def state(self) -> Tuple[int, int]:
+        return self.rg.version, graph_version(self.rg.graph)
+
+    @property
+    def dirty(self) -> bool:
+        return self.state() != self.saved
+
+    def save(self, path: Optional[Path] = None) -> Path:
+        target = Path(path) if path is not None else self.path
+        if target is None:
+            raise RequestError(f"graph {self.name!r} has no path; pass one to save it")
+        state = self.state()
+        if hasattr(self.rg.graph, "close"):
+            # On-disk storage engines save themselves consistently (SQLite
+            # flushes or backs up its database); a snapshot would first
+            # copy them into memory.
+            self.rg.save(target)
+        else:
+            # Saving the published version keeps the file consistent while
+            # writers carry on.
+            self.rg.snapshot().save(target)
+        self.path, self.saved = target, state
+        return target
+
+    def info(self) -> Dict[str, Any]:
+        return {"name": self.name, "num_nodes": self.rg.graph.number_of_nodes(),
+                "num_edges": self.rg.graph.number_of_edges(),
+                "path": str(self.path) if self.path else None, "dirty": self.dirty,
+                "quarantined": len(self.quarantine.quarantined)}
+
+
+class GraphDaemon(GraphServer):
+    """A ``GraphServer`` over several named, resident graphs."""
+
+    def __init__(self, autosave: Optional[float] = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.graphs: Dict[str, ResidentGraph] = {}
+        self.autosave = autosave
+        for op, handler in DAEMON_OPS.items():
+            self.handlers[op] = (self._bind(handler), False, False)
+        self._stop: Optional[asyncio.Event] = None
+
+    def _bind(self, handler: DaemonHandler) -> Callable[[Any, Dict[str, Any]], Any]:
+        return lambda rg, request: handler(self, request)
+
+    # ------------------------------------------------------------------
+    # Graphs
+    def add_graph(self, name: str, rg: ReasoningGraph, path: Optional[Path] = None) -> ResidentGraph:
+        resident = ResidentGraph(name, rg, Path(path) if path else None)
+        if path is not None:
+            resident.saved = resident.state()
+        self.graphs[name] = resident
+        return resident
+
+    def resident(self, request: Dict[str, Any]) -> ResidentGraph:
+        name = request.get("graph", DEFAULT_GRAPH)
+        try:
+            return self.graphs[name]
+        except KeyError:
+            raise RequestError(f"no graph named {name!r}; load or ingest it first") from None
+
+    def resolve_graph(self, request: Dict[str, Any]) -> ReasoningGraph:
+        if request.get("op") in DAEMON_OPS:
+            return None  # type: ignore[return-value]  # daemon ops resolve their own graph
+        return self.resident(request).rg
+
+    async def in_executor(self, func: Callable[..., Any], *args: Any) -> Any:
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    def save_dirty(self) -> List[str]:
+        """Save every changed graph that has a path; return their names."""
+        saved = []
+        for resident in list(self.graphs.values()):
+            if resident.path is not None and resident.dirty:
+                resident.save()
+                saved.append(resident.name)
+        return saved
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    async def _autosave_loop(self) -> None:
+        assert self.autosave is not None
+        while True:
+            await asyncio.sleep(self.autosave)
+            await self.in_executor(self.save_dirty)
+
+    async def run(self, path: str = DEFAULT_SOCKET) -> None:
+        """Serve on the Unix socket ``path`` until a ``shutdown`` request."""
+        if os.path.exists(path):
+            os.unlink(path)  # left behind by a daemon that did not shut down
+        self._stop = asyncio.Event()
+        await self.start(path=path)
+        autosave = asyncio.ensure_future(self._autosave_loop()) if self.autosave else None
+        try:
+            await self._stop.wait()
+        finally:
+            if autosave is not None:
+                autosave.cancel()
+                await asyncio.gather(autosave, return_exceptions=True)
+                self.save_dirty()
+            await self.close()
+            if os.path.exists(path):
+                os.unlink(path)
+
+    def stop(self) -> None:
+        if self._stop is not None:
+            self._stop.set()
+
+
+# ----------------------------------------------------------------------
+# Daemon operations
+@daemon_op("graphs")
+def _graphs(daemon: GraphDaemon, request: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [resident.info() for resident in daemon.graphs.values()]
+
+
+@daemon_op("load")
+async def _load(daemon: GraphDaemon, request: Dict[str, Any]) -> Dict[str, Any]:
+    path = Path(_param(request, "path"))
+    if not path.exists():
+        raise RequestError(f"no such file: {path}")
+    rg = ReasoningGraph()
+    await daemon.in_executor(rg.load, path)
+    return daemon.add_graph(request.get("graph", DEFAULT_GRAPH), rg, path).info()
+
+
+@daemon_op("ingest")
+async def _ingest(daemon: GraphDaemon, request: Dict[str, Any]) -> Dict[str, Any]:
+    from .ingestion import ingest
+    source = Path(_param(request, "input"))
+    if not source.exists():
+        raise RequestError(f"no such file: {source}")
+    try:
+        rg = await daemon.in_executor(ingest, str(source))
+    except ValueError as exc:
+        raise RequestError(str(exc)) from None
+    resident = daemon.add_graph(request.get("graph", DEFAULT_GRAPH), rg)
+    if request.get("output"):
+        await daemon.in_executor(resident.save, Path(request["output"]))
+    return resident.info()
+
+
+@daemon_op("save")
+async def _save(daemon: GraphDaemon, request: Dict[str, Any]) -> Dict[str, Any]:
+    resident = daemon.resident(request)
+    path = request.get("path")
+    await daemon.in_executor(resident.save, Path(path) if path else None)
+    return resident.info()
+
+
+@daemon_op("drop")
+async def _drop(daemon: GraphDaemon, request: Dict[str, Any]) -> Dict[str, Any]:
+    resident = daemon.resident(request)
+    if request.get("save"):
+        await daemon.in_executor(resident.save)
+    del daemon.graphs[resident.name]
+    return resident.info()
+
+
+def _evolve(resident: ResidentGraph, iterations: int) -> Dict[str, int]:
+    with resident.rg.transaction() as draft:
+        engine = MemeticEngine(draft)
+        engine.run(iterations)
+    return engine.stats
+
+
+@daemon_op("memetic")
+async def _memetic(daemon: GraphDaemon, request: Dict[str, Any]) -> Dict[str, Any]:
+    resident = daemon.resident(request)
+    stats = await daemon.in_executor(_evolve, resident, int(request.get("iterations", 10)))
+    if request.get("save"):
+        await daemon.in_executor(resident.save)
+    return dict(resident.info(), **stats)
+
+
+def _apply_quarantine(resident: ResidentGraph, threshold: float,
+                      reintegrate: Optional[float]) -> Dict[str, List[str]]:
+    quarantine = resident.quarantine
+    quarantine.threshold = threshold
+    reintegrated: List[str] = []
+    with resident.rg.transaction() as draft:
+        quarantine.evaluate(draft)
+        if reintegrate is not None:
+            reintegrated = quarantine.reintegrate(draft, reintegrate)
+    return {"quarantined": list(quarantine.quarantined), "reintegrated": reintegrated}
+
+
+@daemon_op("quarantine")
+async def _quarantine(daemon: GraphDaemon, request: Dict[str, Any]) -> Dict[str, List[str]]:
+    resident = daemon.resident(request)
+    reintegrate = request.get("reintegrate")
+    return await daemon.in_executor(_apply_quarantine, resident, float(request.get("threshold", 0.35)),
+                                    float(reintegrate) if reintegrate is not None else None)
+
+
+@daemon_op("report")
+async def _report(daemon: GraphDaemon, request: Dict[str, Any]) -> str:
+    snapshot = daemon.resident(request).rg.snapshot()
+    report = await daemon.in_executor(Critic().audit_graph, snapshot)
+    return report_markdown(report)
+
+
+def _draw(rg: ReasoningGraph, output: Path, max_nodes: int) -> str:
+    from .lod import summarise, write_text
+    from .render import RENDER_SUFFIXES, render
+    if output.suffix.lower() in RENDER_SUFFIXES:
+        render(summarise(rg.graph, max_nodes=max_nodes), output)
+    else:
+        write_text(rg.graph, str(output), max_nodes=max_nodes)
+    return str(output)
+
+
+@daemon_op("render")
+async def _render(daemon: GraphDaemon, request: Dict[str, Any]) -> str:
+    snapshot = daemon.resident(request).rg.snapshot()
+    output = Path(_param(request, "output"))
+    return await daemon.in_executor(_draw, snapshot, output, int(request.get("max_nodes", 500)))
+
+
+@daemon_op("shutdown")
+def _shutdown(daemon: GraphDaemon, request: Dict[str, Any]) -> List[str]:
+    saved = daemon.save_dirty() if request.get("save") else []
+    # Stop after this response has been written.
+    asyncio.get_running_loop().call_soon(daemon.stop)
+    return saved
+
+
+# ----------------------------------------------------------------------
+# Command line
+def _serve(args: argparse.Namespace) -> None:
+    daemon = GraphDaemon(autosave=args.autosave, max_concurrency=args.max_concurrency)
+    for spec in args.load or []:
+        name, _, path = spec.rpartition("=")
+        rg = ReasoningGraph()
+        rg.load(Path(path))
+        daemon.add_graph(name or DEFAULT_GRAPH, rg, Path(path))
+        print(f"Loaded {name or DEFAULT_GRAPH}: {rg.graph.number_of_nodes()} nodes from {path}")
+    print(f"Serving on {args.socket}")
+    try:
+        asyncio.run(daemon.run(args.socket))
+    except KeyboardInterrupt:
+        pass
+
+
+def _client(args: argparse.Namespace) -> None:
+    params = {k: v for k, v in vars(args).items()
+              if k not in ("command", "socket", "func", "op", "timeout") and v is not None}
+    if "output" in params and args.op in ("ingest", "render"):
+        params["output"] = str(Path(params["output"]).resolve())
+    for key in ("input", "path"):
+        if key in params:
+            params[key] = str(Path(params[key]).resolve())
+    if args.op == "report":
+        output = params.pop("output")
+        Path(output).write_text(request(args.socket, "report", args.timeout, **params), encoding="utf-8")
+        print(f"Report saved to {output}")
+        return
+    result = request(args.socket, args.op, args.timeout, **params)
+    print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Keep reasoning graphs resident and run commands on them")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET, help=f"Unix socket (default {DEFAULT_SOCKET})")
+    parser.add_argument("--timeout", type=float, default=3600.0, help="Client timeout in seconds")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("serve", help="Run the daemon")
+    p.add_argument("--load", action="append", metavar="NAME=PATH", help="Load a graph at start-up")
+    p.add_argument("--autosave", type=float, help="Save changed graphs every this many seconds")
+    p.add_argument("--max-concurrency", type=int, default=64)
+    p.set_defaults(func=_serve)
+
+    def client(name: str, op: str, help_text: str) -> argparse.ArgumentParser:
+        p = sub.add_parser(name, help=help_text)
+        p.set_defaults(func=_client, op=op)
+        if op not in ("graphs", "shutdown", "load"):
+            p.add_argument("--graph", default=DEFAULT_GRAPH, help="Name of the resident graph")
+        return p
+
+    p = client("build-graph", "ingest", "Build a resident graph from CSV or JSON seed data")
+    p.add_argument("--input", required=True)
+    p.add_argument("--output", help="Also save the graph to this JSON file")
+    p = client("run-memetic", "memetic", "Run memetic evolution on a resident graph")
+    p.add_argument("--iterations", type=int, default=10)
+    p.add_argument("--save", action="store_true", default=None, help="Save the graph afterwards")
+    client("run-audit", "audit", "Print the critic audit of a resident graph")
+    p = client("run-quarantine", "quarantine", "Apply quarantine rules to a resident graph")
+    p.add_argument("--threshold", type=float, default=0.35)
+    p.add_argument("--reintegrate", type=float, help="Also reintegrate nodes scoring at least this")
+    p = client("report", "report", "Write the audit report of a resident graph as markdown")
+    p.add_argument("--output", required=True)
+    p = client("render", "render", "Draw a resident graph (SVG/PNG) or write its text summary")
+    p.add_argument("--output", required=True)
+    p.add_argument("--max-nodes", dest="max_nodes", type=int)
+    p = client("load", "load", "Load a saved graph into the daemon")
+    p.add_argument("graph", help="Name to keep it under")
+    p.add_argument("path")
+    p = client("save", "save", "Save a resident graph")
+    p.add_argument("--path", help="Save here instead of where it was loaded from")
+    p = client("drop", "drop", "Remove a resident graph")
+    p.add_argument("--save", action="store_true", default=None, help="Save it first")
+    client("graphs", "graphs", "List resident graphs")
+    p = client("shutdown", "shutdown", "Stop the daemon")
+    p.add_argument("--save", action="store_true", default=None, help="Save changed graphs first")
+
+    args = parser.parse_args(argv)
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+"""Topological order and chain analytics for reasoning graphs.
+
+Reasoning chains are mostly acyclic.  ``topological_sort`` orders the
+nodes of a DAG with Kahn's algorithm and raises ``CycleError`` (carrying
+one offending cycle, see ``find_cycle``) otherwise.
+
+``DagIndex`` works on any graph: strongly connected components are
+condensed, so each cycle behaves as a single step, and reported in
+``cycles``.  On the condensation it keeps a topological order and, for
+every node, the length of the longest support chain ending there.  New
+edges are applied incrementally: the order is repaired locally
+(Pearce–Kelly) and chain depths are pushed forward from the new edge's
+target; an edge that closes a cycle triggers a rebuild.  ``sync`` brings
+the index up to date from the stub ``DiGraph`` edge log, like
+``ReachabilityIndex.sync``.
+
+``upstream_scores`` aggregates node scores along incoming edges,
+weighted by edge ``weight``.  Scores can change without the graph
+version changing, so the aggregate is recomputed on each call over the
+cached order, in one linear pass.  ``dag_index`` returns an index cached
+per graph and synchronised to its current version.
+"""
+
+from __future__ import annotations
+
+import heapq
+import weakref
+from typing import Any, Dict, List, Optional, Set
+
+from .networkx_stub import strongly_connected_components
+from .paths import graph_version
+
+
+class CycleError(ValueError):
+    """Raised when a topological order is requested for a cyclic graph."""
+
+    def __init__(self, cycle: List[Any]) -> None:
+        super().__init__(f"graph contains a cycle: {' -> '.join(map(str, cycle))}")
+        self.cycle = cycle
+
+
+def find_cycle(g: Any) -> List[Any]:
+    """Return the nodes of one directed cycle (first node repeated last), or ``[]``."""
+    succ = g.adj
+    state: Dict[Any, int] = {}  # 1 = on the current path, 2 = finished
+    for root in g.nodes:
+        if root in state:
+            continue
+        state[root] = 1
+        path = [root]
+        work = [iter(succ[root])]
+        while work:
+            for v in work[-1]:
+                if state.get(v) == 1:
+                    return path[path.index(v):] + [v]
+                if v not in state:
+                    state[v] = 1
+                    path.append(v)
+                    work.append(iter(succ[v]))
+                    break
+            else:
+                work.pop()
+                state[path.pop()] = 2
+    return []
+
+
+def topological_sort(g: Any) -> List[Any]:
+    """Return the nodes of ``g`` in topological order (Kahn's algorithm)."""
+    succ, pred = g.adj, g.pred
+    indegree = {n: len(pred[n]) for n in g.nodes}
+    ready = [n for n, d in indegree.items() if d == 0]
+    order: List[Any] = []
+    while ready:
+        u = ready.pop()
+        order.append(u)
+        for v in succ[u]:
+            indegree[v] -= 1
+            if indegree[v] == 0:
+                ready.append(v)
+    if len(order) != len(indegree):
+        raise CycleError(find_cycle(g))
+    return order
+
+
+class DagIndex:
+    """Topological order and longest-chain depths of the condensation of a graph."""
+
+    def __init__(self, g: Any) -> None:
+        self.build(g)
+
+    # ------------------------------------------------------------------
+    # Construction
+    def build(self, g: Any) -> None:
+        """(Re)build the index for graph ``g``."""
+        self.comp_of: Dict[Any, int] = {}
+        self.members: List[Set[Any]] = []
+        # Tarjan yields components sinks first, so reversed ids are a
+        # topological order of the condensation.
+        components = list(strongly_connected_components(g))
+        components.reverse()
+        for cid, component in enumerate(components):
+            self.members.append(component)
+            for node in component:
+                self.comp_of[node] = cid
+        n = len(self.members)
+        self.succ: List[Set[int]] = [set() for _ in range(n)]
+        self.pred: List[Set[int]] = [set() for _ in range(n)]
+        adj = g.adj
+        for u, cu in self.comp_of.items():
+            for v in adj[u]:
+                cv = self.comp_of[v]
+                if cu != cv:
+                    self.succ[cu].add(cv)
+                    self.pred[cv].add(cu)
+        self.pos: List[int] = list(range(n))
+        self.depth: List[int] = [0] * n
+        self.parent: List[Optional[int]] = [None] * n
+        for c in range(n):
+            for p in self.pred[c]:
+                if self.depth[p] + 1 > self.depth[c]:
+                    self.depth[c] = self.depth[p] + 1
+                    self.parent[c] = p
+        self._order: Optional[List[Any]] = None
+        self._log_pos = 0
+        if hasattr(g, "track_edges"):
+            log = g.track_edges()
+            self._log_pos = log.end
+            log.consume(self, log.end)
+        self._graph_version = graph_version(g)
+
+    # ------------------------------------------------------------------
+    # Queries
+    @property
+    def cycles(self) -> List[Set[Any]]:
+        """Node sets of the components that contain a cycle."""
+        return [m for m in self.members if len(m) > 1]
+
+    @property
+    def is_dag(self) -> bool:
+        return all(len(m) == 1 for m in self.members)
+
+    def order(self) -> List[Any]:
+        """Return all nodes in topological order; members of a cycle are adjacent."""
+        if self._order is None:
+            comps = sorted(range(len(self.members)), key=self.pos.__getitem__)
+            self._order = [node for c in comps for node in self.members[c]]
+        return self._order
+
+    def chain_depth(self, node: Any) -> int:
+        """Number of edges in the longest chain ending at ``node``."""
+        return self.depth[self.comp_of[node]]
+
+    def depths(self) -> Dict[Any, int]:
+        return {node: self.depth[c] for node, c in self.comp_of.items()}
+
+    def longest_chain(self, g: Any) -> List[Any]:
+        """Return the nodes of a longest support chain in ``g``.
+
+        A cycle on the chain is entered and left through one of its nodes.
+        """
+        if not self.members:
+            return []
+        c: Optional[int] = max(range(len(self.members)), key=self.depth.__getitem__)
+        comps: List[int] = []
+        while c is not None:
+            comps.append(c)
+            c = self.parent[c]
+        comps.reverse()
+        chain: List[Any] = []
+        for c in comps:
+            members = self.members[c]
+            node = next(iter(members))
+            if chain and len(members) > 1:
+                succ = g.adj[chain[-1]]
+                node = next((m for m in members if m in succ), node)
+            chain.append(node)
+        return chain
+
+    def upstream_scores(self, g: Any, damping: float = 1.0) -> Dict[Any, float]:
+        """Aggregate upstream support of every node.
+
+        ``agg[v] = sum(weight(u, v) * (score(u) + damping * agg[u]))`` over
+        the edges ``u -> v`` that do not lie within a cycle.  Missing
+        scores count as 0.
+        """
+        attrs = getattr(g, "nodes_attr", None) or g.nodes
+        pred = g.pred
+        comp_of = self.comp_of
+        agg: Dict[Any, float] = {}
+        for v in self.order():
+            total = 0.0
+            cv = comp_of[v]
+            for u, edge in pred[v].items():
+                if comp_of[u] == cv:
+                    continue
+                score = attrs[u].get("score") or 0.0
+                total += edge.get("weight", 1.0) * (score + damping * agg[u])
+            agg[v] = total
+        return agg
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    def _new_component(self, node: Any) -> int:
+        cid = len(self.members)
+        self.comp_of[node] = cid
+        self.members.append({node})
+        self.succ.append(set())
+        self.pred.append(set())
+        self.pos.append(len(self.pos))
+        self.depth.append(0)
+        self.parent.append(None)
+        return cid
+
+    def _reorder(self, cu: int, cv: int) -> bool:
+        """Restore the order after adding ``cu -> cv``; False if it closes a cycle."""
+        pos = self.pos
+        lower, upper = pos[cv], pos[cu]
+        forward: List[int] = []
+        seen = {cv}
+        stack = [cv]
+        while stack:
+            c = stack.pop()
+            forward.append(c)
+            for d in self.succ[c]:
+                if d == cu:
+                    return False
+                if d not in seen and pos[d] < upper:
+                    seen.add(d)
+                    stack.append(d)
+        backward: List[int] = []
+        seen = {cu}
+        stack = [cu]
+        while stack:
+            c = stack.pop()
+            backward.append(c)
+            for d in self.pred[c]:
+                if d not in seen and pos[d] > lower:
+                    seen.add(d)
+                    stack.append(d)
+        backward.sort(key=pos.__getitem__)
+        forward.sort(key=pos.__getitem__)
+        slots = sorted(pos[c] for c in backward + forward)
+        for c, slot in zip(backward + forward, slots):
+            pos[c] = slot
+        return True
+
+    def add_edge(self, g: Any, u: Any, v: Any) -> None:
+        """Account for a new edge ``u -> v`` of graph ``g``."""
+        cu = self.comp_of.get(u)
+        if cu is None:
+            cu = self._new_component(u)
+        cv = self.comp_of.get(v)
+        if cv is None:
+            cv = self._new_component(v)
+        if cu == cv or cv in self.succ[cu]:
+            return
+        if self.pos[cu] > self.pos[cv] and not self._reorder(cu, cv):
+            self.build(g)
+            return
+        self.succ[cu].add(cv)
+        self.pred[cv].add(cu)
+        self._order = None
+        if self.depth[cu] + 1 <= self.depth[cv]:
+            return
+        self.depth[cv] = self.depth[cu] + 1
+        self.parent[cv] = cu
+        heap = [(self.pos[cv], cv)]
+        while heap:
+            _, c = heapq.heappop(heap)
+            for d in self.succ[c]:
+                if self.depth[c] + 1 > self.depth[d]:
+                    self.depth[d] = self.depth[c] + 1
+                    self.parent[d] = c
+                    heapq.heappush(heap, (self.pos[d], d))
+
+    def sync(self, g: Any) -> None:
+        """Bring the index up to date with graph ``g`` (see ``ReachabilityIndex.sync``)."""
+        if graph_version(g) == self._graph_version:
+            return
+        log = g.track_edges() if hasattr(g, "track_edges") else None
+        edges = None if log is None else log.since(self._log_pos)
+        if edges is None:
+            self.build(g)
+            return
+        for u, v in edges:
+            self.add_edge(g, u, v)
+            if self._graph_version == graph_version(g):
+                return  # a new cycle made ``add_edge`` rebuild from ``g``
+        if g.number_of_nodes() != len(self.comp_of):
+            for node in g.nodes:
+                if node not in self.comp_of:
+                    self._new_component(node)
+            self._order = None
+        self._log_pos = log.end
+        log.consume(self, log.end)
+        self._graph_version = graph_version(g)
+
+
+_indexes: "weakref.WeakKeyDictionary[Any, DagIndex]" = weakref.WeakKeyDictionary()
+
+
+def dag_index(g: Any) -> DagIndex:
+    """Return the cached ``DagIndex`` of ``g``, synchronised to its current version."""
+    index = _indexes.get(g)
+    if index is None:
+        index = _indexes[g] = DagIndex(g)
+    else:
+        index.sync(g)
+    return index
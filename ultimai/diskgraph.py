@@ -0,0 +1,348 @@
+"""Indexed on-disk storage for reasoning graphs with lazy loading.
+
+``write_indexed`` stores a graph as two files:
+
+* the data file holds one JSON line per node, the node's *block*: its
+  attributes together with its successor and predecessor adjacency;
+* the index file (``<path>.idx``) starts with a JSON header line (node
+  and edge counts) followed by one ``<json id>\\t<offset>\\t<length>``
+  line per node, sorted by the encoded id.
+
+``LazyDiGraph`` opens such a pair without reading it.  A node lookup is a
+binary search over the memory-mapped index followed by a single read
+from the data file, and decoded blocks are kept in a bounded LRU cache.
+The class provides the read side of the ``DiGraph`` surface used by the
+critic, the explainability helpers and the path functions; it is
+read-only: mutation raises ``TypeError`` and node attributes and
+adjacency are returned as ``MappingProxyType`` views.  ``close`` (or
+leaving a ``with`` block) releases the memory maps and file handles.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+from collections import OrderedDict
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Tuple
+
+from .utils import lazy_import
+
+# NetworkX is loaded on first use; the local stub stands in without it.
+nx = lazy_import("networkx")
+if nx is None:  # pragma: no cover
+    from . import networkx_stub as nx  # type: ignore
+
+FORMAT = "ultimai-indexed"
+VERSION = 1
+
+# (attributes, successors, predecessors) of one node.
+Block = Tuple[Mapping[str, Any], Mapping[Any, Mapping[str, Any]], Mapping[Any, Mapping[str, Any]]]
+
+
+def _key(node: Any) -> bytes:
+    return json.dumps(node, ensure_ascii=False).encode("utf-8")
+
+
+def index_path(path: Path) -> Path:
+    return Path(str(path) + ".idx")
+
+
+def write_indexed(g: Any, path: Path) -> None:
+    """Write graph ``g`` to ``path`` and its index to ``path.idx``."""
+    path = Path(path)
+    entries: List[Tuple[bytes, int, int]] = []
+    offset = 0
+    with open(path, "wb") as f:
+        for node, attrs in g.nodes(data=True):
+            block = {
+                "id": node,
+                "attrs": attrs,
+                "succ": [[v, dict(a)] for v, a in g.adj[node].items()],
+                "pred": [[u, dict(a)] for u, a in g.pred[node].items()],
+            }
+            line = json.dumps(block, ensure_ascii=False).encode("utf-8") + b"\n"
+            f.write(line)
+            entries.append((_key(node), offset, len(line)))
+            offset += len(line)
+    entries.sort()
+    header = {"format": FORMAT, "version": VERSION,
+              "nodes": g.number_of_nodes(), "edges": g.number_of_edges()}
+    with open(index_path(path), "wb") as f:
+        f.write(json.dumps(header).encode("utf-8") + b"\n")
+        for key, off, length in entries:
+            f.write(b"%s\t%d\t%d\n" % (key, off, length))
+
+
+class _LazyNodeView:
+    def __init__(self, graph: "LazyDiGraph") -> None:
+        self._graph = graph
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._graph._iter_ids()
+
+    def __len__(self) -> int:
+        return self._graph.number_of_nodes()
+
+    def __contains__(self, node: Any) -> bool:
+        return self._graph.has_node(node)
+
+    def __getitem__(self, node: Any) -> Mapping[str, Any]:
+        return self._graph._block(node)[0]
+
+    def __call__(self, data: bool = False) -> Iterable[Any]:
+        return self._graph.nodes_iter(data=data)
+
+
+class _LazyEdgeView:
+    def __init__(self, graph: "LazyDiGraph") -> None:
+        self._graph = graph
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        return self._graph.edges_iter()
+
+    def __len__(self) -> int:
+        return self._graph.number_of_edges()
+
+    def __call__(self, data: bool = False) -> Iterator[Any]:
+        return self._graph.edges_iter(data=data)
+
+
+class _LazyAdjacency:
+    """Read-only mapping from node to its successor or predecessor dict."""
+
+    def __init__(self, graph: "LazyDiGraph", part: int) -> None:
+        self._graph = graph
+        self._part = part
+
+    def __getitem__(self, node: Any) -> Mapping[Any, Mapping[str, Any]]:
+        return self._graph._block(node)[self._part]  # type: ignore[return-value]
+
+    def get(self, node: Any, default: Any = None) -> Any:
+        if not self._graph.has_node(node):
+            return default
+        return self[node]
+
+    def __contains__(self, node: Any) -> bool:
+        return self._graph.has_node(node)
+
+    def __iter__(self) -> Iterator[Any]:
+        return self._graph._iter_ids()
+
+    def __len__(self) -> int:
+        return self._graph.number_of_nodes()
+
+    def items(self) -> Iterator[Tuple[Any, Dict[Any, Dict[str, Any]]]]:
+        for node, block in self._graph._scan():
+            yield node, block[self._part]  # type: ignore[misc]
+
+
+class LazyDiGraph:
+    """A read-only directed graph that faults node blocks in from disk."""
+
+    def __init__(self, path: Path, cache_size: int = 100_000) -> None:
+        self.path = Path(path)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Any, Block]" = OrderedDict()
+        with open(index_path(self.path), "rb") as f:
+            header = json.loads(f.readline())
+            self._body = f.tell()
+        if header.get("format") != FORMAT:
+            raise ValueError(f"{self.path} is not an indexed reasoning graph")
+        self._num_nodes = int(header["nodes"])
+        self._num_edges = int(header["edges"])
+        self._index_file = open(index_path(self.path), "rb")
+        self._data_file = open(self.path, "rb")
+        self._index = self._map(self._index_file)
+        self._data = self._map(self._data_file)
+        self._closed = False
+
+    @staticmethod
+    def _map(f: Any) -> Optional[mmap.mmap]:
+        f.seek(0, 2)
+        if f.tell() == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        """Release the memory maps and file handles; the graph is unusable afterwards."""
+        for m in (self._index, self._data):
+            if m is not None:
+                m.close()
+        self._index = self._data = None
+        self._index_file.close()
+        self._data_file.close()
+        self._cache.clear()
+        self._closed = True
+
+    def __enter__(self) -> "LazyDiGraph":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def _check_open(self) -> None:
+        if self._closed:
+            raise ValueError(f"{self.path} has been closed")
+
+    # ------------------------------------------------------------------
+    # Index and cache
+    def _lookup(self, node: Any) -> Optional[Tuple[int, int]]:
+        self._check_open()
+        mm = self._index
+        if mm is None:
+            return None
+        target = _key(node)
+        lo, hi = self._body, len(mm)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            r = mm.rfind(b"\n", lo, mid)
+            start = lo if r == -1 else r + 1
+            end = mm.find(b"\n", start)
+            key, off, length = mm[start:end].split(b"\t")
+            if key == target:
+                return int(off), int(length)
+            if key < target:
+                lo = end + 1
+            else:
+                hi = start
+        return None
+
+    def _load(self, off: int, length: int) -> Tuple[Any, Block]:
+        assert self._data is not None
+        raw = json.loads(self._data[off:off + length])
+        succ = {v: a for v, a in raw["succ"]}
+        pred = {u: a for u, a in raw["pred"]}
+        return raw["id"], (raw["attrs"], succ, pred)
+
+    def _block(self, node: Any) -> Block:
+        cache = self._cache
+        block = cache.get(node)
+        if block is not None:
+            cache.move_to_end(node)
+            return block
+        loc = self._lookup(node)
+        if loc is None:
+            raise KeyError(node)
+        _, (attrs, succ, pred) = self._load(*loc)
+        # Cached blocks are shared by every caller, so they are handed out
+        # as read-only views.
+        block = (MappingProxyType(attrs),
+                 MappingProxyType({v: MappingProxyType(a) for v, a in succ.items()}),
+                 MappingProxyType({u: MappingProxyType(a) for u, a in pred.items()}))
+        cache[node] = block
+        if len(cache) > self.cache_size:
+            cache.popitem(last=False)
+        return block
+
+    def _iter_ids(self) -> Iterator[Any]:
+        self._check_open()
+        mm = self._index
+        if mm is None:
+            return
+        pos = self._body
+        while pos < len(mm):
+            end = mm.find(b"\n", pos)
+            yield json.loads(mm[pos:mm.find(b"\t", pos)])
+            pos = end + 1
+
+    def _scan(self) -> Iterator[Tuple[Any, Block]]:
+        """Stream every block in file order without touching the cache."""
+        self._check_open()
+        if self._data is None:
+            return
+        pos = 0
+        mm = self._data
+        while pos < len(mm):
+            end = mm.find(b"\n", pos)
+            yield self._load(pos, end + 1 - pos)
+            pos = end + 1
+
+    # ------------------------------------------------------------------
+    # DiGraph surface
+    def has_node(self, node: Any) -> bool:
+        return node in self._cache or self._lookup(node) is not None
+
+    def __contains__(self, node: Any) -> bool:
+        return self.has_node(node)
+
+    def __len__(self) -> int:
+        return self._num_nodes
+
+    def has_edge(self, u: Any, v: Any) -> bool:
+        return self.has_node(u) and v in self._block(u)[1]
+
+    def get_edge_data(self, u: Any, v: Any) -> Optional[Mapping[str, Any]]:
+        if not self.has_node(u):
+            return None
+        return self._block(u)[1].get(v)
+
+    def nodes_iter(self, data: bool = False) -> Iterable[Any]:
+        if data:
+            return ((n, block[0]) for n, block in self._scan())
+        return self._iter_ids()
+
+    def edges_iter(self, data: bool = False) -> Iterator[Any]:
+        for u, block in self._scan():
+            for v, attrs in block[1].items():
+                yield (u, v, attrs) if data else (u, v)
+
+    @property
+    def nodes(self) -> _LazyNodeView:
+        return _LazyNodeView(self)
+
+    @property
+    def edges(self) -> _LazyEdgeView:
+        return _LazyEdgeView(self)
+
+    @property
+    def adj(self) -> _LazyAdjacency:
+        return _LazyAdjacency(self, 1)
+
+    @property
+    def pred(self) -> _LazyAdjacency:
+        return _LazyAdjacency(self, 2)
+
+    def degree(self) -> Iterator[Tuple[Any, int]]:
+        for n, block in self._scan():
+            yield (n, len(block[1]) + len(block[2]))
+
+    def out_degree(self, n: Any) -> int:
+        return len(self._block(n)[1])
+
+    def in_degree(self, n: Any) -> int:
+        return len(self._block(n)[2])
+
+    def neighbors(self, n: Any) -> List[Any]:
+        return list(self._block(n)[1])
+
+    def successors(self, n: Any) -> Iterator[Any]:
+        return iter(self._block(n)[1])
+
+    def predecessors(self, n: Any) -> Iterator[Any]:
+        return iter(self._block(n)[2])
+
+    def number_of_nodes(self) -> int:
+        return self._num_nodes
+
+    def number_of_edges(self) -> int:
+        return self._num_edges
+
+    def subgraph(self, nodes: Iterable[Any]) -> Any:
+        """Return an in-memory graph induced on ``nodes``, loading only them."""
+        sg = nx.DiGraph()
+        node_set = {n for n in nodes if self.has_node(n)}
+        for n in node_set:
+            sg.add_node(n, **self._block(n)[0])
+        for u in node_set:
+            for v, attrs in self._block(u)[1].items():
+                if v in node_set:
+                    sg.add_edge(u, v, **attrs)
+        return sg
+
+    def add_node(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("LazyDiGraph is read-only")
+
+    def add_edge(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("LazyDiGraph is read-only")
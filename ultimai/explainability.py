@@ -0,0 +1,325 @@
+"""Explainability utilities.
+
+This module provides helper functions to extract human‑readable explanations from
+the reasoning graph.  Functions include retrieving justification paths,
+producing natural language summaries and exporting knowledge graphs.
+
+Justification paths are found with ``ultimai.paths``: a bidirectional
+BFS by default, or a strength‑of‑support search (``weighted=True``) in
+which edges with a higher ``weight`` are preferred.
+
+Knowledge‑graph export is streamed: ``iter_entities`` and
+``iter_relations`` yield one record at a time and ``export_kg_stream``
+writes them to JSONL, N‑Triples or CSV (optionally gzip‑compressed)
+without holding the export in memory.
+"""
+
+from __future__ import annotations
+
+import csv
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Collection, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import quote
+
+from .utils import lazy_import
+
+# NetworkX is loaded on first use; the local stub stands in without it.
+nx = lazy_import("networkx")
+if nx is None:  # pragma: no cover
+    from . import networkx_stub as nx  # type: ignore
+
+from .graph import ReasoningGraph
+from .reachability import ReachabilityIndex
+from . import paths
+
+# Shortest-path trees shared by batched justification queries.
+tree_cache = paths.TreeCache()
+
+
+def get_justification_path(rg: ReasoningGraph, start: str, end: str, weighted: bool = False,
+                           max_depth: Optional[int] = None) -> List[str]:
+    """Return one of the shortest paths (list of nodes) between two concepts.
+
+    With ``weighted=True`` the best‑supported path is returned instead of
+    the one with the fewest hops.  Paths longer than ``max_depth`` edges
+    are not considered.  An empty list means there is no justification.
+    """
+    try:
+        if weighted:
+            return paths.dijkstra_path(rg.graph, start, end, max_depth=max_depth)
+        return paths.bidirectional_shortest_path(rg.graph, start, end, max_depth=max_depth)
+    except (nx.NetworkXNoPath, nx.NodeNotFound):
+        return []
+
+
+def get_justification_paths(rg: ReasoningGraph, start: str, end: str, k: int = 3,
+                            weighted: bool = False, max_depth: Optional[int] = None) -> List[List[str]]:
+    """Return up to ``k`` alternative justification paths, best first."""
+    try:
+        return paths.k_shortest_paths(rg.graph, start, end, k, weighted=weighted, max_depth=max_depth)
+    except (nx.NetworkXNoPath, nx.NodeNotFound):
+        return []
+
+
+def has_justification(rg: ReasoningGraph, start: str, end: str,
+                      index: Optional[ReachabilityIndex] = None) -> bool:
+    """Return True when some justification path leads from ``start`` to ``end``.
+
+    With a ``ReachabilityIndex`` the index is synced with ``rg.graph`` and
+    answers the query; otherwise a bidirectional search is run.
+    """
+    if index is not None:
+        index.sync(rg.graph)
+        return index.reachable(start, end)
+    return bool(get_justification_path(rg, start, end))
+
+
+def get_justification_paths_batch(rg: ReasoningGraph, pairs: Iterable[Tuple[str, str]],
+                                  weighted: bool = False, max_depth: Optional[int] = None,
+                                  cache: Optional[paths.TreeCache] = None) -> Dict[Tuple[str, str], List[str]]:
+    """Answer many ``(start, end)`` justification queries at once.
+
+    Pairs are grouped by ``start`` and each distinct start is searched
+    once; its shortest-path tree is kept in ``cache`` (the module-level
+    ``tree_cache`` by default) until the graph changes.  The result maps
+    every pair to its path, or ``[]`` when there is none.
+    """
+    cache = tree_cache if cache is None else cache
+    by_source: Dict[str, List[str]] = {}
+    for start, end in pairs:
+        by_source.setdefault(start, []).append(end)
+    results: Dict[Tuple[str, str], List[str]] = {}
+    for start, ends in by_source.items():
+        if not rg.graph.has_node(start):
+            for end in ends:
+                results[(start, end)] = []
+            continue
+        if weighted and max_depth is not None:
+            # A depth-bounded weighted query has no single shared tree.
+            for end in ends:
+                results[(start, end)] = get_justification_path(rg, start, end, True, max_depth)
+            continue
+        parents = cache.tree(rg.graph, start, weighted=weighted, max_depth=max_depth)
+        for end in ends:
+            results[(start, end)] = paths.path_from_tree(parents, end)
+    return results
+
+
+def summarise_concept(rg: ReasoningGraph, node_id: str) -> str:
+    """Generate a simple textual summary of a concept node."""
+    if not rg.graph.has_node(node_id):
+        return f"Concept '{node_id}' not found."
+    node = rg.node_attrs(node_id)
+    label = node.get('label', node_id)
+    source = node.get('source')
+    score = node.get('score')
+    parts = [f"**{label}**"]
+    if source:
+        parts.append(f"(source: {source})")
+    if score is not None:
+        parts.append(f"score: {score:.2f}")
+    return ' '.join(parts)
+
+
+def find_concepts(rg: ReasoningGraph, query: str, limit: int = 10, prefix: bool = True,
+                  fields: Optional[Iterable[str]] = None) -> List[str]:
+    """Return ids of the best-scored concepts matching ``query``.
+
+    Every term must match a word of the label, source or type (as a
+    prefix unless ``prefix=False``); see ``ReasoningGraph.search``.
+    """
+    return rg.search(query, fields=fields, prefix=prefix, limit=limit, ranked=True)
+
+
+def _node_items(g: Any) -> Iterable[Tuple[Any, Dict[str, Any]]]:
+    attrs = getattr(g, "nodes_attr", None)
+    if attrs is not None:
+        # The stub graph: iterate the attribute dicts without copying them.
+        return attrs.items()
+    # NetworkX views and the storage engines iterate lazily.
+    return g.nodes(data=True)
+
+
+def _entity(node_id: Any, attrs: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        'id': node_id,
+        'label': attrs.get('label', node_id),
+        'type': attrs.get('type', 'concept'),
+        'score': attrs.get('score'),
+        'source': attrs.get('source'),
+        'metadata': attrs.get('metadata', {})
+    }
+
+
+def iter_entities(rg: ReasoningGraph, types: Optional[Collection[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield the knowledge‑graph entity of every node, optionally only of ``types``."""
+    for node_id, attrs in _node_items(rg.graph):
+        if types is None or attrs.get('type', 'concept') in types:
+            yield _entity(node_id, attrs)
+
+
+def _kept_relation(rg: ReasoningGraph, src: Any, dst: Any, attrs: Dict[str, Any],
+                   relations: Optional[Collection[str]],
+                   types: Optional[Collection[str]]) -> Optional[str]:
+    """Return the relation name of an edge, or ``None`` if the filters drop it."""
+    relation = attrs.get('relation', 'influences')
+    if relations is not None and relation not in relations:
+        return None
+    if types is not None and (rg.node_attrs(src).get('type', 'concept') not in types
+                              or rg.node_attrs(dst).get('type', 'concept') not in types):
+        return None
+    return relation
+
+
+def iter_relations(rg: ReasoningGraph, relations: Optional[Collection[str]] = None,
+                   types: Optional[Collection[str]] = None) -> Iterator[Dict[str, Any]]:
+    """Yield the knowledge‑graph relation of every edge.
+
+    ``relations`` keeps only edges with those relation names; ``types``
+    keeps only edges whose endpoints both have one of those types, to
+    match ``iter_entities`` with the same filter.
+    """
+    for src, dst, attrs in rg.graph.edges(data=True):
+        relation = _kept_relation(rg, src, dst, attrs, relations, types)
+        if relation is None:
+            continue
+        yield {
+            'source': src,
+            'target': dst,
+            'relation': relation,
+            'weight': attrs.get('weight', 1.0)
+        }
+
+
+def export_as_kg(rg: ReasoningGraph) -> Dict[str, Any]:
+    """Export the reasoning graph in a simple knowledge‑graph serialisation.
+
+    Returns a dict with lists of `entities` and `relations`.  Each entity
+    contains its id, label and attributes.  Each relation contains source,
+    target and relation type.  Use ``export_kg_stream`` for large graphs.
+    """
+    return {'entities': list(iter_entities(rg)), 'relations': list(iter_relations(rg))}
+
+
+KG_FORMATS = ('jsonl', 'nt', 'csv')
+
+_XSD_DOUBLE = '<http://www.w3.org/2001/XMLSchema#double>'
+_RDF_TYPE = '<http://www.w3.org/1999/02/22-rdf-syntax-ns#type>'
+_RDFS_LABEL = '<http://www.w3.org/2000/01/rdf-schema#label>'
+
+# Column layout of the seed CSV files read by ``ReasoningGraph.from_csv``.
+CSV_COLUMNS = ['source_id', 'source_label', 'source_type', 'source_file', 'source_score',
+               'target_id', 'target_label', 'target_type', 'target_file', 'target_score',
+               'relation', 'weight']
+
+
+def _kg_format(path: Path) -> str:
+    suffixes = [x.lower() for x in path.suffixes]
+    if suffixes and suffixes[-1] == '.gz':
+        suffixes.pop()
+    fmt = suffixes[-1].lstrip('.') if suffixes else ''
+    return {'json': 'jsonl', 'ndjson': 'jsonl', 'ntriples': 'nt'}.get(fmt, fmt)
+
+
+def _literal(value: Any) -> str:
+    text = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return '"' + text.replace('\n', '\\n').replace('\r', '\\r') + '"'
+
+
+def _write_jsonl(out: IO[str], entities: Iterable[Dict[str, Any]],
+                 relations: Iterable[Dict[str, Any]]) -> Tuple[int, int]:
+    n = m = 0
+    for entity in entities:
+        out.write(json.dumps(dict(kind='entity', **entity), default=str) + '\n')
+        n += 1
+    for relation in relations:
+        out.write(json.dumps(dict(kind='relation', **relation), default=str) + '\n')
+        m += 1
+    return n, m
+
+
+def _write_ntriples(out: IO[str], entities: Iterable[Dict[str, Any]],
+                    relations: Iterable[Dict[str, Any]], base: str) -> Tuple[int, int]:
+    def iri(kind: str, value: Any) -> str:
+        return f"<{base}{kind}/{quote(str(value), safe='')}>"
+
+    n = m = 0
+    for e in entities:
+        subject = iri('node', e['id'])
+        out.write(f"{subject} {_RDFS_LABEL} {_literal(e['label'])} .\n")
+        out.write(f"{subject} {_RDF_TYPE} {iri('type', e['type'])} .\n")
+        if e['score'] is not None:
+            out.write(f"{subject} {iri('property', 'score')} {_literal(float(e['score']))}^^{_XSD_DOUBLE} .\n")
+        if e['source']:
+            out.write(f"{subject} {iri('property', 'source')} {_literal(e['source'])} .\n")
+        n += 1
+    for r in relations:
+        out.write(f"{iri('node', r['source'])} {iri('relation', r['relation'])} {iri('node', r['target'])} .\n")
+        m += 1
+    return n, m
+
+
+def _write_csv(out: IO[str], rg: ReasoningGraph, relations: Optional[Collection[str]],
+               types: Optional[Collection[str]]) -> Tuple[int, int]:
+    writer = csv.writer(out)
+    writer.writerow(CSV_COLUMNS)
+    m = 0
+    for r in iter_relations(rg, relations, types):
+        row = []
+        for node_id in (r['source'], r['target']):
+            attrs = rg.node_attrs(node_id)
+            score = attrs.get('score')
+            row += [node_id, attrs.get('label', node_id), attrs.get('type', 'concept'),
+                    attrs.get('source') or '', '' if score is None else score]
+        writer.writerow(row + [r['relation'], r['weight']])
+        m += 1
+    return _csv_entities(rg, relations, types), m
+
+
+def _csv_entities(rg: ReasoningGraph, relations: Optional[Collection[str]],
+                  types: Optional[Collection[str]]) -> int:
+    # Nodes appear in the CSV only through their relations.  Counting them
+    # in a second pass over the adjacency avoids holding a set of every
+    # node id written.
+    g = rg.graph
+    if relations is None and types is None:
+        return sum(1 for _, d in g.degree() if d)
+    n = 0
+    for node in g.nodes:
+        if (any(_kept_relation(rg, node, v, a, relations, types) for v, a in g.adj[node].items())
+                or any(_kept_relation(rg, u, node, a, relations, types)
+                       for u, a in g.pred[node].items())):
+            n += 1
+    return n
+
+
+def export_kg_stream(rg: ReasoningGraph, path: Path, fmt: Optional[str] = None,
+                     relations: Optional[Collection[str]] = None,
+                     types: Optional[Collection[str]] = None,
+                     base_iri: str = 'urn:ultimai:') -> Tuple[int, int]:
+    """Stream the knowledge graph to ``path`` and return ``(entities, relations)`` written.
+
+    ``fmt`` is ``"jsonl"`` (one ``entity``/``relation`` object per line),
+    ``"nt"`` (N‑Triples, with IRIs under ``base_iri``) or ``"csv"`` (one
+    row per relation in the seed CSV layout, readable by
+    ``ReasoningGraph.from_csv``; isolated nodes are not written).  It
+    defaults to the file suffix, and a ``.gz`` suffix compresses the
+    output.  ``relations`` and ``types`` filter as in ``iter_relations``.
+    """
+    path = Path(path)
+    fmt = fmt or _kg_format(path)
+    if fmt not in KG_FORMATS:
+        raise ValueError(f"unknown export format {fmt!r}; expected one of {KG_FORMATS}")
+    rels = iter_relations(rg, relations, types)
+    if path.suffix.lower() == '.gz':
+        out = gzip.open(path, 'wt', encoding='utf-8', newline='')
+    else:
+        out = open(path, 'w', encoding='utf-8', newline='')
+    with out:
+        if fmt == 'csv':
+            return _write_csv(out, rg, relations, types)
+        if fmt == 'nt':
+            return _write_ntriples(out, iter_entities(rg, types), rels, base_iri)
+        return _write_jsonl(out, iter_entities(rg, types), rels)
@@ -10,16 +10,35 @@ from __future__ import annotations
 
 import json
 import csv
+import os
+import sys
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-# Attempt to import NetworkX; if unavailable, use a local stub.
-try:
-    import networkx as nx  # type: ignore
-except ImportError:  # pragma: no cover
+from .utils import lazy_import
+
+# NetworkX is loaded on first use; the local stub stands in without it.
+nx = lazy_import("networkx")
+if nx is None:  # pragma: no cover
     from . import networkx_stub as nx  # type: ignore
 
+from .symbols import intern_symbol, encode_symbols, decode_symbols
+from .diskgraph import LazyDiGraph, index_path, write_indexed
+from .search import ConceptIndex, FIELDS as SEARCH_FIELDS
+from .views import SubgraphView, neighbourhood
+from .dag import DagIndex, dag_index
+from .networkx_stub import (
+    label_propagation_communities,
+    strongly_connected_components,
+    weakly_connected_components,
+)
+
+# File suffixes that ``load`` and ``save`` treat as SQLite databases.
+SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
 
 @dataclass
 class NodeData:
@@ -31,80 +50,329 @@ class NodeData:
     metadata: Optional[Dict[str, Any]] = None
 
 
+def read_csv_records(path: Path) -> List[Dict[str, Any]]:
+    """Return the rows of a seed CSV file as dictionaries.
+
+    pandas is used when installed; otherwise the standard library CSV
+    reader is used.
+    """
+    try:
+        import pandas as pd  # type: ignore
+    except ImportError:
+        pd = None  # type: ignore
+    if pd is not None:
+        df = pd.read_csv(path)
+        return df.to_dict(orient="records")
+    with open(path, newline="", encoding="utf-8") as f:
+        reader = csv.DictReader(f)
+        return [row for row in reader]
+
+
+def csv_endpoints(row: Dict[str, Any]) -> Tuple[str, str]:
+    """Return the ``(source, target)`` node ids of a CSV row."""
+    src = str(row.get("source_id")) if row.get("source_id") is not None else str(row.get("source_label"))
+    dst = str(row.get("target_id")) if row.get("target_id") is not None else str(row.get("target_label"))
+    return src, dst
+
+
+def csv_node(row: Dict[str, Any], side: str, node_id: str) -> NodeData:
+    """Build the node data for the ``source`` or ``target`` side of a CSV row."""
+    score = row.get(f"{side}_score")
+    return NodeData(
+        label=row.get(f"{side}_label", node_id),
+        type=row.get(f"{side}_type", "concept"),
+        source=row.get(f"{side}_file"),
+        score=float(score) if score not in (None, "") else None,
+        metadata={},
+    )
+
+
+def csv_edge(row: Dict[str, Any]) -> Tuple[str, float]:
+    """Return the ``(relation, weight)`` pair of a CSV row."""
+    w = row.get("weight", 1.0)
+    try:
+        weight = float(w)
+    except (TypeError, ValueError):
+        weight = 1.0
+    return row.get("relation", "influences"), weight
+
+
+def patch_path(path: Path) -> Path:
+    """Return the patch file that incremental saves of ``path`` append to."""
+    return Path(str(path) + ".patch")
+
+
+def _save_token(path: Path) -> str:
+    # Identifies one version of a saved base file; a rewrite by another
+    # process changes it and forces the next save to be a full one.
+    stat = path.stat()
+    return f"{path.resolve()}:{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def _apply_patch(g: Any, patch: Dict[str, Any]) -> None:
+    for u, v in patch.get("removed_links", []):
+        if g.has_edge(u, v):
+            g.remove_edge(u, v)
+    for nid in patch.get("removed_nodes", []):
+        if g.has_node(nid):
+            g.remove_node(nid)
+    for node in patch.get("nodes", []):
+        nid = node["id"]
+        g.add_node(nid)
+        attrs = g.nodes[nid]
+        attrs.clear()
+        attrs.update({k: v for k, v in node.items() if k != "id"})
+    for link in patch.get("links", []):
+        g.add_edge(link["source"], link["target"],
+                   **{k: v for k, v in link.items() if k not in ("source", "target")})
+
+
+def _intern_id(node_id: Any) -> Any:
+    return sys.intern(node_id) if type(node_id) is str else node_id
+
+
 class ReasoningGraph:
     """Container for a directed reasoning graph."""
 
     def __init__(self) -> None:
         self.graph: nx.DiGraph = nx.DiGraph()
+        # Inverted index over node attributes; see ``enable_search_index``.
+        self.search_index: Optional[ConceptIndex] = None
+        # Number of versions published through ``transaction``/``publish``.
+        self.version = 0
+        # Save token of the base file and number of patches appended to it.
+        self._patches: Tuple[Optional[str], int] = (None, 0)
+        self._init_locks()
+
+    def _init_locks(self) -> None:
+        # ``_swap_lock`` guards taking snapshots and publishing versions;
+        # ``_write_lock`` serialises transactions.
+        self._swap_lock = threading.Lock()
+        self._write_lock = threading.RLock()
 
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        del state["_swap_lock"], state["_write_lock"]
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._init_locks()
+
+    # Node ids and labels are interned with ``sys.intern``; relations, types
+    # and sources go through the shared symbol table (see ``symbols``).
     def add_node(self, node_id: str, data: NodeData) -> None:
-        self.graph.add_node(node_id, **asdict(data))
+        attrs = asdict(data)
+        if isinstance(attrs["label"], str):
+            attrs["label"] = sys.intern(attrs["label"])
+        attrs["type"] = intern_symbol(attrs["type"])
+        attrs["source"] = intern_symbol(attrs["source"])
+        node_id = _intern_id(node_id)
+        self.graph.add_node(node_id, **attrs)
+        if self.search_index is not None:
+            self.search_index.add(node_id, attrs)
 
     def add_edge(self, src: str, dst: str, relation: str = "influences", weight: float = 1.0) -> None:
-        self.graph.add_edge(src, dst, relation=relation, weight=weight)
+        self.graph.add_edge(_intern_id(src), _intern_id(dst), relation=intern_symbol(relation), weight=weight)
 
     def from_csv(self, path: Path) -> None:
         """Load nodes and edges from a CSV file with column names matching seeds.json."""
-        records: List[Dict[str, Any]]
-        try:
-            import pandas as pd  # type: ignore
-        except ImportError:
-            pd = None  # type: ignore
-        if pd is not None:
-            df = pd.read_csv(path)
-            records = df.to_dict(orient="records")
-        else:
-            with open(path, newline="", encoding="utf-8") as f:
-                reader = csv.DictReader(f)
-                records = [row for row in reader]
-        for row in records:
-            src = str(row.get("source_id")) if row.get("source_id") is not None else str(row.get("source_label"))
-            dst = str(row.get("target_id")) if row.get("target_id") is not None else str(row.get("target_label"))
+        for row in read_csv_records(path):
+            src, dst = csv_endpoints(row)
             if not self.graph.has_node(src):
-                self.add_node(src, NodeData(
-                    label=row.get("source_label", src),
-                    type=row.get("source_type", "concept"),
-                    source=row.get("source_file"),
-                    score=float(row.get("source_score")) if row.get("source_score") not in (None, "") else None,
-                    metadata={},
-                ))
+                self.add_node(src, csv_node(row, "source", src))
             if not self.graph.has_node(dst):
-                self.add_node(dst, NodeData(
-                    label=row.get("target_label", dst),
-                    type=row.get("target_type", "concept"),
-                    source=row.get("target_file"),
-                    score=float(row.get("target_score")) if row.get("target_score") not in (None, "") else None,
-                    metadata={},
-                ))
-            # Parse weight if present
-            w = row.get("weight", 1.0)
-            try:
-                weight = float(w)
-            except (TypeError, ValueError):
-                weight = 1.0
-            self.add_edge(src, dst, relation=row.get("relation", "influences"), weight=weight)
+                self.add_node(dst, csv_node(row, "target", dst))
+            relation, weight = csv_edge(row)
+            self.add_edge(src, dst, relation=relation, weight=weight)
 
     def from_json(self, path: Path) -> None:
         """Load a graph from a JSON file saved by `save`.
 
         The file must contain a node‑link representation as produced by
-        `networkx.readwrite.node_link_data`.
+        `networkx.readwrite.node_link_data`.  Patches appended by incremental saves (``<path>.patch``) are
+        applied in order on top of the base file.
         """
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
-        g = nx.node_link_graph(data)  # type: ignore
+        g = nx.node_link_graph(decode_symbols(data))  # type: ignore
+        patch = patch_path(Path(path))
+        patches = 0
+        if patch.exists():
+            with open(patch, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        _apply_patch(g, decode_symbols(json.loads(line)))
+                        patches += 1
+        if hasattr(g, "mark_clean"):
+            token = _save_token(Path(path))
+            g.mark_clean(token)
+            self._patches = (token, patches)
+        self.close()
         self.graph = g  # type: ignore
+        if self.search_index is not None:
+            self.enable_search_index(self.search_index.fields)
+
+    def save(self, path: Path, compact: bool = False, incremental: bool = False,
+             max_patches: int = 32) -> None:
+        """Save the graph to a JSON file in node‑link format.
 
-    def save(self, path: Path) -> None:
-        """Save the graph to a JSON file in node‑link format."""
+        With ``compact=True`` relations, node types and sources are written
+        as ids into a symbol table stored in the ``graph`` section; ``load``
+        reads both forms.  Paths ending in one of ``SQLITE_SUFFIXES`` are
+        written with ``save_sqlite`` instead.
+
+        With ``incremental=True``, if the graph was last loaded from or
+        saved to ``path`` and the base file is unchanged, only the nodes
+        and edges modified or removed since then are appended to
+        ``<path>.patch``.
+        Once the patch file holds ``max_patches`` entries, or when the
+        graph cannot report its changes, the whole file is rewritten and
+        the patch file removed.
+        """
+        path = Path(path)
+        if path.suffix.lower() in SQLITE_SUFFIXES:
+            self.save_sqlite(path)
+            return
+        if incremental and self._save_patch(path, max_patches):
+            return
         data = nx.node_link_data(self.graph)
+        if compact:
+            data = encode_symbols(data)
         with open(path, "w", encoding="utf-8") as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
+        patch_path(path).unlink(missing_ok=True)
+        if hasattr(self.graph, "mark_clean"):
+            token = _save_token(path)
+            self.graph.mark_clean(token)
+            self._patches = (token, 0)
+
+    def _save_patch(self, path: Path, max_patches: int) -> bool:
+        """Append changes since the last save of ``path``; False if not possible."""
+        changes_since = getattr(self.graph, "changes_since", None)
+        if changes_since is None or not path.exists():
+            return False
+        token = _save_token(path)
+        changes = changes_since(token)
+        if changes is None:
+            return False
+        patch = patch_path(path)
+        saved, patches = self._patches
+        if saved != token:
+            # Marked clean by another ReasoningGraph (a copy); count once.
+            patches = 0
+            if patch.exists():
+                with open(patch, "rb") as f:
+                    patches = sum(1 for line in f if line.strip())
+        if patches >= max_patches:
+            return False
+        nodes, edges = changes
+        if nodes or edges:
+            g = self.graph
+            record = {
+                "nodes": [dict(id=n, **g.nodes_attr[n]) for n in nodes if g.has_node(n)],
+                "links": [dict(source=u, target=v, **g.get_edge_data(u, v))
+                          for u, v in edges if g.has_edge(u, v)],
+            }
+            removed_nodes = [n for n in nodes if not g.has_node(n)]
+            removed_links = [[u, v] for u, v in edges if not g.has_edge(u, v)]
+            if removed_nodes:
+                record["removed_nodes"] = removed_nodes
+            if removed_links:
+                record["removed_links"] = removed_links
+            with open(patch, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            patches += 1
+        self.graph.mark_clean(token)
+        self._patches = (token, patches)
+        return True
 
     def load(self, path: Path) -> None:
-        """Alias for from_json."""
+        """Alias for from_json; SQLite databases are opened with ``open_sqlite``."""
+        if Path(path).suffix.lower() in SQLITE_SUFFIXES:
+            from .sqlite_store import SQLiteDiGraph
+            self.close()
+            self.graph = SQLiteDiGraph(Path(path))  # type: ignore[assignment]
+            return
         self.from_json(path)
 
+    def close(self) -> None:
+        """Release the files held by an on-disk storage engine.
+
+        Called before ``load`` replaces the graph; in-memory graphs hold
+        nothing.  A ``ReasoningGraph`` is also a context manager that
+        closes it on exit.
+        """
+        close = getattr(self.graph, "close", None)
+        if close is not None:
+            close()
+
+    def __enter__(self) -> "ReasoningGraph":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def save_sqlite(self, path: Path) -> None:
+        """Copy the graph into an SQLite database (see ``sqlite_store``).
+
+        A graph stored in SQLite flushes its pending writes when ``path``
+        is its own database and is copied with the SQLite backup API
+        otherwise, without loading it into memory.
+        """
+        from .sqlite_store import SQLiteDiGraph, write_sqlite
+        g = self.graph
+        if isinstance(g, SQLiteDiGraph):
+            if g.path != ":memory:" and Path(g.path).resolve() == Path(path).resolve():
+                g.flush()
+            else:
+                g.backup_to(Path(path))
+            return
+        write_sqlite(g, Path(path)).close()
+
+    @classmethod
+    def open_sqlite(cls, path: Path, batch_size: int = 1000) -> "ReasoningGraph":
+        """Return a graph stored in the SQLite database at ``path``.
+
+        The database is created when missing; changes are written back in
+        batched transactions.
+        """
+        rg = cls()
+        from .sqlite_store import SQLiteDiGraph
+        rg.graph = SQLiteDiGraph(Path(path), batch_size=batch_size)  # type: ignore[assignment]
+        return rg
+
+    def save_indexed(self, path: Path) -> None:
+        """Save the graph as an indexed data file plus ``path.idx``.
+
+        See ``open_indexed`` for reading it back lazily.  Saving over the
+        file this graph was opened from writes new files, closes the old
+        ones and reopens the result.
+        """
+        path = Path(path)
+        g = self.graph
+        if not isinstance(g, LazyDiGraph) or g.path.resolve() != path.resolve():
+            write_indexed(g, path)
+            return
+        tmp = path.with_name(path.name + ".tmp")
+        write_indexed(g, tmp)
+        g.close()
+        os.replace(tmp, path)
+        os.replace(index_path(tmp), index_path(path))
+        self.graph = LazyDiGraph(path, cache_size=g.cache_size)  # type: ignore[assignment]
+
+    @classmethod
+    def open_indexed(cls, path: Path, cache_size: int = 100_000) -> "ReasoningGraph":
+        """Open a graph written by ``save_indexed`` without loading it.
+
+        Node attributes and adjacency are read on first access and at most
+        ``cache_size`` nodes are kept in memory.  The returned graph is
+        read-only; ``subgraph`` materialises only the requested nodes.
+        """
+        rg = cls()
+        rg.graph = LazyDiGraph(Path(path), cache_size=cache_size)  # type: ignore[assignment]
+        return rg
+
     # Basic metrics
     def compute_degree_centrality(self) -> Dict[str, float]:
         """Compute a degree-based centrality where the sum of scores equals the number of nodes.
@@ -120,6 +388,38 @@ class ReasoningGraph:
     def compute_pagerank(self, alpha: float = 0.85) -> Dict[str, float]:
         return nx.pagerank(self.graph, alpha=alpha)
 
+    def node_attrs(self, node_id: str) -> Dict[str, Any]:
+        """Return the attributes of a node for reading.
+
+        Unlike ``graph.nodes[node_id]`` this does not record the node's
+        attributes for change tracking, which incremental saves compare to
+        find the nodes really modified.
+        """
+        attrs = getattr(self.graph, "nodes_attr", None)
+        if attrs is not None:
+            return attrs[node_id]
+        return self.graph.nodes[node_id]
+
+    # ------------------------------------------------------------------
+    # Search
+    def enable_search_index(self, fields: Iterable[str] = SEARCH_FIELDS) -> ConceptIndex:
+        """Build an inverted index over ``fields`` and keep it updated on ``add_node``."""
+        index = ConceptIndex(tuple(fields))
+        index.build(self.graph.nodes(data=True))  # type: ignore
+        self.search_index = index
+        return index
+
+    def search(self, query: str, fields: Optional[Iterable[str]] = None, prefix: bool = False,
+               limit: Optional[int] = None, ranked: bool = False) -> List[str]:
+        """Find nodes whose label, source or type contain every term of ``query``.
+
+        ``ranked=True`` orders the results by node score, highest first.
+        The index is built on first use if it is not enabled yet.
+        """
+        index = self.search_index or self.enable_search_index()
+        scores = (lambda n: self.node_attrs(n).get("score")) if ranked else None
+        return index.search(query, fields=fields, prefix=prefix, limit=limit, scores=scores)
+
     def get_neighbors(self, node_id: str) -> List[str]:
         return list(self.graph.neighbors(node_id))
 
@@ -128,6 +428,156 @@ class ReasoningGraph:
         sg.graph = self.graph.subgraph(nodes).copy()
         return sg
 
+    def neighbourhood(self, node_id: str, k: int = 1, direction: str = "both",
+                      relation_filter: Any = None) -> "ReasoningGraph":
+        """Return the nodes within ``k`` hops of ``node_id`` without copying them.
+
+        The returned graph wraps a read-only ``SubgraphView`` of this
+        graph; ``relation_filter`` (relation names or an edge predicate)
+        limits the edges followed and shown.  Use ``materialise`` to get
+        an independent copy.
+        """
+        sg = ReasoningGraph()
+        sg.graph = neighbourhood(self.graph, node_id, k, direction, relation_filter)  # type: ignore[assignment]
+        return sg
+
+    def materialise(self) -> "ReasoningGraph":
+        """Return a copy of this graph that no longer shares state with it."""
+        rg = ReasoningGraph()
+        g = self.graph
+        rg.graph = g.materialise() if isinstance(g, SubgraphView) else g.copy()
+        return rg
+
+    # ------------------------------------------------------------------
+    # Partitions
+    def weakly_connected_components(self) -> List[set]:
+        return list(weakly_connected_components(self.graph))
+
+    def strongly_connected_components(self) -> List[set]:
+        return list(strongly_connected_components(self.graph))
+
+    def communities(self, seed: Optional[int] = 0) -> List[set]:
+        """Return label‑propagation communities (edges taken as undirected)."""
+        return label_propagation_communities(self.graph, seed=seed)
+
+    def dag(self) -> DagIndex:
+        """Return the topological order and chain index, cached per graph version."""
+        return dag_index(self.graph)
+
+    def partition(self, method: str = "components", max_parts: Optional[int] = None,
+                  seed: Optional[int] = 0) -> List["ReasoningGraph"]:
+        """Split the graph into independent subgraph copies.
+
+        ``method`` is ``"components"`` (weakly connected components, so no
+        edge crosses two parts), ``"strong"`` (strongly connected
+        components) or ``"communities"``.  Edges between parts are left
+        out of every part.  With ``max_parts`` the groups are packed,
+        largest first, into at most that many parts of similar size, which
+        keeps the number of tasks sent to a process pool bounded.
+        """
+        if method == "components":
+            groups = self.weakly_connected_components()
+        elif method == "strong":
+            groups = self.strongly_connected_components()
+        elif method == "communities":
+            groups = self.communities(seed=seed)
+        else:
+            raise ValueError(f"unknown partition method {method!r}")
+        if max_parts is not None and len(groups) > max_parts:
+            bins: List[set] = [set() for _ in range(max(1, max_parts))]
+            for group in sorted(groups, key=len, reverse=True):
+                min(bins, key=len).update(group)
+            groups = [b for b in bins if b]
+        order = {n: i for i, n in enumerate(self.graph.nodes)}
+        return [self.subgraph(sorted(group, key=order.__getitem__)) for group in groups]
+
+    def merge(self, parts: Iterable["ReasoningGraph"]) -> None:
+        """Write back node attributes and edges from evolved partitions.
+
+        Only attributes that differ are updated and edges are added or
+        replaced, so edges between parts and unchanged nodes are left
+        untouched.
+        """
+        g = self.graph
+        for part in parts:
+            for node, attrs in part.graph.nodes(data=True):  # type: ignore
+                if not g.has_node(node) or self.node_attrs(node) != attrs:
+                    g.add_node(node, **attrs)
+                    if self.search_index is not None:
+                        self.search_index.add(node, self.node_attrs(node))
+            for u, v, attrs in part.graph.edges(data=True):  # type: ignore
+                if g.get_edge_data(u, v) != attrs:
+                    g.add_edge(u, v, **attrs)
+
+    # ------------------------------------------------------------------
+    # Versions
+    def snapshot(self) -> "ReasoningGraph":
+        """Return an immutable copy of the current version.
+
+        On the stub ``DiGraph`` the snapshot shares its storage with this
+        graph (see ``DiGraph.cow_copy``) and costs constant time; other
+        backends are copied.  Audits, exports and queries can run on the
+        snapshot in another thread while writers publish new versions.
+        """
+        with self._swap_lock:
+            g = self.graph
+            if hasattr(g, "cow_copy"):
+                frozen = g.cow_copy(frozen=True)
+            elif hasattr(nx, "freeze"):
+                frozen = nx.freeze(g.copy())
+            else:
+                frozen = g.copy()
+            version = self.version
+        snap = ReasoningGraph()
+        snap.graph = frozen
+        snap.version = version
+        return snap
+
+    def publish(self, graph: Any) -> None:
+        """Make ``graph`` the current version in a single step.
+
+        Storage engines that provide ``restore_from`` (such as
+        ``SQLiteDiGraph``) copy the new contents into their own store
+        instead of being swapped out.  Publishing waits for a running
+        ``transaction`` to finish, so it never lands in the middle of one.
+        """
+        with self._write_lock, self._swap_lock:
+            if graph is not self.graph and hasattr(self.graph, "restore_from"):
+                self.graph.restore_from(graph)
+            else:
+                self.graph = graph
+            self.version += 1
+
+    @contextmanager
+    def transaction(self) -> Iterator["ReasoningGraph"]:
+        """Apply changes to a private copy and publish it on success.
+
+        Yields a ``ReasoningGraph`` over a copy-on-write copy of the
+        current version; readers keep seeing the old version until the
+        block exits normally, and nothing is published if it raises.
+        Transactions are serialised.  Backends without ``cow_copy`` are
+        modified in place.
+        """
+        with self._write_lock:
+            if not hasattr(self.graph, "cow_copy"):
+                yield self
+                with self._swap_lock:
+                    self.version += 1
+                return
+            draft = ReasoningGraph()
+            with self._swap_lock:
+                draft.graph = self.graph.cow_copy()
+            # The draft keeps the shared search index up to date; it is
+            # rebuilt from the published graph if the draft is discarded.
+            draft.search_index = self.search_index
+            try:
+                yield draft
+            except BaseException:
+                if self.search_index is not None:
+                    self.enable_search_index(self.search_index.fields)
+                raise
+            self.publish(draft.graph)
+
     # ------------------------------------------------------------------
     # Centrality
     def degree_centrality(self) -> Dict[str, float]:
@@ -3,46 +3,121 @@
 This module provides helpers for loading reasoning data into a
 ReasoningGraph.  Seeds can be supplied as JSON (see data/seeds.json) or
 CSV.  The ingestion functions return a ReasoningGraph instance.
+
+Several seed files can be ingested at once with ``ingest_many``.  Each
+file is parsed into an ``IngestBatch`` (a compact list of new nodes and
+edges), optionally in worker processes, and the batches are merged in
+the order the paths were given so the result matches ingesting the
+files one after another.
 """
 
 from __future__ import annotations
 
 import json
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from .graph import ReasoningGraph, NodeData
+from .graph import ReasoningGraph, NodeData, read_csv_records, csv_endpoints, csv_node, csv_edge
 
 
-def ingest_json(path: str) -> ReasoningGraph:
-    """Ingest seed data from a JSON file.
+@dataclass
+class IngestBatch:
+    """Nodes and edges parsed from one seed file.
 
-    The JSON file should contain a list of objects with keys:
-    source_id, source_label, target_id, target_label, relation,
-    source_score, target_score.
+    ``nodes`` holds each node the first time it appears in the file;
+    ``edges`` holds ``(source, target, relation, weight)`` tuples in row
+    order.
     """
-    rg = ReasoningGraph()
+    path: str
+    nodes: List[Tuple[str, NodeData]] = field(default_factory=list)
+    edges: List[Tuple[str, str, str, float]] = field(default_factory=list)
+
+
+def _json_node(row: Dict[str, Any], side: str, node_id: str) -> NodeData:
+    score = row.get(f"{side}_score")
+    return NodeData(
+        label=row.get(f"{side}_label", node_id),
+        score=float(score) if score is not None else None,
+        metadata={},
+    )
+
+
+def parse_json_batch(path: str) -> IngestBatch:
+    """Parse a JSON seed file into an ``IngestBatch``."""
+    batch = IngestBatch(path=str(path))
+    seen = set()
     with open(path, "r", encoding="utf-8") as f:
         data = json.load(f)
     for row in data:
         src = str(row.get("source_id"))
         dst = str(row.get("target_id"))
-        if not rg.graph.has_node(src):
-            rg.add_node(src, NodeData(
-                label=row.get("source_label", src),
-                score=float(row.get("source_score")) if row.get("source_score") is not None else None,
-                metadata={},
-            ))
-        if not rg.graph.has_node(dst):
-            rg.add_node(dst, NodeData(
-                label=row.get("target_label", dst),
-                score=float(row.get("target_score")) if row.get("target_score") is not None else None,
-                metadata={},
-            ))
-        rg.add_edge(src, dst, relation=row.get("relation", "influences"), weight=float(row.get("weight", 1.0)))
+        if src not in seen:
+            seen.add(src)
+            batch.nodes.append((src, _json_node(row, "source", src)))
+        if dst not in seen:
+            seen.add(dst)
+            batch.nodes.append((dst, _json_node(row, "target", dst)))
+        batch.edges.append((src, dst, row.get("relation", "influences"), float(row.get("weight", 1.0))))
+    return batch
+
+
+def parse_csv_batch(path: str) -> IngestBatch:
+    """Parse a CSV seed file into an ``IngestBatch``."""
+    batch = IngestBatch(path=str(path))
+    seen = set()
+    for row in read_csv_records(Path(path)):
+        src, dst = csv_endpoints(row)
+        if src not in seen:
+            seen.add(src)
+            batch.nodes.append((src, csv_node(row, "source", src)))
+        if dst not in seen:
+            seen.add(dst)
+            batch.nodes.append((dst, csv_node(row, "target", dst)))
+        relation, weight = csv_edge(row)
+        batch.edges.append((src, dst, relation, weight))
+    return batch
+
+
+def parse_batch(path: str) -> IngestBatch:
+    """Parse a JSON or CSV seed file into an ``IngestBatch``."""
+    ext = Path(path).suffix.lower()
+    if ext == ".json":
+        return parse_json_batch(path)
+    elif ext == ".csv":
+        return parse_csv_batch(path)
+    else:
+        raise ValueError(f"Unsupported input format: {ext}")
+
+
+def merge_batches(batches: Iterable[IngestBatch], rg: Optional[ReasoningGraph] = None) -> ReasoningGraph:
+    """Merge batches into a graph in iteration order.
+
+    The first batch to define a node wins, as in ``from_csv`` and
+    ``ingest_json``; a repeated edge keeps the attributes of the last
+    batch that mentions it.
+    """
+    if rg is None:
+        rg = ReasoningGraph()
+    for batch in batches:
+        for node_id, data in batch.nodes:
+            if not rg.graph.has_node(node_id):
+                rg.add_node(node_id, data)
+        for src, dst, relation, weight in batch.edges:
+            rg.add_edge(src, dst, relation=relation, weight=weight)
     return rg
 
 
+def ingest_json(path: str) -> ReasoningGraph:
+    """Ingest seed data from a JSON file.
+
+    The JSON file should contain a list of objects with keys:
+    source_id, source_label, target_id, target_label, relation,
+    source_score, target_score.
+    """
+    return merge_batches([parse_json_batch(path)])
+
+
 def ingest(path: str) -> ReasoningGraph:
     """Ingest data from either a JSON or CSV file."""
     ext = Path(path).suffix.lower()
@@ -53,4 +128,20 @@ def ingest(path: str) -> ReasoningGraph:
         rg.from_csv(Path(path))
         return rg
     else:
-        raise ValueError(f"Unsupported input format: {ext}")
\ No newline at end of file
+        raise ValueError(f"Unsupported input format: {ext}")
+
+
+def ingest_many(paths: Iterable[str], workers: int = 1) -> ReasoningGraph:
+    """Ingest several JSON or CSV seed files into one graph.
+
+    With ``workers > 1`` the files are parsed in a process pool; the
+    merge always happens in the order of ``paths`` so the result does not
+    depend on which worker finishes first.
+    """
+    paths = [str(p) for p in paths]
+    if workers <= 1 or len(paths) <= 1:
+        return merge_batches(parse_batch(p) for p in paths)
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        chunksize = max(1, len(paths) // (workers * 4))
+        return merge_batches(pool.map(parse_batch, paths, chunksize=chunksize))
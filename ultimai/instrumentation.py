@@ -0,0 +1,199 @@
+"""Stage spans, counters and metric exporters for the reasoning cycle.
+
+Components that support instrumentation take an ``instrumentation``
+argument and default to ``NULL``, whose ``span`` returns one shared
+no-op context manager and whose ``count``/``gauge`` do nothing, so an
+uninstrumented run pays a method call per stage and nothing per
+candidate graph.
+
+A ``Recorder`` keeps what is reported to it:
+
+* spans – one per stage run, with wall and CPU time, the enclosing span
+  and the node and edge counts of the graph when the stage finished;
+* counters – monotonically increasing totals, e.g. the candidates
+  ``MemeticEngine`` evaluated and accepted and its critic calls;
+* gauges – last reported values, e.g. critic calls per second.
+
+``flush`` hands new spans and the current totals to its exporters.
+``JsonlExporter`` appends one JSON line per span plus one with the
+counters and gauges; ``PrometheusExporter`` rewrites a file in the
+Prometheus text format (suitable for the node exporter's textfile
+collector) with per-stage totals and the latest span of each stage.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, ContextManager, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+@dataclass
+class Span:
+    """Timing of one run of a stage."""
+    name: str
+    start: float
+    wall: float = 0.0
+    cpu: float = 0.0
+    parent: Optional[str] = None
+    nodes: Optional[int] = None
+    edges: Optional[int] = None
+
+
+def graph_size(graph: Any) -> Optional[Tuple[int, int]]:
+    """Return ``(nodes, edges)`` of a ``ReasoningGraph`` or graph backend, if it can tell."""
+    g = getattr(graph, "graph", graph)
+    try:
+        return g.number_of_nodes(), g.number_of_edges()
+    except AttributeError:
+        return None
+
+
+class NullInstrumentation:
+    """Instrumentation that records nothing."""
+
+    enabled = False
+    _span = nullcontext()
+
+    def span(self, name: str, graph: Any = None) -> ContextManager[Any]:
+        return self._span
+
+    def count(self, name: str, value: float = 1) -> None:
+        pass
+
+    def gauge(self, name: str, value: float) -> None:
+        pass
+
+    def flush(self) -> None:
+        pass
+
+
+NULL = NullInstrumentation()
+
+
+class Recorder(NullInstrumentation):
+    """Instrumentation that keeps spans, counters and gauges in memory."""
+
+    enabled = True
+
+    def __init__(self, exporters: Iterable[Any] = ()) -> None:
+        self.exporters = list(exporters)
+        self.spans: List[Span] = []
+        self.counters: Dict[str, float] = {}
+        self.gauges: Dict[str, float] = {}
+        self._stack: List[str] = []
+        self._flushed = 0
+
+    @contextmanager
+    def span(self, name: str, graph: Any = None) -> Iterator[Span]:
+        """Time the body as a span named ``name``; ``graph`` is measured on exit."""
+        span = Span(name=name, start=time.time(), parent=self._stack[-1] if self._stack else None)
+        self._stack.append(name)
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield span
+        finally:
+            span.wall = time.perf_counter() - wall0
+            span.cpu = time.process_time() - cpu0
+            self._stack.pop()
+            size = graph_size(graph) if graph is not None else None
+            if size is not None:
+                span.nodes, span.edges = size
+            self.spans.append(span)
+
+    def count(self, name: str, value: float = 1) -> None:
+        self.counters[name] = self.counters.get(name, 0) + value
+
+    def gauge(self, name: str, value: float) -> None:
+        self.gauges[name] = value
+
+    def stage_totals(self) -> Dict[str, Dict[str, float]]:
+        """Return ``{stage: {"runs", "wall", "cpu"}}`` summed over all spans."""
+        totals: Dict[str, Dict[str, float]] = {}
+        for span in self.spans:
+            t = totals.setdefault(span.name, {"runs": 0, "wall": 0.0, "cpu": 0.0})
+            t["runs"] += 1
+            t["wall"] += span.wall
+            t["cpu"] += span.cpu
+        return totals
+
+    def flush(self) -> None:
+        """Pass the spans recorded since the last flush to every exporter."""
+        new = self.spans[self._flushed:]
+        for exporter in self.exporters:
+            exporter.export(self, new)
+        self._flushed = len(self.spans)
+
+
+class JsonlExporter:
+    """Append spans and metric totals to a JSON Lines file."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+
+    def export(self, recorder: Recorder, spans: Sequence[Span]) -> None:
+        with open(self.path, "a", encoding="utf-8") as f:
+            for span in spans:
+                f.write(json.dumps(dict(type="span", **asdict(span))) + "\n")
+            f.write(json.dumps({"type": "metrics", "time": time.time(),
+                                "counters": recorder.counters, "gauges": recorder.gauges}) + "\n")
+
+
+def _metric_name(name: str) -> str:
+    return "".join(c if c.isalnum() or c == "_" else "_" for c in name)
+
+
+class PrometheusExporter:
+    """Write the recorder's totals in the Prometheus text exposition format."""
+
+    def __init__(self, path: Path, prefix: str = "ultimai") -> None:
+        self.path = Path(path)
+        self.prefix = prefix
+
+    def render(self, recorder: Recorder) -> str:
+        p = self.prefix
+        lines: List[str] = []
+
+        def family(name: str, kind: str, help_text: str, samples: Iterable[tuple]) -> None:
+            samples = list(samples)
+            if not samples:
+                return
+            lines.append(f"# HELP {p}_{name} {help_text}")
+            lines.append(f"# TYPE {p}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join(f'{k}="{v}"' for k, v in labels.items())
+                lines.append(f"{p}_{name}{{{label_text}}} {value}" if label_text
+                             else f"{p}_{name} {value}")
+
+        totals = recorder.stage_totals()
+        family("stage_runs_total", "counter", "Number of completed runs of each stage.",
+               (({"stage": s}, int(t["runs"])) for s, t in totals.items()))
+        family("stage_wall_seconds_total", "counter", "Wall time spent in each stage.",
+               (({"stage": s}, f"{t['wall']:.6f}") for s, t in totals.items()))
+        family("stage_cpu_seconds_total", "counter", "Process CPU time spent in each stage.",
+               (({"stage": s}, f"{t['cpu']:.6f}") for s, t in totals.items()))
+        last: Dict[str, Span] = {}
+        for span in recorder.spans:
+            last[span.name] = span
+        family("stage_last_wall_seconds", "gauge", "Wall time of the latest run of each stage.",
+               (({"stage": s}, f"{span.wall:.6f}") for s, span in last.items()))
+        family("stage_nodes", "gauge", "Graph nodes when the latest run of each stage ended.",
+               (({"stage": s}, span.nodes) for s, span in last.items() if span.nodes is not None))
+        family("stage_edges", "gauge", "Graph edges when the latest run of each stage ended.",
+               (({"stage": s}, span.edges) for s, span in last.items() if span.edges is not None))
+        for name, value in sorted(recorder.counters.items()):
+            family(f"{_metric_name(name)}_total", "counter", f"Total {name.replace('_', ' ')}.",
+                   [({}, value)])
+        for name, value in sorted(recorder.gauges.items()):
+            family(_metric_name(name), "gauge", f"Latest {name.replace('_', ' ')}.", [({}, value)])
+        return "\n".join(lines) + "\n"
+
+    def export(self, recorder: Recorder, spans: Sequence[Span]) -> None:
+        # Write and rename so a scraper never reads a half-written file.
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        tmp.write_text(self.render(recorder), encoding="utf-8")
+        os.replace(tmp, self.path)
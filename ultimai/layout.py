@@ -0,0 +1,180 @@
+"""Force-directed graph layout that scales to large graphs.
+
+``force_layout`` places nodes with a Fruchterman–Reingold style
+simulation: edges pull their endpoints together and all nodes push each
+other apart.  Exact repulsion is quadratic, so it is approximated on a
+grid:
+
+* with NumPy, node counts are binned on a grid and the repulsive field
+  of the whole graph is obtained by one FFT convolution per iteration
+  (a particle–mesh method), then read back at every node with bilinear
+  interpolation.  Attraction along edges is vectorised with
+  ``bincount``.  100k nodes take seconds.
+* without NumPy, the grid variant of the original algorithm is used:
+  only nodes in neighbouring cells repel each other.  This is fine for a
+  few thousand nodes.
+
+Layouts are deterministic for a given ``seed``.  Edges are treated as
+undirected and positions are returned in an arbitrary unit square-ish
+coordinate system; renderers rescale them.
+"""
+
+from __future__ import annotations
+
+import math
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from .utils import lazy_import
+
+# NumPy is loaded on first use, or None when it is not installed.
+np = lazy_import("numpy")
+
+Position = Tuple[float, float]
+
+
+def _edge_index(g: Any, nodes: List[Any]) -> Tuple[List[int], List[int]]:
+    index = {n: i for i, n in enumerate(nodes)}
+    src: List[int] = []
+    dst: List[int] = []
+    for u, nbrs in g.adj.items():
+        iu = index.get(u)
+        if iu is None:
+            continue
+        for v in nbrs:
+            iv = index.get(v)
+            if iv is not None and iv != iu:
+                src.append(iu)
+                dst.append(iv)
+    return src, dst
+
+
+def force_layout(g: Any, iterations: int = 50, seed: int = 42,
+                 use_numpy: Optional[bool] = None) -> Dict[Any, Position]:
+    """Return ``{node: (x, y)}`` for every node of ``g``.
+
+    ``use_numpy`` forces the NumPy or the pure Python implementation;
+    by default NumPy is used when it is installed.
+    """
+    nodes = list(g.nodes)
+    if not nodes:
+        return {}
+    if len(nodes) == 1:
+        return {nodes[0]: (0.0, 0.0)}
+    src, dst = _edge_index(g, nodes)
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        if np is None:
+            raise ImportError("numpy is required for use_numpy=True")
+        xs, ys = _layout_numpy(len(nodes), src, dst, iterations, seed)
+    else:
+        xs, ys = _layout_python(len(nodes), src, dst, iterations, seed)
+    return {n: (float(x), float(y)) for n, x, y in zip(nodes, xs, ys)}
+
+
+def _layout_numpy(n: int, src: List[int], dst: List[int], iterations: int,
+                  seed: int) -> Tuple[Any, Any]:
+    rng = np.random.default_rng(seed)
+    side = math.sqrt(n)  # unit area per node, ideal edge length k = 1
+    pos = rng.uniform(0.0, side, size=(n, 2))
+    u = np.asarray(src, dtype=np.int64)
+    v = np.asarray(dst, dtype=np.int64)
+    grid = int(min(512, max(8, 2 ** math.ceil(math.log2(math.sqrt(n))))))
+    # Offsets of a (2*grid)x(2*grid) periodic grid, for the repulsion kernel.
+    offsets = np.fft.fftfreq(2 * grid, d=1.0 / (2 * grid))
+    ox, oy = np.meshgrid(offsets, offsets, indexing="ij")
+    r2 = ox * ox + oy * oy
+    r2[0, 0] = np.inf
+    temperature = side / 10.0
+    cooling = temperature / max(1, iterations)
+    for _ in range(iterations):
+        lo = pos.min(axis=0)
+        span = max(float((pos.max(axis=0) - lo).max()), 1e-9)
+        cell = span / (grid - 1)
+        # Bilinear ("cloud in cell") deposit of unit masses.
+        gx = (pos - lo) / cell
+        i0 = np.minimum(gx.astype(np.int64), grid - 2)
+        frac = gx - i0
+        wts = ((1 - frac[:, 0]) * (1 - frac[:, 1]), frac[:, 0] * (1 - frac[:, 1]),
+               (1 - frac[:, 0]) * frac[:, 1], frac[:, 0] * frac[:, 1])
+        corners = ((0, 0), (1, 0), (0, 1), (1, 1))
+        mass = np.zeros((2 * grid, 2 * grid))
+        for (dx, dy), w in zip(corners, wts):
+            np.add.at(mass, (i0[:, 0] + dx, i0[:, 1] + dy), w)
+        # FR repulsion k^2 / d along the offset, in grid units: r / |r|^2.
+        fm = np.fft.rfft2(mass)
+        field_x = np.fft.irfft2(fm * np.fft.rfft2(ox / r2 / cell), s=mass.shape)
+        field_y = np.fft.irfft2(fm * np.fft.rfft2(oy / r2 / cell), s=mass.shape)
+        disp = np.zeros_like(pos)
+        for (dx, dy), w in zip(corners, wts):
+            ix, iy = i0[:, 0] + dx, i0[:, 1] + dy
+            disp[:, 0] += w * field_x[ix, iy]
+            disp[:, 1] += w * field_y[ix, iy]
+        if len(u):
+            delta = pos[v] - pos[u]
+            dist = np.sqrt((delta * delta).sum(axis=1))
+            force = delta * dist[:, None]  # d^2 / k along the edge
+            for axis in (0, 1):
+                disp[:, axis] += np.bincount(u, weights=force[:, axis], minlength=n)
+                disp[:, axis] -= np.bincount(v, weights=force[:, axis], minlength=n)
+        # Weak gravity keeps disconnected components in view.
+        disp -= 0.01 * (pos - pos.mean(axis=0))
+        length = np.sqrt((disp * disp).sum(axis=1))
+        scale = np.minimum(length, temperature) / np.maximum(length, 1e-9)
+        pos += disp * scale[:, None]
+        temperature = max(temperature - cooling, 1e-3)
+    return pos[:, 0], pos[:, 1]
+
+
+def _layout_python(n: int, src: List[int], dst: List[int], iterations: int,
+                   seed: int) -> Tuple[List[float], List[float]]:
+    rng = random.Random(seed)
+    side = math.sqrt(n)
+    xs = [rng.uniform(0.0, side) for _ in range(n)]
+    ys = [rng.uniform(0.0, side) for _ in range(n)]
+    cell = 2.0  # repulsion only acts within 2k, k = 1
+    temperature = side / 10.0
+    cooling = temperature / max(1, iterations)
+    for _ in range(iterations):
+        buckets: Dict[Tuple[int, int], List[int]] = {}
+        for i in range(n):
+            buckets.setdefault((int(xs[i] // cell), int(ys[i] // cell)), []).append(i)
+        dx = [0.0] * n
+        dy = [0.0] * n
+        for (cx, cy), members in buckets.items():
+            near = [j for ox in (-1, 0, 1) for oy in (-1, 0, 1)
+                    for j in buckets.get((cx + ox, cy + oy), ())]
+            for i in members:
+                xi, yi = xs[i], ys[i]
+                fx = fy = 0.0
+                for j in near:
+                    if j == i:
+                        continue
+                    ddx, ddy = xi - xs[j], yi - ys[j]
+                    d2 = ddx * ddx + ddy * ddy
+                    if d2 < cell * cell:
+                        if d2 == 0.0:
+                            ddx, ddy, d2 = rng.uniform(-0.01, 0.01), rng.uniform(-0.01, 0.01), 1e-4
+                        fx += ddx / d2
+                        fy += ddy / d2
+                dx[i] += fx
+                dy[i] += fy
+        for a, b in zip(src, dst):
+            ddx, ddy = xs[b] - xs[a], ys[b] - ys[a]
+            d = math.sqrt(ddx * ddx + ddy * ddy)
+            dx[a] += ddx * d
+            dy[a] += ddy * d
+            dx[b] -= ddx * d
+            dy[b] -= ddy * d
+        mx, my = sum(xs) / n, sum(ys) / n
+        for i in range(n):
+            fx = dx[i] - 0.001 * (xs[i] - mx)
+            fy = dy[i] - 0.001 * (ys[i] - my)
+            length = math.sqrt(fx * fx + fy * fy)
+            if length > 0:
+                step = min(length, temperature) / length
+                xs[i] += fx * step
+                ys[i] += fy * step
+        temperature = max(temperature - cooling, 1e-3)
+    return xs, ys
@@ -0,0 +1,145 @@
+"""Level-of-detail summaries of large graphs for rendering and text output.
+
+``summarise`` collapses the communities (or connected components) of a
+graph into super-nodes and keeps only a bounded number of original
+nodes: a focus neighbourhood and the largest clusters, as far as
+``max_nodes`` allows.  A super-node carries the cluster size, its mean
+score and the number of edges inside it; parallel edges between
+clusters are merged into one ``aggregate`` edge whose ``weight`` is the
+number of edges it stands for.  Clusters beyond ``max_clusters`` are
+merged into a single ``other`` super-node, so the summary has at most
+``max_nodes + max_clusters`` nodes however big the input is.
+
+The summary is an ordinary ``DiGraph`` and can be passed to any
+renderer; ``write_text`` writes the bounded text form used by
+``scripts/generate_graph.py`` when no image can be drawn.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from .utils import lazy_import
+
+# NetworkX is loaded on first use; the local stub stands in without it.
+nx = lazy_import("networkx")
+if nx is None:  # pragma: no cover
+    from . import networkx_stub as nx  # type: ignore
+
+from .networkx_stub import label_propagation_communities, weakly_connected_components
+from .views import neighbourhood
+
+CLUSTER_TYPE = "cluster"
+OTHER = "cluster:other"
+
+
+def _clusters(g: Any, method: str, seed: Optional[int]) -> List[Set[Any]]:
+    if method == "communities":
+        groups = label_propagation_communities(g, seed=seed)
+    elif method == "components":
+        groups = list(weakly_connected_components(g))
+    else:
+        raise ValueError(f"unknown cluster method {method!r}")
+    return sorted(groups, key=len, reverse=True)
+
+
+def summarise(g: Any, max_nodes: int = 500, method: str = "communities", expand: int = 0,
+              focus: Any = None, focus_hops: int = 1, max_clusters: int = 200,
+              seed: Optional[int] = 0) -> Any:
+    """Return a level-of-detail summary of ``g``, or ``g`` itself if it is small.
+
+    Graphs with at most ``max_nodes`` nodes are returned unchanged.
+    Otherwise the neighbourhood of ``focus`` (``focus_hops`` hops, both
+    directions) is kept first, then the ``expand`` largest clusters that
+    still fit in ``max_nodes``; every other cluster becomes a super-node.
+    Raises ``ValueError`` if ``focus`` is not a node of ``g``.
+    """
+    if focus is not None and not g.has_node(focus):
+        raise ValueError(f"focus node {focus!r} is not in the graph")
+    if g.number_of_nodes() <= max_nodes:
+        return g
+    attrs = getattr(g, "nodes_attr", None) or g.nodes
+    keep: Dict[Any, None] = {}
+    if focus is not None:
+        for node in neighbourhood(g, focus, focus_hops, "both").nodes:
+            if len(keep) >= max_nodes:
+                break
+            keep[node] = None
+    clusters = _clusters(g, method, seed)
+    for cluster in clusters[:expand]:
+        fresh = [n for n in cluster if n not in keep]
+        if len(keep) + len(fresh) > max_nodes:
+            continue
+        keep.update(dict.fromkeys(fresh))
+    # Name the collapsed clusters, largest first, lumping the tail together.
+    cluster_of: Dict[Any, str] = {}
+    stats: Dict[str, Dict[str, Any]] = {}
+    named = 0
+    for cluster in clusters:
+        members = [n for n in cluster if n not in keep]
+        if not members:
+            continue
+        if named < max_clusters - 1 or len(clusters) <= max_clusters:
+            cid = f"cluster:{named}"
+            named += 1
+        else:
+            cid = OTHER
+        st = stats.setdefault(cid, {"size": 0, "score_sum": 0.0, "scored": 0,
+                                    "internal_edges": 0, "hub": None, "hub_degree": -1})
+        for n in members:
+            cluster_of[n] = cid
+            st["size"] += 1
+            score = attrs[n].get("score")
+            if isinstance(score, (int, float)):
+                st["score_sum"] += score
+                st["scored"] += 1
+            degree = len(g.adj[n]) + len(g.pred[n])
+            if degree > st["hub_degree"]:
+                st["hub"], st["hub_degree"] = n, degree
+
+    summary = nx.DiGraph()
+    for node in keep:
+        summary.add_node(node, **dict(attrs[node]))
+    for cid, st in stats.items():
+        hub_label = attrs[st["hub"]].get("label", st["hub"])
+        summary.add_node(cid, label=f"{st['size']} nodes around {hub_label}", type=CLUSTER_TYPE,
+                         score=st["score_sum"] / st["scored"] if st["scored"] else None,
+                         size=st["size"], internal_edges=0)
+    aggregate: Dict[Tuple[Any, Any], int] = {}
+    for u, nbrs in g.adj.items():
+        ru = u if u in keep else cluster_of[u]
+        for v, edge in nbrs.items():
+            rv = v if v in keep else cluster_of[v]
+            if u in keep and v in keep:
+                summary.add_edge(u, v, **dict(edge))
+            elif ru == rv:
+                stats[ru]["internal_edges"] += 1
+            else:
+                aggregate[(ru, rv)] = aggregate.get((ru, rv), 0) + 1
+    for (ru, rv), count in aggregate.items():
+        summary.add_edge(ru, rv, relation="aggregate", weight=count)
+    for cid, st in stats.items():
+        summary.add_node(cid, internal_edges=st["internal_edges"])
+    summary.graph["lod"] = {
+        "num_nodes": g.number_of_nodes(),
+        "num_edges": g.number_of_edges(),
+        "expanded_nodes": len(keep),
+        "clusters": len(stats),
+    }
+    return summary
+
+
+def write_text(g: Any, path: str, max_nodes: int = 500, **kwargs: Any) -> None:
+    """Write the text form of ``g``, summarised as by ``summarise`` when it is large."""
+    summary = summarise(g, max_nodes=max_nodes, **kwargs)
+    with open(path, "w", encoding="utf-8") as f:
+        info = getattr(summary, "graph", {}).get("lod")
+        if info is not None:
+            f.write(f"Summary: {info['num_nodes']} nodes and {info['num_edges']} edges shown as "
+                    f"{info['expanded_nodes']} nodes and {info['clusters']} clusters\n")
+        f.write("Nodes:\n")
+        for n, attrs in summary.nodes(data=True):  # type: ignore
+            f.write(f"  {n}: {attrs}\n")
+        f.write("Edges:\n")
+        for u, v, attrs in summary.edges(data=True):  # type: ignore
+            f.write(f"  {u} -> {v}: {attrs}\n")
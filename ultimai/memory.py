@@ -0,0 +1,219 @@
+"""Memory accounting for reasoning graphs and pipeline stages.
+
+``estimate_graph_memory`` walks an in-memory graph and attributes the
+``sys.getsizeof`` of every container and value to one category:
+
+================= ===================================================
+node_ids          the node identifiers
+node_dicts        the node map, attribute dicts and attribute values
+metadata          the values of ``metadata`` attributes, deeply
+adjacency         the successor map and per-node successor dicts
+predecessors      the predecessor map and per-node predecessor dicts
+edge_attributes   edge attribute dicts and their values
+================= ===================================================
+
+Each object is counted once, in the first category that reaches it, so
+interned strings and attribute dicts shared between the successor and
+predecessor maps are not counted twice.  Allocator overhead is not
+included, so the total is a lower bound of the process footprint.
+
+``MemoryProfiler`` is an instrumentation (see
+``ultimai.instrumentation``) that records, for every span, the memory
+it left allocated, its peak and the source lines that allocated most,
+using ``tracemalloc`` snapshots.  Passed to ``MetaSynthesizer`` it
+shows whether the graph, the copies made by ``MemeticEngine`` or the
+serialisation in ``save`` dominate a cycle.  ``markdown_section``
+renders both for ``scripts/dump_report.py --memory``.
+
+``tracemalloc.reset_peak`` only exists from Python 3.9.  On 3.8
+``reset_peak`` and ``peak_since`` fall back to the process-wide peak: a
+span sees its own peak when it exceeds every earlier one, and otherwise
+reports the memory allocated at its end, an underestimate.
+"""
+
+from __future__ import annotations
+
+import sys
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+
+from .instrumentation import NullInstrumentation
+
+def reset_peak() -> int:
+    """Start measuring a new traced-memory peak; pass the result to ``peak_since``."""
+    previous = tracemalloc.get_traced_memory()[1]
+    if hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    return previous
+
+
+def peak_since(previous: int) -> int:
+    """Return the traced-memory peak since the ``reset_peak`` that returned ``previous``."""
+    current, peak = tracemalloc.get_traced_memory()
+    if hasattr(tracemalloc, "reset_peak") or peak > previous:
+        return peak
+    return current
+
+
+CATEGORIES = ("node_ids", "node_dicts", "metadata", "adjacency", "predecessors",
+              "edge_attributes")
+
+
+def _sizeof(obj: Any, seen: Set[int]) -> int:
+    """Deep size of ``obj`` not yet in ``seen``."""
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        total += sys.getsizeof(o)
+        if isinstance(o, dict):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+    return total
+
+
+def _shallow(obj: Any, seen: Set[int]) -> int:
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    return sys.getsizeof(obj)
+
+
+def _containers(g: Any) -> Tuple[Dict[Any, Any], Dict[Any, Any], Dict[Any, Any]]:
+    # The stub keeps ``_nodes``; NetworkX keeps ``_node`` and ``_succ``.
+    nodes = getattr(g, "_nodes", None)
+    if nodes is None:
+        nodes = getattr(g, "_node", None)
+    succ = getattr(g, "_succ", None)
+    if succ is None:
+        succ = getattr(g, "_adj", None)
+    pred = getattr(g, "_pred", None)
+    if not all(isinstance(c, dict) for c in (nodes, succ, pred)):
+        raise TypeError(f"cannot estimate the memory of {type(g).__name__}; "
+                        "it does not keep the graph in memory")
+    return nodes, succ, pred
+
+
+def estimate_graph_memory(rg: Any) -> Dict[str, int]:
+    """Return the estimated bytes per category of ``CATEGORIES`` plus ``total``."""
+    nodes, succ, pred = _containers(getattr(rg, "graph", rg))
+    seen: Set[int] = set()
+    sizes = dict.fromkeys(CATEGORIES, 0)
+    for node in nodes:
+        sizes["node_ids"] += _sizeof(node, seen)
+    sizes["node_dicts"] += _shallow(nodes, seen)
+    for attrs in nodes.values():
+        sizes["node_dicts"] += _shallow(attrs, seen)
+        for key, value in attrs.items():
+            sizes["node_dicts"] += _sizeof(key, seen)
+            category = "metadata" if key == "metadata" else "node_dicts"
+            sizes[category] += _sizeof(value, seen)
+    for name, adjacency in (("adjacency", succ), ("predecessors", pred)):
+        sizes[name] += _shallow(adjacency, seen)
+        for nbrs in adjacency.values():
+            sizes[name] += _shallow(nbrs, seen)
+            for attrs in nbrs.values():
+                sizes["edge_attributes"] += _sizeof(attrs, seen)
+    sizes["total"] = sum(sizes.values())
+    return sizes
+
+
+@dataclass
+class StageMemory:
+    """Memory use of one span."""
+    name: str
+    parent: Optional[str]
+    allocated: int = 0
+    peak: int = 0
+    top: List[Tuple[str, int]] = field(default_factory=list)
+
+
+class MemoryProfiler(NullInstrumentation):
+    """Instrumentation that records ``tracemalloc`` statistics for each span.
+
+    Tracing starts with the first span and continues until ``stop``;
+    ``top`` source lines are kept per span.
+    """
+
+    enabled = True
+
+    def __init__(self, top: int = 5) -> None:
+        self.top = top
+        self.stages: List[StageMemory] = []
+        # [record, highest peak seen so far, value returned by reset_peak]
+        self._active: List[List[Any]] = []
+        self._started = False
+
+    def _note_peak(self) -> None:
+        # ``reset_peak`` is global, so enclosing spans keep the peak they
+        # have seen before an inner span resets it.
+        for frame in self._active:
+            frame[1] = max(frame[1], peak_since(frame[2]))
+
+    @contextmanager
+    def span(self, name: str, graph: Any = None) -> Iterator[StageMemory]:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started = True
+        record = StageMemory(name=name, parent=self._active[-1][0].name if self._active else None)
+        before = tracemalloc.take_snapshot()
+        self._note_peak()
+        previous = reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        frame = [record, 0, previous]
+        self._active.append(frame)
+        try:
+            yield record
+        finally:
+            self._note_peak()
+            self._active.pop()
+            after = tracemalloc.take_snapshot()
+            record.allocated = tracemalloc.get_traced_memory()[0] - base
+            record.peak = frame[1] - base
+            filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+            diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), "lineno")
+            record.top = [(str(stat.traceback[0]), stat.size_diff)
+                          for stat in diff[:self.top] if stat.size_diff > 0]
+            self.stages.append(record)
+
+    def stop(self) -> None:
+        """Stop tracing if this profiler started it."""
+        if self._started and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self._started = False
+
+
+def _mib(size: int) -> str:
+    return f"{size / 2 ** 20:.2f} MiB"
+
+
+def markdown_section(rg: Any = None, stages: Optional[List[StageMemory]] = None) -> str:
+    """Render a graph estimate and stage records as a markdown report section."""
+    lines = ["## Memory", ""]
+    if rg is not None:
+        sizes = estimate_graph_memory(rg)
+        g = getattr(rg, "graph", rg)
+        nodes, edges = g.number_of_nodes(), g.number_of_edges()
+        lines += [f"Estimated graph size for {nodes} nodes and {edges} edges "
+                  f"(lower bound, excluding allocator overhead):", "",
+                  "| Category | Size | Bytes per node |", "|---|---:|---:|"]
+        for category in CATEGORIES + ("total",):
+            per_node = sizes[category] / nodes if nodes else 0.0
+            lines.append(f"| {category} | {_mib(sizes[category])} | {per_node:.0f} |")
+        lines.append("")
+    if stages:
+        lines += ["Memory per stage (`tracemalloc`; peak is above the stage's starting point):", "",
+                  "| Stage | Retained | Peak | Largest allocations |", "|---|---:|---:|---|"]
+        for stage in stages:
+            name = f"{stage.parent} / {stage.name}" if stage.parent else stage.name
+            top = "<br>".join(f"`{where}` {_mib(size)}" for where, size in stage.top[:3])
+            lines.append(f"| {name} | {_mib(stage.allocated)} | {_mib(stage.peak)} | {top} |")
+        lines.append("")
+    return "\n".join(lines)
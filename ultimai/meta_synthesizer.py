@@ -4,18 +4,31 @@ The MetaSynthesizer manages the pipeline: ingesting data into a
 reasoning graph, running memetic evolution, applying quarantine rules,
 conducting an audit via the critic and saving results.  Configurable
 parameters are provided through a simple configuration dictionary.
+
+With ``MetaConfig.partition`` set, memetic evolution and an audit run
+on each partition of the graph separately (see
+``ReasoningGraph.partition``), in a process pool when ``workers > 1``,
+and the evolved partitions are merged back in one transaction.  The
+critic then scores each partition on its own, so evolution optimises
+clusters independently of each other.
+
+Every stage of ``full_cycle`` runs in a span of the synthesizer's
+``instrumentation`` (see ``ultimai.instrumentation``), which is flushed
+to its exporters when the cycle ends.
 """
 
 from __future__ import annotations
 
+import random
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .graph import ReasoningGraph
 from .reasoning_modulator import MemeticEngine
 from .quarantine import Quarantine
 from .critic import Critic
+from .instrumentation import NULL
 
 
 @dataclass
@@ -23,47 +36,97 @@ class MetaConfig:
     memetic_iterations: int = 10
     quarantine_threshold: float = 0.35
     reintegrate_threshold: float = 0.6
+    # Append changed nodes and edges to ``<path>.patch`` instead of
+    # rewriting the whole graph file on every save.
+    incremental_save: bool = False
+    # ``"components"``, ``"strong"`` or ``"communities"`` to evolve each
+    # partition separately, with ``workers`` processes.
+    partition: Optional[str] = None
+    workers: int = 1
+
+
+def evolve_partition(args: Tuple[ReasoningGraph, int, int]) -> Tuple[ReasoningGraph, Dict[str, Any]]:
+    """Run memetic evolution and an audit on one partition (pool worker)."""
+    part, iterations, seed = args
+    random.seed(seed)
+    MemeticEngine(part).run(iterations)
+    return part, Critic().audit_graph(part)
 
 
 class MetaSynthesizer:
-    def __init__(self, config: Optional[MetaConfig] = None) -> None:
+    def __init__(self, config: Optional[MetaConfig] = None, instrumentation: Optional[Any] = None) -> None:
         self.config = config or MetaConfig()
+        self.instrumentation = instrumentation or NULL
         self.graph = ReasoningGraph()
         self.engine: Optional[MemeticEngine] = None
         self.quarantine = Quarantine(self.config.quarantine_threshold)
         self.critic = Critic()
+        self.partition_reports: List[Dict[str, Any]] = []
 
     def load_data(self, csv_path: Optional[str] = None, json_path: Optional[str] = None) -> None:
-        if csv_path:
-            self.graph.from_csv(Path(csv_path))
-        elif json_path:
-            self.graph.from_json(Path(json_path))
+        with self.instrumentation.span("load_data", self.graph):
+            if csv_path:
+                self.graph.from_csv(Path(csv_path))
+            elif json_path:
+                self.graph.from_json(Path(json_path))
 
     def build_engine(self) -> None:
-        self.engine = MemeticEngine(self.graph)
+        self.engine = MemeticEngine(self.graph, self.instrumentation)
 
     def run_memetic(self) -> None:
-        if self.engine is None:
-            self.build_engine()
-        assert self.engine is not None
-        self.engine.run(self.config.memetic_iterations)
+        with self.instrumentation.span("run_memetic", self.graph):
+            if self.config.partition:
+                self.run_partitioned()
+                return
+            if self.engine is None:
+                self.build_engine()
+            assert self.engine is not None
+            self.engine.run(self.config.memetic_iterations)
+
+    def run_partitioned(self) -> List[Dict[str, Any]]:
+        """Evolve and audit every partition, merge them and return the audits."""
+        workers = max(1, self.config.workers)
+        parts = self.graph.partition(self.config.partition or "components",
+                                     max_parts=workers * 4 if workers > 1 else None)
+        # Seeds come from the parent's generator so seeded runs repeat.
+        tasks = [(part, self.config.memetic_iterations, random.getrandbits(32)) for part in parts]
+        if workers == 1 or len(tasks) <= 1:
+            results = [evolve_partition(task) for task in tasks]
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+            with ProcessPoolExecutor(max_workers=min(workers, len(tasks))) as pool:
+                results = list(pool.map(evolve_partition, tasks))
+        with self.graph.transaction() as draft:
+            draft.merge(part for part, _ in results)
+        self.partition_reports = [report for _, report in results]
+        return self.partition_reports
 
     def run_quarantine(self) -> None:
-        self.quarantine.evaluate(self.graph)
-        self.quarantine.reintegrate(self.graph, self.config.reintegrate_threshold)
+        # Flag changes are published as one new version, so concurrent
+        # readers of ``self.graph.snapshot()`` never see them half applied.
+        with self.instrumentation.span("run_quarantine", self.graph):
+            with self.graph.transaction() as draft:
+                self.quarantine.evaluate(draft)
+                self.quarantine.reintegrate(draft, self.config.reintegrate_threshold)
 
     def audit(self) -> dict:
-        return self.critic.audit_graph(self.graph)
+        with self.instrumentation.span("audit", self.graph):
+            return self.critic.audit_graph(self.graph)
 
     def save_graph(self, path: str) -> None:
-        self.graph.save(Path(path))
+        with self.instrumentation.span("save_graph", self.graph):
+            self.graph.save(Path(path), incremental=self.config.incremental_save)
 
     def full_cycle(self, csv_path: Optional[str] = None, json_path: Optional[str] = None, save_path: Optional[str] = None) -> dict:
-        self.load_data(csv_path, json_path)
-        self.build_engine()
-        self.run_memetic()
-        self.run_quarantine()
-        report = self.audit()
-        if save_path:
-            self.save_graph(save_path)
+        try:
+            with self.instrumentation.span("full_cycle", self.graph):
+                self.load_data(csv_path, json_path)
+                self.build_engine()
+                self.run_memetic()
+                self.run_quarantine()
+                report = self.audit()
+                if save_path:
+                    self.save_graph(save_path)
+        finally:
+            self.instrumentation.flush()
         return report
\ No newline at end of file
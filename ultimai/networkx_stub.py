@@ -11,20 +11,31 @@ Implemented features:
   - ``DiGraph`` class with methods ``add_node``, ``add_edge``, ``nodes``,
     ``edges``, ``has_node``, ``has_edge``, ``get_edge_data``, ``degree``,
     ``out_degree``, ``in_degree``, ``neighbors``, ``number_of_nodes``,
-    ``number_of_edges``, and ``subgraph``.
+    ``number_of_edges``, ``remove_node``, ``remove_edge``, ``copy`` and
+    ``subgraph``, plus change tracking
+    through ``mark_clean`` and ``changes_since`` and copy-on-write
+    snapshots through ``cow_copy``.
   - ``degree_centrality`` computes normalised degree centrality.
+  - ``strongly_connected_components`` (iterative Tarjan),
+    ``weakly_connected_components`` (breadth-first) and
+    ``label_propagation_communities`` (seeded, asynchronous).
   - ``betweenness_centrality`` returns zeros for all nodes (placeholder).
   - ``pagerank`` returns a uniform distribution over nodes.
   - ``node_link_data`` and ``node_link_graph`` provide simple serialisation.
-  - ``shortest_path`` performs a BFS to find one shortest path.
-  - Exception classes ``NetworkXNoPath`` and ``NodeNotFound`` mimic
-    NetworkX behaviour for path finding errors.
+  - ``shortest_path`` finds one shortest path (see ``ultimai.paths``).
+  - Exception classes ``NetworkXNoPath``, ``NodeNotFound`` and
+    ``NetworkXError`` mimic NetworkX behaviour for path finding and
+    removal errors.
 """
 
 from __future__ import annotations
 
-from collections import deque
-from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import copy
+import random
+import weakref
+from collections import Counter
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
 
 class NetworkXNoPath(Exception):
@@ -35,6 +46,10 @@ class NodeNotFound(Exception):
     """Raised when a requested node is not present in the graph."""
 
 
+class NetworkXError(Exception):
+    """Raised when removing a node or edge that is not in the graph."""
+
+
 class NodeView:
     """A view of the graph's nodes supporting len, membership and indexing."""
 
@@ -51,7 +66,15 @@ class NodeView:
         return node in self._graph._nodes
 
     def __getitem__(self, node: Any) -> Dict[str, Any]:
-        return self._graph._nodes[node]
+        g = self._graph
+        if g._frozen:
+            return MappingProxyType(g._nodes[node])  # type: ignore[return-value]
+        # The caller may modify the returned dict in place; ``changes_since``
+        # compares it with its state at the first fetch.
+        attrs = g._own_node(node)
+        if g._clean_token is not None and node not in g._dirty_nodes and node not in g._fetched:
+            g._fetched[node] = _attrs_state(attrs)
+        return attrs
 
     def __call__(self, data: bool = False) -> Iterable[Any | Tuple[Any, Dict[str, Any]]]:
         """Allow the view to be called like ``graph.nodes(data=True)``."""
@@ -77,6 +100,77 @@ class EdgeView:
         return self._graph.edges_iter(data=data)
 
 
+def _attrs_state(attrs: Dict[str, Any]) -> Dict[str, Any]:
+    # Copy nested containers too, so in-place changes to them are seen.
+    return {k: copy.deepcopy(v) if isinstance(v, (dict, list, set)) else v
+            for k, v in attrs.items()}
+
+
+class EdgeLog:
+    """Edges inserted into a graph, in order, for incremental indexes.
+
+    Positions are absolute: the first entry kept is at ``start`` and the
+    next insertion goes to ``end``.  Each consumer (an index) reports how
+    far it has read with ``consume``; entries every live consumer has read
+    are dropped, so the log stays as long as the slowest index is behind.
+    Copies share the entries until either side appends or trims.
+    """
+
+    def __init__(self) -> None:
+        self.start = 0
+        self.entries: List[Tuple[Any, Any]] = []
+        self._owned = True
+        self._cursors: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+
+    @property
+    def end(self) -> int:
+        return self.start + len(self.entries)
+
+    def copy(self) -> 'EdgeLog':
+        log = EdgeLog.__new__(EdgeLog)
+        log.start, log.entries = self.start, self.entries
+        log._cursors = self._cursors.copy()
+        log._owned = self._owned = False
+        return log
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> 'EdgeLog':
+        # Entries are tuples of node ids and the consumers are indexes,
+        # neither of which belongs to the copied graph.
+        return self.copy()
+
+    def append(self, edge: Tuple[Any, Any]) -> None:
+        if not self._cursors:
+            # Nobody reads the log any more; only the position matters.
+            self.start += len(self.entries) + 1
+            self.entries, self._owned = [], True
+            return
+        if not self._owned:
+            self.entries, self._owned = list(self.entries), True
+        self.entries.append(edge)
+
+    def since(self, pos: int) -> Optional[List[Tuple[Any, Any]]]:
+        """Return the entries from position ``pos`` on, or ``None`` if they were dropped."""
+        if pos < self.start or pos > self.end:
+            return None
+        return self.entries[pos - self.start:]
+
+    def consume(self, consumer: Any, pos: int) -> None:
+        """Record that ``consumer`` has read up to ``pos`` and trim the log."""
+        self._cursors[consumer] = pos
+        drop = min(self._cursors.values()) - self.start
+        if drop > 0:
+            if self._owned:
+                del self.entries[:drop]
+            else:
+                self.entries, self._owned = self.entries[drop:], True
+            self.start += drop
+
+    def invalidate(self) -> None:
+        """Drop every entry so that consumers rebuild (after a removal)."""
+        self.start = self.end + 1
+        self.entries, self._owned = [], True
+
+
 class DiGraph:
     """A simple directed graph implementation."""
 
@@ -87,15 +181,109 @@ class DiGraph:
         # predecessor list: node -> {predecessor: edge_attributes}
         self._pred: Dict[Any, Dict[Any, Dict[str, Any]]] = {}
         # views will be provided via properties
+        # Graph-level attributes, as ``networkx.DiGraph.graph``.
+        self.graph: Dict[str, Any] = {}
+        # Nodes and edges changed since the last ``mark_clean`` call.
+        self._dirty_nodes: set = set()
+        self._dirty_edges: set = set()
+        self._clean_token: Optional[str] = None
+        # Attributes of nodes fetched through ``nodes[n]`` since then, as
+        # they were at the first fetch; only changed ones count as dirty.
+        self._fetched: Dict[Any, Dict[str, Any]] = {}
+        # Incremented whenever a node or edge is added or an edge changes;
+        # caches of derived structures compare it to detect staleness.
+        self._version = 0
+        # Inserted edges in order, kept once ``track_edges`` is called so
+        # indexes can catch up incrementally (copies share the log).
+        self._edge_log: Optional[EdgeLog] = None
+        # Copy-on-write state, see ``cow_copy``.  ``None`` means this graph
+        # owns every container; otherwise the sets name the per-node dicts
+        # it has copied since the containers were last shared.
+        self._shared: Set[str] = set()
+        self._owned_nodes: Optional[Set[Any]] = None
+        self._owned_adj: Optional[Set[Any]] = None
+        self._owned_pred: Optional[Set[Any]] = None
+        self._frozen = False
+
+    # Copy-on-write
+    def cow_copy(self, frozen: bool = False) -> 'DiGraph':
+        """Return a copy that shares all containers with this graph.
+
+        Only the graph attribute dict and the change-tracking sets are
+        copied, so the cost does not grow with the graph; the edge log is
+        shared as well (see ``EdgeLog``).  Afterwards both graphs copy a
+        container the first time they modify it: a top-level map once (the
+        node map for attribute changes, the adjacency and predecessor maps
+        for edge changes), then the attribute and neighbour dicts of each
+        node touched.  With
+        ``frozen=True`` the copy is a read-only snapshot: mutators raise
+        ``TypeError``, ``nodes[n]`` returns a read-only mapping and change
+        tracking and the edge log are not carried over.  Edge attribute
+        dicts are shared as well, so change them with ``add_edge`` rather
+        than in place.
+        """
+        g = DiGraph.__new__(DiGraph)
+        g._nodes, g._adj, g._pred = self._nodes, self._adj, self._pred
+        g.graph = dict(self.graph)
+        g._version = self._version
+        g._frozen = frozen
+        if frozen:
+            g._dirty_nodes, g._dirty_edges, g._clean_token = set(), set(), None
+            g._fetched = {}
+            g._edge_log = None
+        else:
+            g._dirty_nodes = set(self._dirty_nodes)
+            g._dirty_edges = set(self._dirty_edges)
+            g._fetched = dict(self._fetched)
+            g._clean_token = self._clean_token
+            g._edge_log = None if self._edge_log is None else self._edge_log.copy()
+        for graph in (self, g):
+            graph._shared = {"_nodes", "_adj", "_pred"}
+            graph._owned_nodes, graph._owned_adj, graph._owned_pred = set(), set(), set()
+        return g
+
+    def _own_maps(self, *names: str) -> None:
+        if self._frozen:
+            raise TypeError("graph snapshot is read-only")
+        for name in names:
+            if name in self._shared:
+                setattr(self, name, dict(getattr(self, name)))
+                self._shared.discard(name)
+
+    def _own_node(self, node: Any) -> Dict[str, Any]:
+        owned = self._owned_nodes
+        if owned is None:
+            return self._nodes[node]
+        self._own_maps("_nodes")
+        if node not in owned:
+            self._nodes[node] = dict(self._nodes[node])
+            owned.add(node)
+        return self._nodes[node]
+
+    def _own_nbrs(self, name: str, owned: Optional[Set[Any]], node: Any) -> Dict[Any, Any]:
+        self._own_maps(name)
+        side = getattr(self, name)
+        if owned is not None and node not in owned:
+            side[node] = dict(side[node])
+            owned.add(node)
+        return side[node]
 
     # Node operations
     def add_node(self, node: Any, **attrs: Any) -> None:
+        self._own_maps()
         if node not in self._nodes:
+            self._own_maps("_nodes", "_adj", "_pred")
             self._nodes[node] = {}
             self._adj[node] = {}
             self._pred[node] = {}
+            for owned in (self._owned_nodes, self._owned_adj, self._owned_pred):
+                if owned is not None:
+                    owned.add(node)
+            self._version += 1
         # update attributes
-        self._nodes[node].update(attrs)
+        if attrs:
+            self._own_node(node).update(attrs)
+        self._dirty_nodes.add(node)
 
     def has_node(self, node: Any) -> bool:
         return node in self._nodes
@@ -106,8 +294,71 @@ class DiGraph:
             self.add_node(u)
         if v not in self._nodes:
             self.add_node(v)
-        self._adj[u][v] = attrs.copy()
-        self._pred[v][u] = attrs.copy()
+        self._own_nbrs("_adj", self._owned_adj, u)[v] = attrs.copy()
+        self._own_nbrs("_pred", self._owned_pred, v)[u] = attrs.copy()
+        self._dirty_edges.add((u, v))
+        self._version += 1
+        if self._edge_log is not None:
+            self._edge_log.append((u, v))
+
+    def remove_edge(self, u: Any, v: Any) -> None:
+        if not self.has_edge(u, v):
+            raise NetworkXError(f"The edge {u}-{v} is not in the graph.")
+        del self._own_nbrs("_adj", self._owned_adj, u)[v]
+        del self._own_nbrs("_pred", self._owned_pred, v)[u]
+        self._dirty_edges.add((u, v))
+        self._removed()
+
+    def remove_node(self, node: Any) -> None:
+        if node not in self._nodes:
+            raise NetworkXError(f"The node {node} is not in the graph.")
+        self._own_maps("_nodes", "_adj", "_pred")
+        for v in self._adj[node]:
+            if v != node:
+                del self._own_nbrs("_pred", self._owned_pred, v)[node]
+            self._dirty_edges.add((node, v))
+        for u in self._pred[node]:
+            if u != node:
+                del self._own_nbrs("_adj", self._owned_adj, u)[node]
+            self._dirty_edges.add((u, node))
+        del self._nodes[node], self._adj[node], self._pred[node]
+        self._dirty_nodes.add(node)
+        self._removed()
+
+    def _removed(self) -> None:
+        self._version += 1
+        if self._edge_log is not None:
+            # Indexes only replay insertions, so they have to rebuild.
+            self._edge_log.invalidate()
+
+    def track_edges(self) -> EdgeLog:
+        """Start (or continue) logging edge insertions and return the log."""
+        if self._edge_log is None:
+            self._edge_log = EdgeLog()
+        return self._edge_log
+
+    # Change tracking
+    def mark_clean(self, token: Optional[str] = None) -> None:
+        """Forget recorded changes; ``token`` names the state now saved."""
+        self._dirty_nodes = set()
+        self._dirty_edges = set()
+        self._fetched = {}
+        self._clean_token = token
+
+    def changes_since(self, token: Optional[str]) -> Optional[Tuple[set, set]]:
+        """Return ``(nodes, edges)`` changed since ``mark_clean(token)``.
+
+        Returns ``None`` when the graph was not marked clean with ``token``,
+        for example because it was built from scratch.  A node whose
+        attribute dict was fetched through ``nodes[n]`` counts as changed
+        only if the dict differs from what it was at the first fetch.
+        """
+        if token is None or token != self._clean_token:
+            return None
+        nodes = set(self._dirty_nodes)
+        nodes.update(n for n, before in self._fetched.items()
+                     if n in self._nodes and self._nodes[n] != before)
+        return nodes, set(self._dirty_edges)
 
     def has_edge(self, u: Any, v: Any) -> bool:
         return v in self._adj.get(u, {})
@@ -158,13 +409,25 @@ class DiGraph:
     def number_of_edges(self) -> int:
         return sum(len(adj) for adj in self._adj.values())
 
+    def copy(self) -> 'DiGraph':
+        """Return an independent copy of the graph and its attributes."""
+        g = DiGraph()
+        for n, attrs in self._nodes.items():
+            g.add_node(n, **attrs)
+        for u, nbrs in self._adj.items():
+            for v, attrs in nbrs.items():
+                g.add_edge(u, v, **attrs)
+        return g
+
     def subgraph(self, nodes: Iterable[Any]) -> 'DiGraph':
         sg = DiGraph()
-        node_set = set(nodes)
-        for n in node_set:
+        # Keep the caller's order so subgraphs are built deterministically.
+        node_list = list(dict.fromkeys(nodes))
+        node_set = set(node_list)
+        for n in node_list:
             if n in self._nodes:
                 sg.add_node(n, **self._nodes[n])
-        for u in node_set:
+        for u in node_list:
             for v, attrs in self._adj.get(u, {}).items():
                 if v in node_set:
                     sg.add_edge(u, v, **attrs)
@@ -208,6 +471,114 @@ def degree_centrality(g: DiGraph) -> Dict[Any, float]:
     return {node: (deg / total_deg) * n for node, deg in degrees.items()}
 
 
+def strongly_connected_components(g: DiGraph) -> Iterator[set]:
+    """Yield the strongly connected components of ``g`` as sets of nodes.
+
+    Uses an iterative form of Tarjan's algorithm, so deep graphs do not
+    hit the recursion limit.  Components are produced in reverse
+    topological order of the condensation (sinks first).
+    """
+    succ = g.adj
+    index: Dict[Any, int] = {}
+    low: Dict[Any, int] = {}
+    on_stack: set = set()
+    stack: List[Any] = []
+    counter = 0
+    for root in g.nodes:
+        if root in index:
+            continue
+        index[root] = low[root] = counter
+        counter += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(succ[root]))]
+        while work:
+            v, it = work[-1]
+            for w in it:
+                if w not in index:
+                    index[w] = low[w] = counter
+                    counter += 1
+                    stack.append(w)
+                    on_stack.add(w)
+                    work.append((w, iter(succ[w])))
+                    break
+                elif w in on_stack and index[w] < low[v]:
+                    low[v] = index[w]
+            else:
+                work.pop()
+                if work and low[v] < low[work[-1][0]]:
+                    low[work[-1][0]] = low[v]
+                if low[v] == index[v]:
+                    component = set()
+                    while True:
+                        w = stack.pop()
+                        on_stack.discard(w)
+                        component.add(w)
+                        if w == v:
+                            break
+                    yield component
+
+
+def weakly_connected_components(g: DiGraph) -> Iterator[set]:
+    """Yield the weakly connected components of ``g`` as sets of nodes."""
+    succ, pred = g.adj, g.pred
+    seen: set = set()
+    for root in g.nodes:
+        if root in seen:
+            continue
+        seen.add(root)
+        component = {root}
+        frontier = [root]
+        while frontier:
+            u = frontier.pop()
+            for side in (succ[u], pred[u]):
+                for v in side:
+                    if v not in seen:
+                        seen.add(v)
+                        component.add(v)
+                        frontier.append(v)
+        yield component
+
+
+def label_propagation_communities(g: DiGraph, seed: Optional[int] = None,
+                                  max_iter: int = 100) -> List[set]:
+    """Return communities found by asynchronous label propagation.
+
+    Edges are treated as undirected.  Every node starts with its own
+    label and, visiting nodes in a shuffled order, repeatedly adopts the
+    label most common among its neighbours (ties broken at random) until
+    no label changes or ``max_iter`` rounds have run.  ``seed`` makes the
+    result reproducible.
+    """
+    rng = random.Random(seed)
+    succ, pred = g.adj, g.pred
+    nodes = list(g.nodes)
+    labels = {n: i for i, n in enumerate(nodes)}
+    for _ in range(max_iter):
+        rng.shuffle(nodes)
+        changed = False
+        for u in nodes:
+            counts: Counter = Counter()
+            for side in (succ[u], pred[u]):
+                for v in side:
+                    if v != u:
+                        counts[labels[v]] += 1
+            if not counts:
+                continue
+            top = max(counts.values())
+            best = [label for label, c in counts.items() if c == top]
+            if labels[u] in best:
+                continue
+            labels[u] = best[0] if len(best) == 1 else rng.choice(sorted(best))
+            changed = True
+        if not changed:
+            break
+    groups: Dict[int, set] = {}
+    for n, label in labels.items():
+        groups.setdefault(label, set()).add(n)
+    return list(groups.values())
+
+
 def betweenness_centrality(g: DiGraph) -> Dict[Any, float]:
     """Return betweenness centrality (placeholder returning zeros)."""
     return {node: 0.0 for node in g.nodes()}
@@ -254,42 +625,22 @@ def node_link_graph(data: Dict[str, Any]) -> DiGraph:
     return g
 
 
-def shortest_path(g: DiGraph, source: Any, target: Any) -> List[Any]:
-    """Return one shortest path from source to target using BFS.
+def shortest_path(g: DiGraph, source: Any, target: Any, weight: Optional[str] = None) -> List[Any]:
+    """Return one shortest path from source to target.
 
-    Raises NodeNotFound if source or target is missing, NetworkXNoPath if no
-    path exists.
+    Without ``weight`` this is a bidirectional BFS; with ``weight`` the
+    named edge attribute is used as a cost, as in NetworkX.  Both are
+    provided by ``ultimai.paths``.  Raises NodeNotFound if source or
+    target is missing, NetworkXNoPath if no path exists.
     """
-    if source not in g._nodes:
-        raise NodeNotFound(f"Node {source!r} not found in graph")
-    if target not in g._nodes:
-        raise NodeNotFound(f"Node {target!r} not found in graph")
-    if source == target:
-        return [source]
-    # BFS
-    queue: deque[Any] = deque([source])
-    parents: Dict[Any, Any] = {source: None}
-    found = False
-    while queue and not found:
-        u = queue.popleft()
-        for v in g.neighbors(u):
-            if v not in parents:
-                parents[v] = u
-                if v == target:
-                    found = True
-                    break
-                queue.append(v)
-    if not found:
-        raise NetworkXNoPath(f"No path between {source!r} and {target!r}")
-    # reconstruct path
-    path: List[Any] = [target]
-    while parents[path[-1]] is not None:
-        path.append(parents[path[-1]])
-    path.reverse()
-    return path
+    from . import paths
+    if weight is None:
+        return paths.bidirectional_shortest_path(g, source, target)
+    return paths.dijkstra_path(g, source, target, cost=lambda attrs: attrs.get(weight, 1.0))
 
 
 # Provide alias to match networkx's interface
 class exceptions:
     NetworkXNoPath = NetworkXNoPath  # type: ignore
     NodeNotFound = NodeNotFound  # type: ignore
+    NetworkXError = NetworkXError  # type: ignore
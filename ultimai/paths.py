@@ -0,0 +1,338 @@
+"""Shortest-path engine for justification queries.
+
+The functions here work on any graph exposing ``has_node`` and the
+``adj``/``pred`` mappings (``{node: {neighbour: edge_attrs}}``): the
+NetworkX and stub ``DiGraph`` classes, ``LazyDiGraph`` and
+``SQLiteDiGraph``.  Neighbour dicts are iterated in place, so an
+expansion does not build a neighbour list.
+
+* ``bidirectional_shortest_path`` – fewest-hop path, searching forward
+  from the source and backward from the target one level at a time and
+  always growing the smaller frontier.
+* ``dijkstra_path`` – weight-aware path.  ``weight`` is a strength of
+  support, so the default edge cost is ``1 / weight`` and the result is
+  the best-supported chain; edges with a non-positive weight are
+  skipped.  Passing ``heuristic`` (a lower bound on the remaining cost)
+  turns the search into A*.
+* ``k_shortest_paths`` – the ``k`` best loopless paths (Yen's
+  algorithm), by hop count or by cost.
+* ``shortest_path_tree`` – every shortest path from one source at once,
+  as a parent map; ``TreeCache`` keeps recent trees per source and drops
+  them when the graph changes (see ``graph_version``).
+
+All searches accept ``max_depth``, the maximum number of edges in a
+returned path, and raise ``NodeNotFound``/``NetworkXNoPath`` like
+``networkx.shortest_path``.
+"""
+
+from __future__ import annotations
+
+import heapq
+import weakref
+from collections import OrderedDict
+from itertools import count
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
+
+from .utils import lazy_import
+
+# NetworkX is loaded on first use; the local stub stands in without it.
+nx = lazy_import("networkx")
+if nx is None:  # pragma: no cover
+    from . import networkx_stub as nx  # type: ignore
+
+CostFn = Callable[[Dict[str, Any]], float]
+
+_NO_EDGES: FrozenSet[Tuple[Any, Any]] = frozenset()
+_NO_NODES: FrozenSet[Any] = frozenset()
+
+
+def strength_cost(attrs: Dict[str, Any]) -> float:
+    """Default edge cost: the inverse of the edge's ``weight``."""
+    w = attrs.get("weight", 1.0)
+    if w is None:
+        return 1.0
+    return 1.0 / w if w > 0 else float("inf")
+
+
+def _check_nodes(g: Any, source: Any, target: Any) -> None:
+    if not g.has_node(source):
+        raise nx.NodeNotFound(f"Node {source!r} not found in graph")
+    if not g.has_node(target):
+        raise nx.NodeNotFound(f"Node {target!r} not found in graph")
+
+
+def _no_path(source: Any, target: Any) -> Exception:
+    return nx.NetworkXNoPath(f"No path between {source!r} and {target!r}")
+
+
+def bidirectional_shortest_path(g: Any, source: Any, target: Any,
+                                max_depth: Optional[int] = None) -> List[Any]:
+    """Return a fewest-hop path from ``source`` to ``target``."""
+    _check_nodes(g, source, target)
+    if source == target:
+        return [source]
+    succ, pred = g.adj, g.pred
+    # parent maps double as visited sets for each direction
+    fwd: Dict[Any, Any] = {source: None}
+    bwd: Dict[Any, Any] = {target: None}
+    fwd_frontier = [source]
+    bwd_frontier = [target]
+    depth = 0
+    meet = None
+    while fwd_frontier and bwd_frontier and meet is None:
+        if max_depth is not None and depth >= max_depth:
+            break
+        depth += 1
+        if len(fwd_frontier) <= len(bwd_frontier):
+            nxt = []
+            for u in fwd_frontier:
+                for v in succ[u]:
+                    if v not in fwd:
+                        fwd[v] = u
+                        if v in bwd:
+                            meet = v
+                            break
+                        nxt.append(v)
+                if meet is not None:
+                    break
+            fwd_frontier = nxt
+        else:
+            nxt = []
+            for v in bwd_frontier:
+                for u in pred[v]:
+                    if u not in bwd:
+                        bwd[u] = v
+                        if u in fwd:
+                            meet = u
+                            break
+                        nxt.append(u)
+                if meet is not None:
+                    break
+            bwd_frontier = nxt
+    if meet is None:
+        raise _no_path(source, target)
+    path = []
+    node = meet
+    while node is not None:
+        path.append(node)
+        node = fwd[node]
+    path.reverse()
+    node = bwd[meet]
+    while node is not None:
+        path.append(node)
+        node = bwd[node]
+    return path
+
+
+def _search(g: Any, source: Any, target: Any, cost: Optional[CostFn],
+            heuristic: Optional[Callable[[Any], float]], max_depth: Optional[int],
+            banned_nodes: FrozenSet[Any] | Set[Any] = _NO_NODES,
+            banned_edges: FrozenSet[Tuple[Any, Any]] | Set[Tuple[Any, Any]] = _NO_EDGES,
+            ) -> Optional[Tuple[float, List[Any]]]:
+    """Best-first search returning ``(cost, path)`` or ``None``.
+
+    ``cost=None`` counts hops.  With ``max_depth`` set, states are
+    ``(node, hops)`` so a cheap but long prefix cannot hide a short
+    feasible path.
+    """
+    succ = g.adj
+    h = heuristic or (lambda _n: 0.0)
+    tie = count()
+    start = (source, 0) if max_depth is not None else source
+    best: Dict[Any, float] = {start: 0.0}
+    parent: Dict[Any, Any] = {start: None}
+    heap: List[Tuple[float, int, float, Any, int]] = [(h(source), next(tie), 0.0, source, 0)]
+    done: Set[Any] = set()
+    while heap:
+        _, _, dist, u, hops = heapq.heappop(heap)
+        key = (u, hops) if max_depth is not None else u
+        if key in done:
+            continue
+        done.add(key)
+        if u == target:
+            path = []
+            while key is not None:
+                path.append(key[0] if max_depth is not None else key)
+                key = parent[key]
+            path.reverse()
+            return dist, path
+        if max_depth is not None and hops >= max_depth:
+            continue
+        for v, attrs in succ[u].items():
+            if v in banned_nodes or (banned_edges and (u, v) in banned_edges):
+                continue
+            step = 1.0 if cost is None else cost(attrs)
+            if step == float("inf"):
+                continue
+            nd = dist + step
+            vkey = (v, hops + 1) if max_depth is not None else v
+            if vkey not in best or nd < best[vkey]:
+                best[vkey] = nd
+                parent[vkey] = key
+                heapq.heappush(heap, (nd + h(v), next(tie), nd, v, hops + 1))
+    return None
+
+
+def dijkstra_path(g: Any, source: Any, target: Any, cost: CostFn = strength_cost,
+                  heuristic: Optional[Callable[[Any], float]] = None,
+                  max_depth: Optional[int] = None) -> List[Any]:
+    """Return the lowest-cost path; with ``heuristic`` this is A*."""
+    _check_nodes(g, source, target)
+    found = _search(g, source, target, cost, heuristic, max_depth)
+    if found is None:
+        raise _no_path(source, target)
+    return found[1]
+
+
+def path_cost(g: Any, path: List[Any], cost: Optional[CostFn] = strength_cost) -> float:
+    """Return the cost of ``path`` (hop count when ``cost`` is ``None``)."""
+    if cost is None:
+        return float(len(path) - 1)
+    return sum(cost(g.adj[u][v]) for u, v in zip(path, path[1:]))
+
+
+def k_shortest_paths(g: Any, source: Any, target: Any, k: int, weighted: bool = False,
+                     cost: CostFn = strength_cost,
+                     max_depth: Optional[int] = None) -> List[List[Any]]:
+    """Return up to ``k`` loopless paths in order of increasing length or cost."""
+    _check_nodes(g, source, target)
+    edge_cost: Optional[CostFn] = cost if weighted else None
+    first = _search(g, source, target, edge_cost, None, max_depth)
+    if first is None:
+        raise _no_path(source, target)
+    paths: List[List[Any]] = [first[1]]
+    candidates: List[Tuple[float, int, List[Any]]] = []
+    seen = {tuple(first[1])}
+    tie = count()
+    while len(paths) < k:
+        last = paths[-1]
+        for i in range(len(last) - 1):
+            spur, root = last[i], last[:i + 1]
+            banned_edges = {(p[i], p[i + 1]) for p in paths if p[:i + 1] == root}
+            banned_nodes = set(root[:-1])
+            depth = None if max_depth is None else max_depth - i
+            if depth is not None and depth <= 0:
+                continue
+            found = _search(g, spur, target, edge_cost, None, depth, banned_nodes, banned_edges)
+            if found is None:
+                continue
+            candidate = root[:-1] + found[1]
+            if tuple(candidate) in seen:
+                continue
+            seen.add(tuple(candidate))
+            heapq.heappush(candidates, (path_cost(g, candidate, edge_cost), next(tie), candidate))
+        if not candidates:
+            break
+        paths.append(heapq.heappop(candidates)[2])
+    return paths
+
+
+def graph_version(g: Any) -> Any:
+    """Return a value that changes whenever the structure of ``g`` changes.
+
+    The stub ``DiGraph`` keeps an explicit counter; for other graphs the
+    node and edge counts are used, which detects insertions but not an
+    edge's weight being changed in place.
+    """
+    version = getattr(g, "_version", None)
+    if version is not None:
+        return version
+    return (g.number_of_nodes(), g.number_of_edges())
+
+
+def shortest_path_tree(g: Any, source: Any, weighted: bool = False, cost: CostFn = strength_cost,
+                       max_depth: Optional[int] = None) -> Dict[Any, Any]:
+    """Return a parent map of shortest paths from ``source`` to every reachable node.
+
+    Unweighted trees are built by BFS and honour ``max_depth``; weighted
+    trees by Dijkstra, where ``max_depth`` is not supported because the
+    cheapest path to a node need not be the shortest one.
+    """
+    if not g.has_node(source):
+        raise nx.NodeNotFound(f"Node {source!r} not found in graph")
+    succ = g.adj
+    parents: Dict[Any, Any] = {source: None}
+    if not weighted:
+        frontier = [source]
+        depth = 0
+        while frontier and (max_depth is None or depth < max_depth):
+            depth += 1
+            nxt = []
+            for u in frontier:
+                for v in succ[u]:
+                    if v not in parents:
+                        parents[v] = u
+                        nxt.append(v)
+            frontier = nxt
+        return parents
+    if max_depth is not None:
+        raise ValueError("max_depth is not supported for weighted trees")
+    best: Dict[Any, float] = {source: 0.0}
+    done: Set[Any] = set()
+    tie = count()
+    heap: List[Tuple[float, int, Any]] = [(0.0, next(tie), source)]
+    while heap:
+        dist, _, u = heapq.heappop(heap)
+        if u in done:
+            continue
+        done.add(u)
+        for v, attrs in succ[u].items():
+            step = cost(attrs)
+            if step == float("inf"):
+                continue
+            nd = dist + step
+            if v not in best or nd < best[v]:
+                best[v] = nd
+                parents[v] = u
+                heapq.heappush(heap, (nd, next(tie), v))
+    return parents
+
+
+def path_from_tree(parents: Dict[Any, Any], target: Any) -> List[Any]:
+    """Return the path to ``target`` recorded in a parent map, or ``[]``."""
+    if target not in parents:
+        return []
+    path = [target]
+    while parents[path[-1]] is not None:
+        path.append(parents[path[-1]])
+    path.reverse()
+    return path
+
+
+class TreeCache:
+    """Bounded LRU cache of shortest-path trees keyed by graph and source.
+
+    Entries remember the ``graph_version`` they were built at and are
+    rebuilt on the next lookup once the graph has changed.
+    """
+
+    def __init__(self, maxsize: int = 128) -> None:
+        self.maxsize = maxsize
+        self._trees: "OrderedDict[Tuple[Any, ...], Tuple[Any, Any, Dict[Any, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def tree(self, g: Any, source: Any, weighted: bool = False,
+             max_depth: Optional[int] = None) -> Dict[Any, Any]:
+        key = (id(g), source, weighted, max_depth)
+        version = graph_version(g)
+        entry = self._trees.get(key)
+        if entry is not None:
+            ref, built_at, parents = entry
+            if ref() is g and built_at == version:
+                self._trees.move_to_end(key)
+                self.hits += 1
+                return parents
+        self.misses += 1
+        parents = shortest_path_tree(g, source, weighted=weighted, max_depth=max_depth)
+        self._trees[key] = (weakref.ref(g), version, parents)
+        self._trees.move_to_end(key)
+        while len(self._trees) > self.maxsize:
+            self._trees.popitem(last=False)
+        return parents
+
+    def clear(self) -> None:
+        self._trees.clear()
+
+    def __len__(self) -> int:
+        return len(self._trees)
@@ -0,0 +1,413 @@
+"""Declarative pipeline over one resident reasoning graph.
+
+The nightly workflow ran ``generate_graph.py``, the ``run-memetic``,
+``run-quarantine`` and ``run-audit`` commands and ``dump_report.py`` as
+separate processes, each loading and saving the graph again.
+``run_pipeline`` runs the same steps from one spec in one process,
+with one ``MetaSynthesizer``.  A spec is a JSON or YAML mapping; YAML
+needs PyYAML, which is only imported when installed.  It holds the
+``MetaConfig`` fields, optionally inherited from the file named by
+``extends`` (resolved relative to the spec), and a list of stages::
+
+    {
+      "extends": "config.yaml",
+      "seed": 0,
+      "state": "build/pipeline.state.json",
+      "stages": [
+        {"stage": "ingest", "input": "data/seeds.json"},
+        {"stage": "memetic", "iterations": 5},
+        {"stage": "quarantine"},
+        {"stage": "audit", "output": "build/report/audit.json"},
+        {"stage": "report", "output": "build/report/report.md"},
+        {"stage": "export", "output": "build/graph/graph.jsonl.gz"},
+        {"stage": "save", "output": "build/graph/graph.json"}
+      ]
+    }
+
+Other paths in a spec are relative to the working directory, as they are
+for the scripts.  The stages are:
+
+========== ===========================================================
+ingest     build the graph from ``input`` (a seed file or list of them)
+memetic    memetic evolution; ``iterations`` overrides the config
+quarantine quarantine and reintegration; ``threshold``, ``reintegrate``
+audit      run the critic; write the report as JSON to ``output``
+report     write the markdown audit report to ``output``
+export     stream the knowledge graph to ``output`` (``format``,
+           ``relations``, ``types`` as for ``export_kg_stream``)
+save       save the graph to ``output`` (``compact``)
+========== ===========================================================
+
+Each stage has a key: a hash of its parameters and its input, which is
+the content of the seed files for ``ingest`` and the key of the stage
+that last changed the graph otherwise.  The keys and a content hash of
+every file written are kept in the ``state`` file.  A stage that writes
+files is skipped when its key is unchanged and its files still match.
+Stages that change the graph cannot be skipped on their own, but when
+all of them up to a ``save`` are unchanged and its file still matches,
+the graph is loaded from that file instead of being built again.  With ``seed`` set, every
+stage that changes the graph seeds ``random`` from its key, so a run is
+reproducible and a restored graph is the one a full run would build.
+
+``python -m ultimai.pipeline spec.json`` runs a spec; ``--force``
+ignores the state file.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import time
+from dataclasses import dataclass, field, fields
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .critic import report_markdown
+from .graph import ReasoningGraph
+from .instrumentation import JsonlExporter, PrometheusExporter, Recorder
+from .meta_synthesizer import MetaConfig, MetaSynthesizer
+from .utils import lazy_import
+
+yaml = lazy_import("yaml")
+
+# Stages that replace or change the graph, and stages that only read it.
+GRAPH_STAGES = ("ingest", "memetic", "quarantine")
+OUTPUT_STAGES = ("audit", "report", "export", "save")
+STAGES = GRAPH_STAGES + OUTPUT_STAGES
+
+SPEC_KEYS = {"extends", "stages", "seed", "state", "metrics"}
+
+
+# ----------------------------------------------------------------------
+# Specs
+def _parse(path: Path) -> Dict[str, Any]:
+    text = path.read_text(encoding="utf-8")
+    if yaml is not None:
+        data = yaml.safe_load(text)
+    else:
+        try:
+            data = json.loads(text)
+        except ValueError as exc:
+            raise ValueError(f"{path} is not JSON and PyYAML is not installed: {exc}") from None
+    if not isinstance(data, dict):
+        raise ValueError(f"{path} must contain a mapping")
+    return data
+
+
+def load_spec(path: Path) -> Dict[str, Any]:
+    """Read a pipeline spec, merged over the files it ``extends``."""
+    path = Path(path)
+    spec = _parse(path)
+    base = spec.pop("extends", None)
+    if base is not None:
+        spec = dict(load_spec(path.parent / base), **spec)
+    return spec
+
+
+def meta_config(spec: Dict[str, Any]) -> MetaConfig:
+    """Return the ``MetaConfig`` of a spec; unknown keys are an error."""
+    names = {f.name for f in fields(MetaConfig)}
+    unknown = set(spec) - names - SPEC_KEYS
+    if unknown:
+        raise ValueError(f"unknown pipeline settings: {sorted(unknown)}")
+    return MetaConfig(**{k: v for k, v in spec.items() if k in names})
+
+
+def _stage(entry: Any) -> Dict[str, Any]:
+    stage = {"stage": entry} if isinstance(entry, str) else dict(entry)
+    if stage.get("stage") not in STAGES:
+        raise ValueError(f"unknown stage {stage.get('stage')!r}; expected one of {STAGES}")
+    if stage["stage"] == "ingest" and "input" not in stage:
+        raise ValueError("the ingest stage needs an 'input'")
+    if stage["stage"] in ("report", "export", "save") and "output" not in stage:
+        raise ValueError(f"the {stage['stage']} stage needs an 'output'")
+    return stage
+
+
+# ----------------------------------------------------------------------
+# Hashing and state
+def _hash(*parts: Any) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def file_digest(path: Path) -> Optional[str]:
+    """Return the SHA-256 of a file's content, or None if it does not exist."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _inputs(stage: Dict[str, Any]) -> List[str]:
+    source = stage["input"]
+    return [source] if isinstance(source, str) else list(source)
+
+
+def _outputs(stage: Dict[str, Any], config: MetaConfig) -> List[str]:
+    output = stage.get("output")
+    if output is None:
+        return []
+    if stage["stage"] == "save" and config.incremental_save:
+        return [output, output + ".patch"]
+    return [output]
+
+
+def _up_to_date(record: Optional[Dict[str, Any]], key: str) -> bool:
+    if not record or record.get("key") != key:
+        return False
+    return all(file_digest(Path(p)) == d for p, d in record.get("outputs", {}).items())
+
+
+@dataclass
+class StageResult:
+    """What happened to one stage of a run."""
+    name: str
+    key: str
+    status: str  # "run", "skipped" or "restored"
+    seconds: float = 0.0
+
+
+@dataclass
+class PipelineResult:
+    stages: List[StageResult] = field(default_factory=list)
+    audit: Optional[Dict[str, Any]] = None
+
+    @property
+    def ran(self) -> List[str]:
+        return [s.name for s in self.stages if s.status == "run"]
+
+
+# ----------------------------------------------------------------------
+# Stages
+def _ingest(synth: MetaSynthesizer, stage: Dict[str, Any], ctx: Dict[str, Any]) -> None:
+    from .ingestion import ingest, ingest_many
+    paths = _inputs(stage)
+    with synth.instrumentation.span("load_data"):
+        if len(paths) == 1:
+            rg = ingest(paths[0])
+        else:
+            rg = ingest_many(paths, workers=int(stage.get("workers", synth.config.workers)))
+    synth.graph = rg
+    synth.engine = None
+    synth.quarantine.quarantined = []
+
+
+def _memetic(synth: MetaSynthesizer, stage: Dict[str, Any], ctx: Dict[str, Any]) -> None:
+    synth.config.memetic_iterations = int(stage.get("iterations", ctx["config"].memetic_iterations))
+    synth.engine = None
+    synth.run_memetic()
+
+
+def _quarantine(synth: MetaSynthesizer, stage: Dict[str, Any], ctx: Dict[str, Any]) -> None:
+    synth.quarantine.threshold = float(stage.get("threshold", ctx["config"].quarantine_threshold))
+    synth.config.reintegrate_threshold = float(stage.get("reintegrate",
+                                                         ctx["config"].reintegrate_threshold))
+    synth.run_quarantine()
+
+
+def _write_audit(synth: MetaSynthesizer, ctx: Dict[str, Any]) -> Dict[str, Any]:
+    if ctx.get("audit") is None:
+        ctx["audit"] = synth.audit()
+    return ctx["audit"]
+
+
+def _audit(synth: MetaSynthesizer, stage: Dict[str, Any], ctx: Dict[str, Any]) -> None:
+    report = _write_audit(synth, ctx)
+    if stage.get("output"):
+        Path(stage["output"]).write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+
+
+def _report(synth: MetaSynthesizer, stage: Dict[str, Any], ctx: Dict[str, Any]) -> None:
+    report = _write_audit(synth, ctx)
+    Path(stage["output"]).write_text(report_markdown(report, stage.get("title", "Audit Report")),
+                                     encoding="utf-8")
+
+
+def _export(synth: MetaSynthesizer, stage: Dict[str, Any], ctx: Dict[str, Any]) -> None:
+    from .explainability import export_kg_stream
+    with synth.instrumentation.span("export", synth.graph):
+        export_kg_stream(synth.graph, Path(stage["output"]), stage.get("format"),
+                         relations=stage.get("relations"), types=stage.get("types"))
+
+
+def _save(synth: MetaSynthesizer, stage: Dict[str, Any], ctx: Dict[str, Any]) -> None:
+    if stage.get("compact"):
+        with synth.instrumentation.span("save_graph", synth.graph):
+            synth.graph.save(Path(stage["output"]), compact=True)
+    else:
+        synth.save_graph(stage["output"])
+
+
+RUNNERS: Dict[str, Callable[[MetaSynthesizer, Dict[str, Any], Dict[str, Any]], None]] = {
+    "ingest": _ingest,
+    "memetic": _memetic,
+    "quarantine": _quarantine,
+    "audit": _audit,
+    "report": _report,
+    "export": _export,
+    "save": _save,
+}
+
+
+def _params(stage: Dict[str, Any], config: MetaConfig, seed: Any) -> Dict[str, Any]:
+    # The settings a stage's result depends on besides its input.
+    params = dict(stage)
+    name = stage["stage"]
+    if name == "memetic":
+        params.update(iterations=stage.get("iterations", config.memetic_iterations),
+                      partition=config.partition, workers=config.workers, seed=seed)
+    elif name == "quarantine":
+        params.update(threshold=stage.get("threshold", config.quarantine_threshold),
+                      reintegrate=stage.get("reintegrate", config.reintegrate_threshold))
+    return params
+
+
+def plan(stages: Iterable[Dict[str, Any]], config: MetaConfig, seed: Any = None) -> List[Tuple[Dict[str, Any], str]]:
+    """Return ``(stage, key)`` for every stage, hashing seed files as inputs."""
+    keyed = []
+    graph_key = _hash(None)
+    for stage in stages:
+        params = _params(stage, config, seed)
+        if stage["stage"] == "ingest":
+            params["digests"] = [file_digest(Path(p)) for p in _inputs(stage)]
+            graph_key = _hash(params)
+            keyed.append((stage, graph_key))
+        elif stage["stage"] in GRAPH_STAGES:
+            graph_key = _hash(graph_key, params)
+            keyed.append((stage, graph_key))
+        else:
+            keyed.append((stage, _hash(graph_key, params)))
+    return keyed
+
+
+def _restore_point(keyed: List[Tuple[Dict[str, Any], str]], records: Dict[str, Any]) -> int:
+    """Index of the last current ``save`` the graph can be restored from, or -1.
+
+    Every stage that changes the graph before it must be unchanged, and
+    output stages that need to run again must not be separated from it by
+    one, since they are run on the restored graph.
+    """
+    point = -1
+    stale = False
+    for i, (stage, key) in enumerate(keyed):
+        record = records.get(str(i))
+        if stage["stage"] in GRAPH_STAGES:
+            if stale or not record or record.get("key") != key:
+                break
+        elif not _up_to_date(record, key):
+            stale = True
+        elif stage["stage"] == "save":
+            point, stale = i, False
+    return point
+
+
+def _restore(synth: MetaSynthesizer, path: Path) -> None:
+    with synth.instrumentation.span("load_data"):
+        rg = ReasoningGraph()
+        rg.load(path)
+    synth.graph = rg
+    synth.engine = None
+    # Quarantine keeps its list across stages; rebuild it from the flags.
+    synth.quarantine.quarantined = [n for n, attrs in rg.graph.nodes(data=True)
+                                    if attrs.get("quarantined")]
+
+
+def _instrumentation(spec: Dict[str, Any]) -> Recorder:
+    metrics = spec.get("metrics") or {}
+    exporters: List[Any] = []
+    if metrics.get("jsonl"):
+        exporters.append(JsonlExporter(Path(metrics["jsonl"])))
+    if metrics.get("prometheus"):
+        exporters.append(PrometheusExporter(Path(metrics["prometheus"])))
+    return Recorder(exporters)
+
+
+def run_pipeline(spec: Dict[str, Any], state_path: Optional[Path] = None, force: bool = False,
+                 synth: Optional[MetaSynthesizer] = None) -> PipelineResult:
+    """Run the stages of ``spec`` over one graph and return what was run.
+
+    ``state_path`` defaults to the spec's ``state``; without either every
+    stage runs.  ``force`` runs every stage and rewrites the state.
+    """
+    config = meta_config(spec)
+    stages = [_stage(entry) for entry in spec.get("stages", [])]
+    if stages and stages[0]["stage"] != "ingest" and synth is None:
+        raise ValueError("the first stage must be 'ingest' unless a synthesizer is passed")
+    seed = spec.get("seed")
+    if state_path is None and spec.get("state"):
+        state_path = Path(spec["state"])
+    records: Dict[str, Any] = {}
+    if state_path is not None and state_path.exists() and not force:
+        records = json.loads(state_path.read_text(encoding="utf-8")).get("stages", {})
+    keyed = plan(stages, config, seed)
+    if synth is None:
+        synth = MetaSynthesizer(MetaConfig(**vars(config)), _instrumentation(spec))
+        restore = _restore_point(keyed, records)
+    else:
+        restore = -1  # the graph passed in is not the one the state describes
+    ctx: Dict[str, Any] = {"config": config, "audit": None}
+    result = PipelineResult()
+    new_records: Dict[str, Any] = {}
+    instrumentation = synth.instrumentation
+    pending = restore >= 0
+    try:
+        for i, (stage, key) in enumerate(keyed):
+            name = stage["stage"]
+            record = records.get(str(i))
+            started = time.perf_counter()
+            if name in GRAPH_STAGES and i < restore:
+                status = "restored"
+                new_records[str(i)] = record
+            elif name in OUTPUT_STAGES and _up_to_date(record, key):
+                status = "skipped"
+                new_records[str(i)] = record
+            else:
+                status = "run"
+                if pending:
+                    # Load the saved graph only once a stage needs it.
+                    _restore(synth, Path(keyed[restore][0]["output"]))
+                    pending = False
+                if name in GRAPH_STAGES:
+                    ctx["audit"] = None
+                    if seed is not None:
+                        random.seed(f"{seed}:{key}")
+                for output in _outputs(stage, config):
+                    Path(output).parent.mkdir(parents=True, exist_ok=True)
+                with instrumentation.span(f"pipeline.{name}", synth.graph):
+                    RUNNERS[name](synth, stage, ctx)
+                new_records[str(i)] = {"stage": name, "key": key,
+                                       "outputs": {p: file_digest(Path(p))
+                                                   for p in _outputs(stage, config)
+                                                   if Path(p).exists()}}
+            instrumentation.count(f"pipeline_stages_{status}")
+            result.stages.append(StageResult(name, key, status, time.perf_counter() - started))
+    finally:
+        instrumentation.flush()
+        if state_path is not None:
+            state_path.parent.mkdir(parents=True, exist_ok=True)
+            state_path.write_text(json.dumps({"version": 1, "stages": new_records}, indent=2),
+                                  encoding="utf-8")
+    result.audit = ctx["audit"]
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a declarative reasoning pipeline in one process")
+    parser.add_argument("spec", help="Pipeline spec (JSON, or YAML with PyYAML installed)")
+    parser.add_argument("--state", help="State file for skipping unchanged stages (overrides the spec)")
+    parser.add_argument("--force", action="store_true", help="Run every stage regardless of the state")
+    args = parser.parse_args(argv)
+    spec = load_spec(Path(args.spec))
+    result = run_pipeline(spec, Path(args.state) if args.state else None, force=args.force)
+    for stage in result.stages:
+        print(f"{stage.name:<11} {stage.status:<9} {stage.seconds:8.3f}s")
+
+
+if __name__ == "__main__":
+    main()
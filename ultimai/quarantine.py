@@ -20,19 +20,31 @@ class Quarantine:
         self.quarantined: List[str] = []
 
     def evaluate(self, reasoning_graph: ReasoningGraph) -> List[str]:
-        """Evaluate nodes and quarantine those with score below the threshold."""
-        for node, attrs in list(reasoning_graph.graph.nodes(data=True)):  # type: ignore
-            score = attrs.get("score", 0.5)
-            if score is not None and score < self.threshold and node not in self.quarantined:
+        """Evaluate nodes and quarantine those with score below the threshold.
+
+        Storage engines that provide ``nodes_with_score_below`` answer the
+        scan from an index instead of visiting every node.
+        """
+        g = reasoning_graph.graph
+        if hasattr(g, "nodes_with_score_below"):
+            candidates = g.nodes_with_score_below(self.threshold)
+        else:
+            candidates = []
+            for node, attrs in list(g.nodes(data=True)):  # type: ignore
+                score = attrs.get("score", 0.5)
+                if score is not None and score < self.threshold:
+                    candidates.append(node)
+        for node in candidates:
+            if node not in self.quarantined:
                 self.quarantined.append(node)
-                reasoning_graph.graph.nodes[node]["quarantined"] = True
+                g.nodes[node]["quarantined"] = True
         return self.quarantined
 
     def reintegrate(self, reasoning_graph: ReasoningGraph, min_score: float = 0.5) -> List[str]:
         """Reintegrate quarantined nodes whose score has improved."""
         reintegrated: List[str] = []
         for node in list(self.quarantined):
-            score = reasoning_graph.graph.nodes[node].get("score", 0.0)
+            score = reasoning_graph.node_attrs(node).get("score", 0.0)
             if score is not None and score >= min_score:
                 reasoning_graph.graph.nodes[node]["quarantined"] = False
                 self.quarantined.remove(node)
@@ -0,0 +1,211 @@
+"""Reachability index for fast "does A justify B" checks.
+
+``ReachabilityIndex`` condenses the strongly connected components of a
+graph into a DAG and gives every component ``num_labels`` GRAIL-style
+interval labels, each from a randomised post-order traversal.  If ``a``
+reaches ``b`` then every label of ``a`` contains the matching label of
+``b``, so most negative queries are answered by a few integer
+comparisons.  The remaining queries run a depth-first search over the
+condensed DAG that skips every component whose labels cannot contain
+the target.
+
+Edge insertions (such as the ``suggests`` edges added by
+``MemeticEngine``) are applied incrementally: the new DAG edge is
+recorded and the labels of the source and its ancestors are widened
+until they contain the target's labels again.  Widening keeps the
+containment test a valid necessary condition, so answers stay exact;
+components merged by a new cycle are simply found by the search.
+``sync`` replays edges logged by the stub ``DiGraph`` (see
+``DiGraph.track_edges``), including those inserted into copies of the
+graph, and rebuilds the index when no log is available.  The log only
+keeps the edges some index has not yet replayed.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+from .networkx_stub import strongly_connected_components
+from .paths import graph_version
+
+
+class ReachabilityIndex:
+    """Answer reachability queries on a directed graph."""
+
+    def __init__(self, g: Any, num_labels: int = 3, seed: int = 0) -> None:
+        self.num_labels = num_labels
+        self.seed = seed
+        self.build(g)
+
+    # ------------------------------------------------------------------
+    # Construction
+    def build(self, g: Any) -> None:
+        """(Re)build the index for graph ``g``."""
+        self.comp_of: Dict[Any, int] = {}
+        self.succ: List[Set[int]] = []
+        self.pred: List[Set[int]] = []
+        for cid, component in enumerate(strongly_connected_components(g)):
+            self.succ.append(set())
+            self.pred.append(set())
+            for node in component:
+                self.comp_of[node] = cid
+        adj = g.adj
+        for u, cu in self.comp_of.items():
+            for v in adj[u]:
+                cv = self.comp_of[v]
+                if cu != cv:
+                    self.succ[cu].add(cv)
+                    self.pred[cv].add(cu)
+        rng = random.Random(self.seed)
+        self.low: List[List[int]] = []
+        self.high: List[List[int]] = []
+        for _ in range(self.num_labels):
+            low, high = self._label(rng)
+            self.low.append(low)
+            self.high.append(high)
+        self._next_rank = len(self.succ)
+        self._log_pos = 0
+        if hasattr(g, "track_edges"):
+            log = g.track_edges()
+            self._log_pos = log.end
+            log.consume(self, log.end)
+        self._graph_version = graph_version(g)
+
+    def _label(self, rng: random.Random) -> Tuple[List[int], List[int]]:
+        n = len(self.succ)
+        low = [0] * n
+        high = [0] * n
+        visited = [False] * n
+        rank = 0
+        roots = [c for c in range(n) if not self.pred[c]]
+        rng.shuffle(roots)
+        for root in roots:
+            if visited[root]:
+                continue
+            visited[root] = True
+            children = list(self.succ[root])
+            rng.shuffle(children)
+            work = [(root, iter(children))]
+            while work:
+                c, it = work[-1]
+                for d in it:
+                    if not visited[d]:
+                        visited[d] = True
+                        grand = list(self.succ[d])
+                        rng.shuffle(grand)
+                        work.append((d, iter(grand)))
+                        break
+                else:
+                    work.pop()
+                    high[c] = rank
+                    lo = rank
+                    for d in self.succ[c]:
+                        if low[d] < lo:
+                            lo = low[d]
+                    low[c] = lo
+                    rank += 1
+        return low, high
+
+    # ------------------------------------------------------------------
+    # Queries
+    def _contains(self, a: int, b: int) -> bool:
+        for low, high in zip(self.low, self.high):
+            if low[b] < low[a] or high[b] > high[a]:
+                return False
+        return True
+
+    def reachable(self, u: Any, v: Any) -> bool:
+        """Return True when a directed path leads from ``u`` to ``v``."""
+        cu = self.comp_of.get(u)
+        cv = self.comp_of.get(v)
+        if cu is None or cv is None:
+            return False
+        if cu == cv:
+            return True
+        if not self._contains(cu, cv):
+            return False
+        succ = self.succ
+        stack = [cu]
+        seen = {cu}
+        while stack:
+            c = stack.pop()
+            for d in succ[c]:
+                if d == cv:
+                    return True
+                if d not in seen and self._contains(d, cv):
+                    seen.add(d)
+                    stack.append(d)
+        return False
+
+    def reachable_many(self, pairs: Iterable[Tuple[Any, Any]]) -> List[bool]:
+        """Answer ``reachable`` for every pair, in order."""
+        return [self.reachable(u, v) for u, v in pairs]
+
+    # ------------------------------------------------------------------
+    # Incremental maintenance
+    def _new_component(self, node: Any) -> int:
+        cid = len(self.succ)
+        self.comp_of[node] = cid
+        self.succ.append(set())
+        self.pred.append(set())
+        rank = self._next_rank
+        self._next_rank += 1
+        for low, high in zip(self.low, self.high):
+            low.append(rank)
+            high.append(rank)
+        return cid
+
+    def add_edge(self, u: Any, v: Any) -> None:
+        """Account for a new edge ``u -> v``."""
+        cu = self.comp_of.get(u)
+        if cu is None:
+            cu = self._new_component(u)
+        cv = self.comp_of.get(v)
+        if cv is None:
+            cv = self._new_component(v)
+        if cu == cv or cv in self.succ[cu]:
+            return
+        self.succ[cu].add(cv)
+        self.pred[cv].add(cu)
+        for low, high in zip(self.low, self.high):
+            stack = [(cu, cv)]
+            while stack:
+                a, b = stack.pop()
+                changed = False
+                if low[b] < low[a]:
+                    low[a] = low[b]
+                    changed = True
+                if high[b] > high[a]:
+                    high[a] = high[b]
+                    changed = True
+                if changed:
+                    stack.extend((p, a) for p in self.pred[a])
+
+    def sync(self, g: Any) -> None:
+        """Bring the index up to date with graph ``g``.
+
+        ``g`` is the indexed graph or one derived from it, such as the
+        graph ``MemeticEngine.run`` swaps in.  Edges logged since the last
+        build or sync are applied incrementally; without a usable log the
+        index is rebuilt.
+        """
+        if graph_version(g) == self._graph_version:
+            return
+        log = g.track_edges() if hasattr(g, "track_edges") else None
+        edges = None if log is None else log.since(self._log_pos)
+        if edges is None:
+            self.build(g)
+            return
+        for u, v in edges:
+            self.add_edge(u, v)
+        if g.number_of_nodes() != len(self.comp_of):
+            for node in g.nodes:
+                if node not in self.comp_of:
+                    self._new_component(node)
+        self._log_pos = log.end
+        log.consume(self, log.end)
+        self._graph_version = graph_version(g)
+
+    def __len__(self) -> int:
+        return len(self.comp_of)
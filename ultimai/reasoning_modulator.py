@@ -4,25 +4,37 @@ This module implements a simple memetic algorithm that mutates node scores
 and occasionally adds new relations between nodes.  A critic is used to
 evaluate candidate graphs, and improvements are retained.  The algorithm
 operates on a single reasoning graph instance.
+
+``run`` counts the candidates it scores, the ones it accepts and its
+critic calls in ``stats`` and reports them, with the critic call rate,
+to the engine's instrumentation (see ``ultimai.instrumentation``).
 """
 
 from __future__ import annotations
 
 import copy
 import random
-from typing import Tuple
+import time
+from typing import Any, Dict, Optional
 
 from .graph import ReasoningGraph
 from .critic import Critic
+from .instrumentation import NULL
 from .utils import clamp
 
 
 class MemeticEngine:
     """Run memetic evolution on a reasoning graph."""
 
-    def __init__(self, graph: ReasoningGraph) -> None:
+    def __init__(self, graph: ReasoningGraph, instrumentation: Optional[Any] = None) -> None:
         self.graph = graph
         self.critic = Critic()
+        self.instrumentation = instrumentation or NULL
+        self.stats: Dict[str, int] = {"candidates": 0, "accepted": 0, "critic_calls": 0}
+
+    def _evaluate(self, g: ReasoningGraph) -> float:
+        self.stats["critic_calls"] += 1
+        return self.critic.evaluate_graph(g)
 
     def _mutate(self, g: ReasoningGraph) -> ReasoningGraph:
         new_graph = copy.deepcopy(g)
@@ -43,23 +55,40 @@ class MemeticEngine:
 
     def _local_search(self, g: ReasoningGraph, iterations: int = 5) -> ReasoningGraph:
         best_graph = copy.deepcopy(g)
-        best_score = self.critic.evaluate_graph(best_graph)
+        best_score = self._evaluate(best_graph)
         for _ in range(iterations):
             candidate = self._mutate(best_graph)
-            cand_score = self.critic.evaluate_graph(candidate)
+            cand_score = self._evaluate(candidate)
+            self.stats["candidates"] += 1
             if cand_score > best_score:
                 best_graph = candidate
                 best_score = cand_score
+                self.stats["accepted"] += 1
         return best_graph
 
     def run(self, iterations: int = 10) -> None:
-        current_graph = copy.deepcopy(self.graph)
-        current_score = self.critic.evaluate_graph(current_graph)
-        for _ in range(iterations):
-            mutated = self._mutate(current_graph)
-            improved = self._local_search(mutated)
-            improved_score = self.critic.evaluate_graph(improved)
-            if improved_score > current_score:
-                current_graph = improved
-                current_score = improved_score
-        self.graph.graph = current_graph.graph
\ No newline at end of file
+        self.stats = dict.fromkeys(self.stats, 0)
+        started = time.perf_counter()
+        with self.instrumentation.span("memetic.evolve", self.graph):
+            current_graph = copy.deepcopy(self.graph)
+            current_score = self._evaluate(current_graph)
+            for _ in range(iterations):
+                mutated = self._mutate(current_graph)
+                improved = self._local_search(mutated)
+                improved_score = self._evaluate(improved)
+                self.stats["candidates"] += 1
+                if improved_score > current_score:
+                    current_graph = improved
+                    current_score = improved_score
+                    self.stats["accepted"] += 1
+        elapsed = time.perf_counter() - started
+        instr = self.instrumentation
+        instr.count("memetic_candidates_evaluated", self.stats["candidates"])
+        instr.count("memetic_candidates_accepted", self.stats["accepted"])
+        instr.count("memetic_critic_calls", self.stats["critic_calls"])
+        if elapsed > 0:
+            instr.gauge("memetic_critic_calls_per_second", self.stats["critic_calls"] / elapsed)
+        # Publishing swaps the result in atomically (or writes it back into
+        # storage engines such as SQLiteDiGraph), so snapshots taken during
+        # the run stay consistent.
+        self.graph.publish(current_graph.graph)
\ No newline at end of file
@@ -0,0 +1,159 @@
+"""Built-in SVG and PNG renderers for reasoning graphs.
+
+These writers need neither matplotlib nor Graphviz.  Positions come
+from ``ultimai.layout.force_layout`` unless given.  ``write_svg``
+streams one element per line to the output file; ``write_png``
+rasterises into a byte buffer and encodes it with ``zlib``.  Nodes are
+coloured by ``score`` from red (0) to green (1), grey when unscored,
+and quarantined nodes get a dark outline in SVG output.  Super-nodes of
+a level-of-detail summary (see ``ultimai.lod``) grow with their
+``size``.  Labels are only drawn in SVG, and only for small graphs.
+"""
+
+from __future__ import annotations
+
+import math
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from .layout import Position, force_layout
+
+Colour = Tuple[int, int, int]
+
+EDGE_COLOUR: Colour = (190, 190, 190)
+UNSCORED_COLOUR: Colour = (150, 150, 150)
+RENDER_SUFFIXES = (".svg", ".png")
+
+
+def score_colour(attrs: Dict[str, Any]) -> Colour:
+    score = attrs.get("score")
+    if not isinstance(score, (int, float)):
+        return UNSCORED_COLOUR
+    s = min(1.0, max(0.0, float(score)))
+    return int(220 * (1 - s)), int(180 * s), 60
+
+
+def node_radius_for(attrs: Dict[str, Any], base: float) -> float:
+    size = attrs.get("size")
+    if isinstance(size, int) and size > 1:
+        return base * (1.0 + math.log10(size))
+    return base
+
+
+def _attrs(g: Any) -> Any:
+    return getattr(g, "nodes_attr", None) or g.nodes
+
+
+def _scaler(pos: Dict[Any, Position], width: int, height: int, margin: int):
+    xs = [p[0] for p in pos.values()] or [0.0]
+    ys = [p[1] for p in pos.values()] or [0.0]
+    x0, y0 = min(xs), min(ys)
+    span = max(max(xs) - x0, max(ys) - y0, 1e-9)
+    scale = min(width - 2 * margin, height - 2 * margin) / span
+
+    def to_px(p: Position) -> Tuple[float, float]:
+        return margin + (p[0] - x0) * scale, margin + (p[1] - y0) * scale
+
+    return to_px
+
+
+def _escape(text: Any) -> str:
+    return (str(text).replace("&", "&amp;").replace("<", "&lt;")
+            .replace(">", "&gt;").replace('"', "&quot;"))
+
+
+def write_svg(g: Any, path: Path, pos: Optional[Dict[Any, Position]] = None,
+              width: int = 1200, height: int = 1200, node_radius: float = 3.0,
+              max_labels: int = 300) -> None:
+    """Write ``g`` as an SVG image; labels are drawn when there are at most ``max_labels`` nodes."""
+    pos = pos if pos is not None else force_layout(g)
+    to_px = _scaler(pos, width, height, margin=20)
+    px = {n: to_px(p) for n, p in pos.items()}
+    attrs = _attrs(g)
+    labels = len(px) <= max_labels
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                f'viewBox="0 0 {width} {height}">\n')
+        f.write('<rect width="100%" height="100%" fill="white"/>\n')
+        f.write('<g stroke="rgb(%d,%d,%d)" stroke-width="0.6">\n' % EDGE_COLOUR)
+        for u, nbrs in g.adj.items():
+            if u not in px:
+                continue
+            x1, y1 = px[u]
+            for v in nbrs:
+                if v in px:
+                    x2, y2 = px[v]
+                    f.write(f'<line x1="{x1:.1f}" y1="{y1:.1f}" x2="{x2:.1f}" y2="{y2:.1f}"/>\n')
+        f.write('</g>\n<g font-family="sans-serif" font-size="9">\n')
+        for n, (x, y) in px.items():
+            a = attrs[n]
+            stroke = ' stroke="black"' if a.get("quarantined") else ""
+            r = node_radius_for(a, node_radius)
+            f.write(f'<circle cx="{x:.1f}" cy="{y:.1f}" r="{r:.1f}" '
+                    f'fill="rgb({",".join(map(str, score_colour(a)))})"{stroke}>'
+                    f'<title>{_escape(a.get("label", n))}</title></circle>\n')
+            if labels:
+                f.write(f'<text x="{x + r + 1:.1f}" y="{y + 3:.1f}">'
+                        f'{_escape(a.get("label", n))}</text>\n')
+        f.write('</g>\n</svg>\n')
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return (struct.pack(">I", len(data)) + kind + data
+            + struct.pack(">I", zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+
+def write_png(g: Any, path: Path, pos: Optional[Dict[Any, Position]] = None,
+              width: int = 1200, height: int = 1200, node_radius: int = 2) -> None:
+    """Rasterise ``g`` into an RGB PNG image."""
+    pos = pos if pos is not None else force_layout(g)
+    to_px = _scaler(pos, width, height, margin=node_radius + 2)
+    px = {n: to_px(p) for n, p in pos.items()}
+    attrs = _attrs(g)
+    row = width * 3
+    canvas = bytearray(b"\xff" * (row * height))
+    edge = bytes(EDGE_COLOUR)
+    for u, nbrs in g.adj.items():
+        if u not in px:
+            continue
+        x1, y1 = px[u]
+        for v in nbrs:
+            if v not in px:
+                continue
+            x2, y2 = px[v]
+            steps = int(max(abs(x2 - x1), abs(y2 - y1))) + 1
+            sx, sy = (x2 - x1) / steps, (y2 - y1) / steps
+            x, y = x1, y1
+            for _ in range(steps + 1):
+                i = int(y) * row + int(x) * 3
+                canvas[i:i + 3] = edge
+                x += sx
+                y += sy
+    for n, (x, y) in px.items():
+        colour = bytes(score_colour(attrs[n]))
+        cx, cy = int(x), int(y)
+        r = int(node_radius_for(attrs[n], node_radius))
+        span = colour * (2 * r + 1)
+        for yy in range(max(0, cy - r), min(height, cy + r + 1)):
+            start = max(0, cx - r)
+            stop = min(width, cx + r + 1)
+            canvas[yy * row + start * 3:yy * row + stop * 3] = span[:(stop - start) * 3]
+    raw = b"".join(b"\x00" + bytes(canvas[y * row:(y + 1) * row]) for y in range(height))
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)))
+        f.write(_png_chunk(b"IDAT", zlib.compress(raw, 6)))
+        f.write(_png_chunk(b"IEND", b""))
+
+
+def render(g: Any, path: Path, pos: Optional[Dict[Any, Position]] = None, **kwargs: Any) -> Path:
+    """Render ``g`` to ``path`` as SVG or PNG, chosen by the suffix."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix not in RENDER_SUFFIXES:
+        raise ValueError(f"unsupported image format {suffix!r}; expected one of {RENDER_SUFFIXES}")
+    writer = write_svg if suffix == ".svg" else write_png
+    writer(g, path, pos, **kwargs)
+    return path
@@ -0,0 +1,170 @@
+"""Inverted index for finding concepts by label, source or type.
+
+``ConceptIndex`` maps lower-cased word tokens of the ``label``,
+``source`` and ``type`` attributes to the nodes that contain them.  A
+query is split into terms and every term must match (AND semantics),
+either exactly or, with ``prefix=True``, as a prefix of an indexed
+token; prefixes are resolved by binary search over a sorted vocabulary.
+New and removed tokens are batched and the vocabulary is re-sorted on
+the next prefix query, so building or updating the index stays
+O(n log n) however the additions and queries interleave.
+Results can be ranked by node ``score``.
+
+The index is kept up to date by ``ReasoningGraph.add_node`` once
+``ReasoningGraph.enable_search_index`` has been called.  Attribute
+changes made directly on ``graph.nodes[n]`` are not seen until the node
+is re-added or the index rebuilt.
+"""
+
+from __future__ import annotations
+
+import heapq
+import re
+from bisect import bisect_left
+from itertools import groupby
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+FIELDS: Tuple[str, ...] = ("label", "source", "type")
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text: Any) -> List[str]:
+    """Split ``text`` into lower-cased word tokens; non-strings give none."""
+    if not isinstance(text, str):
+        return []
+    return _TOKEN.findall(text.lower())
+
+
+class ConceptIndex:
+    """Token-level inverted index over node attributes."""
+
+    def __init__(self, fields: Sequence[str] = FIELDS) -> None:
+        self.fields = tuple(fields)
+        self._postings: Dict[str, Dict[str, Set[Any]]] = {f: {} for f in self.fields}
+        # Sorted tokens of each field, plus tokens added since the last
+        # sort and the fields that lost tokens; see ``_sorted_vocab``.
+        self._vocab: Dict[str, List[str]] = {f: [] for f in self.fields}
+        self._pending: Dict[str, List[str]] = {f: [] for f in self.fields}
+        self._removed: Set[str] = set()
+        self._doc_tokens: Dict[Any, Dict[str, Set[str]]] = {}
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "ConceptIndex":
+        # Node ids and tokens are immutable, so only the containers are
+        # copied; this is much cheaper than a generic deep copy.
+        index = ConceptIndex.__new__(ConceptIndex)
+        memo[id(self)] = index
+        index.fields = self.fields
+        index._postings = {f: {t: set(nodes) for t, nodes in postings.items()}
+                           for f, postings in self._postings.items()}
+        index._vocab = {f: list(v) for f, v in self._vocab.items()}
+        index._pending = {f: list(v) for f, v in self._pending.items()}
+        index._removed = set(self._removed)
+        index._doc_tokens = {n: {f: set(t) for f, t in doc.items()}
+                             for n, doc in self._doc_tokens.items()}
+        return index
+
+    def __len__(self) -> int:
+        return len(self._doc_tokens)
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    def add(self, node: Any, attrs: Dict[str, Any]) -> None:
+        """Index ``node`` with ``attrs``, replacing any earlier entry."""
+        self.remove(node)
+        doc: Dict[str, Set[str]] = {}
+        for field in self.fields:
+            tokens = set(tokenize(attrs.get(field)))
+            if not tokens:
+                continue
+            doc[field] = tokens
+            postings = self._postings[field]
+            for token in tokens:
+                nodes = postings.get(token)
+                if nodes is None:
+                    nodes = postings[token] = set()
+                    self._pending[field].append(token)
+                nodes.add(node)
+        self._doc_tokens[node] = doc
+
+    def remove(self, node: Any) -> None:
+        doc = self._doc_tokens.pop(node, None)
+        if not doc:
+            return
+        for field, tokens in doc.items():
+            postings = self._postings[field]
+            for token in tokens:
+                nodes = postings[token]
+                nodes.discard(node)
+                if not nodes:
+                    del postings[token]
+                    self._removed.add(field)
+
+    def build(self, items: Iterable[Tuple[Any, Dict[str, Any]]]) -> None:
+        """Index every ``(node, attrs)`` pair; the vocabulary is sorted once, on first use."""
+        for node, attrs in items:
+            self.add(node, attrs)
+
+    def _sorted_vocab(self, field: str) -> List[str]:
+        vocab = self._vocab[field]
+        pending = self._pending[field]
+        if pending or field in self._removed:
+            # Timsort merges the sorted run with the sorted batch in
+            # O(V + P log P).  A token removed and added again before the
+            # sort appears twice, so dropping removed tokens also dedups.
+            vocab = sorted(vocab + sorted(pending))
+            if field in self._removed:
+                postings = self._postings[field]
+                vocab = [t for t, _ in groupby(vocab) if t in postings]
+                self._removed.discard(field)
+            self._vocab[field] = vocab
+            self._pending[field] = []
+        return vocab
+
+    # ------------------------------------------------------------------
+    # Queries
+    def _term(self, term: str, fields: Sequence[str], prefix: bool) -> Set[Any]:
+        matches: Set[Any] = set()
+        for field in fields:
+            postings = self._postings[field]
+            if not prefix:
+                matches |= postings.get(term, set())
+                continue
+            vocab = self._sorted_vocab(field)
+            i = bisect_left(vocab, term)
+            while i < len(vocab) and vocab[i].startswith(term):
+                matches |= postings[vocab[i]]
+                i += 1
+        return matches
+
+    def search(self, query: str, fields: Optional[Sequence[str]] = None, prefix: bool = False,
+               limit: Optional[int] = None, scores: Optional[Dict[Any, Any]] = None) -> List[Any]:
+        """Return nodes matching every term of ``query``.
+
+        ``fields`` restricts the attributes searched.  With ``scores`` (a
+        mapping or callable from node to score) the best-scored nodes come
+        first; otherwise results are sorted by node id.
+        """
+        fields = self.fields if fields is None else tuple(fields)
+        terms = tokenize(query)
+        if not terms:
+            return []
+        # Intersect the rarest terms first so the candidate set stays small.
+        sets = sorted((self._term(t, fields, prefix) for t in terms), key=len)
+        result = set(sets[0])
+        for other in sets[1:]:
+            if not result:
+                break
+            result &= other
+        if scores is not None:
+            get = scores if callable(scores) else scores.get
+
+            def key(n: Any) -> float:
+                s = get(n)
+                return float("-inf") if s is None else s
+
+            if limit is not None:
+                return heapq.nlargest(limit, result, key=key)
+            return sorted(result, key=key, reverse=True)
+        ordered = sorted(result, key=str)
+        return ordered if limit is None else ordered[:limit]
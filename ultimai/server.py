@@ -0,0 +1,387 @@
+"""Asyncio query server over a resident reasoning graph.
+
+``GraphServer`` loads a ``ReasoningGraph`` once and answers queries
+over a local TCP or Unix socket, so interactive callers do not pay the
+graph load time on every call.  The protocol is newline-delimited JSON:
+each request is one object with an ``op`` name, an optional ``id`` that
+is echoed back and the operation's parameters::
+
+    {"id": 1, "op": "path", "start": "A", "end": "E", "weighted": true}
+    {"id": 1, "ok": true, "result": ["A", "C", "D", "E"]}
+
+Failed requests get ``{"ok": false, "error": "..."}``.  Operations are
+looked up in ``HANDLERS``; ``register`` adds new ones.  A handler may
+also return an awaitable, which is awaited.  Handlers marked
+``heavy`` (audits, betweenness, PageRank, multi-hop neighbourhoods,
+k-shortest, weighted or unbounded paths on large graphs, and a search
+that first has to build its index) run in a thread pool so the event
+loop keeps serving cheap lookups meanwhile; ``heavy`` may be a predicate
+on the graph and request for operations that are only sometimes
+expensive.  Heavy handlers read a snapshot unless registered with
+``snapshot=False``.  At most
+``max_concurrency`` requests are executed at a time and the latency of
+every operation is recorded; the ``metrics`` operation reports counts
+and percentiles.
+
+Run ``python -m ultimai.server graph.json --port 8765`` (or
+``--unix PATH``) to serve a saved graph; ``request`` is a small
+blocking client.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import json
+import socket
+import time
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple, Union
+
+from .critic import Critic
+from .graph import ReasoningGraph
+from . import explainability
+
+Handler = Callable[[ReasoningGraph, Dict[str, Any]], Any]
+Heavy = Union[bool, Callable[[ReasoningGraph, Dict[str, Any]], bool]]
+Address = Union[str, Tuple[str, int]]
+
+# op name -> (handler, heavy, snapshot)
+HANDLERS: Dict[str, Tuple[Handler, Heavy, bool]] = {}
+
+# Graphs up to this many nodes answer a single path query quickly enough
+# to stay on the event loop however it is bounded.
+INLINE_NODES = 10_000
+
+STREAM_LIMIT = 16 * 1024 * 1024
+
+
+def register(op: str, heavy: Heavy = False,
+             snapshot: bool = True) -> Callable[[Handler], Handler]:
+    """Register ``handler(rg, request)`` as the implementation of ``op``.
+
+    ``heavy`` is a flag or a function ``heavy(rg, request)`` telling
+    whether the handler runs in the thread pool, on a snapshot of the
+    graph unless ``snapshot`` is false.
+    """
+    def decorator(handler: Handler) -> Handler:
+        HANDLERS[op] = (handler, heavy, snapshot)
+        return handler
+    return decorator
+
+
+class RequestError(Exception):
+    """A request that cannot be answered; reported to the client as an error."""
+
+
+def _param(request: Dict[str, Any], name: str) -> Any:
+    try:
+        return request[name]
+    except KeyError:
+        raise RequestError(f"missing parameter {name!r}") from None
+
+
+def _node(rg: ReasoningGraph, request: Dict[str, Any], name: str) -> str:
+    node = _param(request, name)
+    if not rg.graph.has_node(node):
+        raise RequestError(f"unknown node {node!r}")
+    return node
+
+
+def _multi_k(rg: ReasoningGraph, request: Dict[str, Any]) -> bool:
+    # k > 1 asks for a multi-hop neighbourhood or k-shortest paths.
+    return int(request.get("k", 1)) > 1
+
+
+def _path_cost(rg: ReasoningGraph, request: Dict[str, Any]) -> bool:
+    if _multi_k(rg, request):
+        return True
+    if rg.graph.number_of_nodes() <= INLINE_NODES:
+        return False
+    # Dijkstra/A* and unbounded searches may visit the whole graph.
+    return bool(request.get("weighted", False)) or request.get("max_depth") is None
+
+
+def _index_missing(rg: ReasoningGraph, request: Dict[str, Any]) -> bool:
+    return rg.search_index is None
+
+
+@register("neighbors", heavy=_multi_k)
+def _neighbors(rg: ReasoningGraph, request: Dict[str, Any]) -> List[str]:
+    node = _node(rg, request, "node")
+    k = int(request.get("k", 1))
+    direction = request.get("direction", "out")
+    if k == 1 and direction == "out" and request.get("relations") is None:
+        return rg.get_neighbors(node)
+    view = rg.neighbourhood(node, k, direction, request.get("relations"))
+    return [n for n in view.graph.nodes if n != node]
+
+
+@register("path", heavy=_path_cost)
+def _path(rg: ReasoningGraph, request: Dict[str, Any]) -> Any:
+    start = _param(request, "start")
+    end = _param(request, "end")
+    weighted = bool(request.get("weighted", False))
+    max_depth = request.get("max_depth")
+    k = int(request.get("k", 1))
+    if k > 1:
+        return explainability.get_justification_paths(rg, start, end, k=k, weighted=weighted,
+                                                      max_depth=max_depth)
+    return explainability.get_justification_path(rg, start, end, weighted=weighted,
+                                                 max_depth=max_depth)
+
+
+@register("summary")
+def _summary(rg: ReasoningGraph, request: Dict[str, Any]) -> str:
+    return explainability.summarise_concept(rg, _param(request, "node"))
+
+
+# The first search builds the index on the live graph, where later
+# searches find it; that is cheap to do once, so no snapshot is taken.
+@register("search", heavy=_index_missing, snapshot=False)
+def _search(rg: ReasoningGraph, request: Dict[str, Any]) -> List[str]:
+    return explainability.find_concepts(rg, _param(request, "query"),
+                                        limit=int(request.get("limit", 10)))
+
+
+@register("audit", heavy=True)
+def _audit(rg: ReasoningGraph, request: Dict[str, Any]) -> Dict[str, Any]:
+    return Critic().audit_graph(rg)
+
+
+CENTRALITY = {
+    "degree": ReasoningGraph.degree_centrality,
+    "betweenness": ReasoningGraph.compute_betweenness_centrality,
+    "pagerank": ReasoningGraph.compute_pagerank,
+}
+
+
+@register("centrality", heavy=True)
+def _centrality(rg: ReasoningGraph, request: Dict[str, Any]) -> Any:
+    kind = request.get("kind", "degree")
+    if kind not in CENTRALITY:
+        raise RequestError(f"unknown centrality {kind!r}; expected one of {sorted(CENTRALITY)}")
+    values = CENTRALITY[kind](rg)
+    top = request.get("top")
+    if top is None:
+        return values
+    return sorted(values.items(), key=lambda kv: kv[1], reverse=True)[:int(top)]
+
+
+@register("stats")
+def _stats(rg: ReasoningGraph, request: Dict[str, Any]) -> Dict[str, int]:
+    return {"num_nodes": rg.graph.number_of_nodes(), "num_edges": rg.graph.number_of_edges()}
+
+
+class LatencyStats:
+    """Per-operation request counts, errors and latency percentiles.
+
+    Only the most recent ``window`` samples of each operation are kept
+    for the percentiles.
+    """
+
+    def __init__(self, window: int = 1024) -> None:
+        self.window = window
+        self._samples: Dict[str, Deque[float]] = {}
+        self.counts: Dict[str, int] = {}
+        self.errors: Dict[str, int] = {}
+
+    def record(self, op: str, seconds: float, ok: bool = True) -> None:
+        samples = self._samples.get(op)
+        if samples is None:
+            samples = self._samples[op] = deque(maxlen=self.window)
+        samples.append(seconds)
+        self.counts[op] = self.counts.get(op, 0) + 1
+        if not ok:
+            self.errors[op] = self.errors.get(op, 0) + 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Return ``{op: {count, errors, p50_ms, p95_ms, p99_ms, max_ms}}``."""
+        out: Dict[str, Dict[str, float]] = {}
+        for op, samples in self._samples.items():
+            ordered = sorted(samples)
+            last = len(ordered) - 1
+
+            def pct(q: float) -> float:
+                return round(ordered[min(last, int(q * len(ordered)))] * 1000.0, 3)
+
+            out[op] = {
+                "count": self.counts[op],
+                "errors": self.errors.get(op, 0),
+                "p50_ms": pct(0.50),
+                "p95_ms": pct(0.95),
+                "p99_ms": pct(0.99),
+                "max_ms": round(ordered[-1] * 1000.0, 3),
+            }
+        return out
+
+
+class GraphServer:
+    """Serve newline-JSON queries against a resident ``ReasoningGraph``."""
+
+    def __init__(self, graph: Optional[ReasoningGraph] = None, max_concurrency: int = 64,
+                 executor: Optional[Executor] = None,
+                 handlers: Optional[Dict[str, Tuple[Handler, Heavy, bool]]] = None) -> None:
+        self.graph = graph if graph is not None else ReasoningGraph()
+        self.handlers = dict(HANDLERS if handlers is None else handlers)
+        self.max_concurrency = max_concurrency
+        self.executor = executor or ThreadPoolExecutor(max_workers=4, thread_name_prefix="ultimai")
+        self.metrics = LatencyStats()
+        self._limit: Optional[asyncio.Semaphore] = None
+        self._servers: List[asyncio.AbstractServer] = []
+        self._connections: Dict[asyncio.StreamWriter, Optional[asyncio.Task]] = {}
+
+    # ------------------------------------------------------------------
+    # Request handling
+    def resolve_graph(self, request: Dict[str, Any]) -> ReasoningGraph:
+        """Return the graph ``request`` is addressed to; subclasses may serve several."""
+        return self.graph
+
+    async def handle_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute one request and return the response object."""
+        op = request.get("op")
+        response: Dict[str, Any] = {}
+        if "id" in request:
+            response["id"] = request["id"]
+        if self._limit is None:
+            self._limit = asyncio.Semaphore(self.max_concurrency)
+        started = time.perf_counter()
+        ok = False
+        try:
+            if op == "metrics":
+                result: Any = self.metrics.snapshot()
+            elif op not in self.handlers:
+                raise RequestError(f"unknown op {op!r}")
+            else:
+                handler, heavy, snapshot = self.handlers[op]
+                async with self._limit:
+                    rg = self.resolve_graph(request)
+                    if heavy(rg, request) if callable(heavy) else heavy:
+                        if snapshot and hasattr(rg.graph, "cow_copy"):
+                            # Long requests read a consistent snapshot while
+                            # writers keep publishing new versions.
+                            rg = rg.snapshot()
+                        loop = asyncio.get_running_loop()
+                        result = await loop.run_in_executor(self.executor, handler, rg, request)
+                    else:
+                        result = handler(rg, request)
+                        if inspect.isawaitable(result):
+                            result = await result
+            response.update(ok=True, result=result)
+            ok = True
+        except RequestError as exc:
+            response.update(ok=False, error=str(exc))
+        except Exception as exc:  # report, keep serving
+            response.update(ok=False, error=f"{type(exc).__name__}: {exc}")
+        self.metrics.record(str(op), time.perf_counter() - started, ok)
+        return response
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter) -> None:
+        self._connections[writer] = asyncio.current_task()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                except ValueError as exc:
+                    response: Dict[str, Any] = {"ok": False, "error": f"bad request: {exc}"}
+                else:
+                    response = await self.handle_request(request)
+                writer.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(writer, None)
+            writer.close()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    async def start(self, host: str = "127.0.0.1", port: int = 8765,
+                    path: Optional[str] = None) -> asyncio.AbstractServer:
+        """Start listening on ``host:port``, or on the Unix socket ``path``."""
+        if path is not None:
+            server = await asyncio.start_unix_server(self._handle_connection, path=path,
+                                                     limit=STREAM_LIMIT)
+        else:
+            server = await asyncio.start_server(self._handle_connection, host, port,
+                                                limit=STREAM_LIMIT)
+        self._servers.append(server)
+        return server
+
+    async def serve_forever(self, host: str = "127.0.0.1", port: int = 8765,
+                            path: Optional[str] = None) -> None:
+        server = await self.start(host, port, path)
+        async with server:
+            await server.serve_forever()
+
+    async def close(self) -> None:
+        for server in self._servers:
+            server.close()
+        # Closing the transports ends each handler's read loop; newer
+        # Pythons also wait for open connections in ``wait_closed``.
+        tasks = [task for task in self._connections.values() if task is not None]
+        for writer in list(self._connections):
+            writer.close()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for server in self._servers:
+            await server.wait_closed()
+        self._servers.clear()
+        self.executor.shutdown(wait=False)
+
+
+def request(address: Address, op: str, timeout: float = 30.0, **params: Any) -> Any:
+    """Send one request to a running server and return its result.
+
+    ``address`` is a Unix socket path or a ``(host, port)`` tuple.
+    Raises ``RuntimeError`` with the server's message on failure.
+    """
+    if isinstance(address, str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(address)
+    else:
+        sock = socket.create_connection(address, timeout=timeout)
+    with sock, sock.makefile("rwb") as stream:
+        stream.write(json.dumps(dict(params, op=op)).encode("utf-8") + b"\n")
+        stream.flush()
+        line = stream.readline()
+    if not line:
+        raise RuntimeError("server closed the connection")
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise RuntimeError(response.get("error", "request failed"))
+    return response.get("result")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve queries against a reasoning graph")
+    parser.add_argument("graph", help="Graph file to load (JSON or SQLite)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", help="Listen on this Unix socket instead of TCP")
+    parser.add_argument("--max-concurrency", type=int, default=64)
+    args = parser.parse_args()
+    rg = ReasoningGraph()
+    rg.load(Path(args.graph))
+    server = GraphServer(rg, max_concurrency=args.max_concurrency)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Serving {rg.graph.number_of_nodes()} nodes on {where}")
+    try:
+        asyncio.run(server.serve_forever(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
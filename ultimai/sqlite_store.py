@@ -0,0 +1,523 @@
+"""SQLite-backed storage engine for reasoning graphs.
+
+``SQLiteDiGraph`` keeps nodes and edges in two tables of a ``sqlite3``
+database and implements the ``DiGraph`` surface used by the critic,
+the quarantine, the memetic engine and the scripts.  Graphs can
+therefore be larger than memory, several processes can read the same
+file (the database runs in WAL mode) and selective queries such as
+``nodes_with_score_below`` are answered from an index.
+
+The connection is shared by the threads of the query server's executor,
+so every statement and the write buffer are guarded by one lock, and
+result rows are fetched before it is released.
+
+Writes are buffered and flushed in one transaction once ``batch_size``
+changes are pending, before any query that scans a table, or when
+``flush`` is called.  Point lookups (``has_node``, ``nodes[n]``,
+``get_edge_data``) see pending writes without forcing a flush.
+
+The node columns ``label``, ``type``, ``source`` and ``score`` mirror
+``NodeData``; other attributes (``metadata``, ``quarantined`` ...) are
+stored as JSON in ``attrs``.  Edges store ``relation`` and ``weight`` in
+columns and any other attributes in ``attrs``.  A column attribute set
+to ``None`` is also recorded in ``attrs``, so that it reads back as
+``None`` while a missing attribute stays missing.
+
+Node ids are stored in untyped (BLOB affinity) columns, so integer and
+string ids keep their SQLite storage class and read back with their
+Python type.  Databases created before this schema declared the id
+columns ``TEXT``, which turns integer ids into strings; rewriting them
+with ``write_sqlite`` upgrades the schema.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+from collections.abc import MutableMapping
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .utils import lazy_import
+
+# NetworkX is loaded on first use; the local stub stands in without it.
+nx = lazy_import("networkx")
+if nx is None:  # pragma: no cover
+    from . import networkx_stub as nx  # type: ignore
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS nodes (
+    id BLOB NOT NULL UNIQUE,
+    label TEXT,
+    type TEXT,
+    source TEXT,
+    score REAL,
+    attrs TEXT NOT NULL DEFAULT '{}'
+);
+CREATE TABLE IF NOT EXISTS edges (
+    source BLOB NOT NULL,
+    target BLOB NOT NULL,
+    relation TEXT,
+    weight REAL,
+    attrs TEXT NOT NULL DEFAULT '{}',
+    UNIQUE (source, target)
+);
+CREATE INDEX IF NOT EXISTS edges_target ON edges (target);
+CREATE INDEX IF NOT EXISTS edges_relation ON edges (relation);
+CREATE INDEX IF NOT EXISTS nodes_score ON nodes (score);
+"""
+
+_NODE_COLUMNS = ("label", "type", "source", "score")
+_EDGE_COLUMNS = ("relation", "weight")
+
+# Rows fetched per round trip when scanning a table.
+_PAGE = 1000
+
+
+def _split(attrs: Dict[str, Any], columns: Tuple[str, ...]) -> Tuple[List[Any], str]:
+    # A NULL column means "missing" unless ``attrs`` records it as None.
+    extra = {k: v for k, v in attrs.items() if k not in columns or v is None}
+    return [attrs.get(c) for c in columns], json.dumps(extra, ensure_ascii=False)
+
+
+def _join(values: Iterable[Any], extra: str, columns: Tuple[str, ...]) -> Dict[str, Any]:
+    attrs = {c: v for c, v in zip(columns, values) if v is not None}
+    attrs.update(json.loads(extra))
+    return attrs
+
+
+class NodeAttributes(MutableMapping):
+    """Attribute dict of one node; assignments are written back to the store."""
+
+    def __init__(self, graph: "SQLiteDiGraph", node: Any, attrs: Dict[str, Any]) -> None:
+        self._graph = graph
+        self._node = node
+        self._attrs = attrs
+
+    def __getitem__(self, key: str) -> Any:
+        return self._attrs[key]
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._attrs[key] = value
+        self._graph._queue_node(self._node, self._attrs)
+
+    def __delitem__(self, key: str) -> None:
+        del self._attrs[key]
+        self._graph._queue_node(self._node, self._attrs)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._attrs)
+
+    def __len__(self) -> int:
+        return len(self._attrs)
+
+    def __repr__(self) -> str:
+        return repr(self._attrs)
+
+
+class _NodeView:
+    def __init__(self, graph: "SQLiteDiGraph") -> None:
+        self._graph = graph
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._graph.nodes_iter())
+
+    def __len__(self) -> int:
+        return self._graph.number_of_nodes()
+
+    def __contains__(self, node: Any) -> bool:
+        return self._graph.has_node(node)
+
+    def __getitem__(self, node: Any) -> NodeAttributes:
+        attrs = self._graph._node_attrs(node)
+        if attrs is None:
+            raise KeyError(node)
+        return NodeAttributes(self._graph, node, attrs)
+
+    def __call__(self, data: bool = False) -> Iterable[Any]:
+        return self._graph.nodes_iter(data=data)
+
+
+class _EdgeView:
+    def __init__(self, graph: "SQLiteDiGraph") -> None:
+        self._graph = graph
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        return self._graph.edges_iter()
+
+    def __len__(self) -> int:
+        return self._graph.number_of_edges()
+
+    def __call__(self, data: bool = False) -> Iterator[Any]:
+        return self._graph.edges_iter(data=data)
+
+
+class _Adjacency:
+    """Mapping from node to a ``{neighbour: attrs}`` dict read from the store."""
+
+    def __init__(self, graph: "SQLiteDiGraph", outgoing: bool) -> None:
+        self._graph = graph
+        self._outgoing = outgoing
+
+    def __getitem__(self, node: Any) -> Dict[Any, Dict[str, Any]]:
+        return self._graph._neighbours(node, self._outgoing)
+
+    def get(self, node: Any, default: Any = None) -> Any:
+        return self[node] if self._graph.has_node(node) else default
+
+    def __contains__(self, node: Any) -> bool:
+        return self._graph.has_node(node)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._graph.nodes_iter())
+
+    def __len__(self) -> int:
+        return self._graph.number_of_nodes()
+
+    def items(self) -> Iterator[Tuple[Any, Dict[Any, Dict[str, Any]]]]:
+        for node in self._graph.nodes_iter():
+            yield node, self[node]
+
+
+class SQLiteDiGraph:
+    """A directed graph stored in an SQLite database."""
+
+    def __init__(self, path: str | Path = ":memory:", batch_size: int = 1000) -> None:
+        self.path = str(path)
+        self.batch_size = batch_size
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        if self.path != ":memory:":
+            self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(_SCHEMA)
+        self._pending_nodes: Dict[Any, Dict[str, Any]] = {}
+        self._pending_edges: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        self._deferred = 0
+        self._lock = threading.RLock()
+
+    def _query(self, sql: str, params: Tuple[Any, ...] = ()) -> List[Tuple[Any, ...]]:
+        """Run one statement under the lock and return all its rows."""
+        with self._lock:
+            return self.conn.execute(sql, params).fetchall()
+
+    def _scalar(self, sql: str, params: Tuple[Any, ...] = ()) -> Any:
+        rows = self._query(sql, params)
+        return rows[0][0] if rows else None
+
+    # ------------------------------------------------------------------
+    # Write buffering
+    def _queue_node(self, node: Any, attrs: Dict[str, Any]) -> None:
+        with self._lock:
+            self._pending_nodes[node] = attrs
+            self._maybe_flush()
+
+    def _maybe_flush(self) -> None:
+        if not self._deferred and len(self._pending_nodes) + len(self._pending_edges) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write all pending changes in a single transaction."""
+        with self._lock:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._pending_nodes and not self._pending_edges:
+            return
+        nodes, self._pending_nodes = self._pending_nodes, {}
+        edges, self._pending_edges = self._pending_edges, {}
+        node_rows = []
+        for node, attrs in nodes.items():
+            values, extra = _split(attrs, _NODE_COLUMNS)
+            node_rows.append((node, *values, extra))
+        edge_rows = []
+        for (u, v), attrs in edges.items():
+            values, extra = _split(attrs, _EDGE_COLUMNS)
+            edge_rows.append((u, v, *values, extra))
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO nodes (id, label, type, source, score, attrs) VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT (id) DO UPDATE SET label = excluded.label, type = excluded.type, "
+                "source = excluded.source, score = excluded.score, attrs = excluded.attrs",
+                node_rows,
+            )
+            self.conn.executemany(
+                "INSERT INTO edges (source, target, relation, weight, attrs) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (source, target) DO UPDATE SET relation = excluded.relation, "
+                "weight = excluded.weight, attrs = excluded.attrs",
+                edge_rows,
+            )
+
+    @contextmanager
+    def batch(self) -> Iterator["SQLiteDiGraph"]:
+        """Defer flushing until the block exits, then commit once."""
+        with self._lock:
+            self._deferred += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                self._deferred -= 1
+                if not self._deferred:
+                    self._flush()
+
+    def clear(self) -> None:
+        """Remove all nodes and edges."""
+        with self._lock, self.conn:
+            self._pending_nodes.clear()
+            self._pending_edges.clear()
+            self.conn.execute("DELETE FROM edges")
+            self.conn.execute("DELETE FROM nodes")
+
+    def reset(self) -> None:
+        """Drop and recreate the tables, upgrading an older schema."""
+        with self._lock:
+            self._pending_nodes.clear()
+            self._pending_edges.clear()
+            self.conn.executescript("DROP TABLE IF EXISTS edges; DROP TABLE IF EXISTS nodes;"
+                                    + _SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self.conn.close()
+
+    # ------------------------------------------------------------------
+    # Point lookups
+    def _node_attrs(self, node: Any) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            pending = self._pending_nodes.get(node)
+            if pending is not None:
+                return pending
+            rows = self._query(
+                "SELECT label, type, source, score, attrs FROM nodes WHERE id = ?", (node,))
+        if not rows:
+            return None
+        return _join(rows[0][:4], rows[0][4], _NODE_COLUMNS)
+
+    def _neighbours(self, node: Any, outgoing: bool) -> Dict[Any, Dict[str, Any]]:
+        self.flush()
+        if outgoing:
+            sql = "SELECT target, relation, weight, attrs FROM edges WHERE source = ? ORDER BY rowid"
+        else:
+            sql = "SELECT source, relation, weight, attrs FROM edges WHERE target = ? ORDER BY rowid"
+        return {r[0]: _join(r[1:3], r[3], _EDGE_COLUMNS) for r in self._query(sql, (node,))}
+
+    # ------------------------------------------------------------------
+    # DiGraph surface
+    def add_node(self, node: Any, **attrs: Any) -> None:
+        with self._lock:
+            current = self._node_attrs(node)
+            merged = dict(current) if current is not None else {}
+            merged.update(attrs)
+            self._queue_node(node, merged)
+
+    def add_edge(self, u: Any, v: Any, **attrs: Any) -> None:
+        with self._lock:
+            if not self.has_node(u):
+                self.add_node(u)
+            if not self.has_node(v):
+                self.add_node(v)
+            self._pending_edges[(u, v)] = dict(attrs)
+            self._maybe_flush()
+
+    def has_node(self, node: Any) -> bool:
+        with self._lock:
+            if node in self._pending_nodes:
+                return True
+            return bool(self._query("SELECT 1 FROM nodes WHERE id = ?", (node,)))
+
+    def __contains__(self, node: Any) -> bool:
+        return self.has_node(node)
+
+    def __len__(self) -> int:
+        return self.number_of_nodes()
+
+    def has_edge(self, u: Any, v: Any) -> bool:
+        return self.get_edge_data(u, v) is not None
+
+    def get_edge_data(self, u: Any, v: Any) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            pending = self._pending_edges.get((u, v))
+            if pending is not None:
+                return dict(pending)
+            rows = self._query(
+                "SELECT relation, weight, attrs FROM edges WHERE source = ? AND target = ?", (u, v))
+        return _join(rows[0][:2], rows[0][2], _EDGE_COLUMNS) if rows else None
+
+    def nodes_iter(self, data: bool = False) -> Iterator[Any]:
+        """Iterate nodes in insertion order, a page of rows at a time."""
+        self.flush()
+        last = 0
+        while True:
+            rows = self._query(
+                "SELECT rowid, id, label, type, source, score, attrs FROM nodes "
+                "WHERE rowid > ? ORDER BY rowid LIMIT ?", (last, _PAGE))
+            if not rows:
+                return
+            for row in rows:
+                yield (row[1], _join(row[2:6], row[6], _NODE_COLUMNS)) if data else row[1]
+            last = rows[-1][0]
+
+    def edges_iter(self, data: bool = False) -> Iterator[Any]:
+        self.flush()
+        last = 0
+        while True:
+            rows = self._query(
+                "SELECT rowid, source, target, relation, weight, attrs FROM edges "
+                "WHERE rowid > ? ORDER BY rowid LIMIT ?", (last, _PAGE))
+            if not rows:
+                return
+            for row in rows:
+                yield (row[1], row[2], _join(row[3:5], row[5], _EDGE_COLUMNS)) if data else (row[1], row[2])
+            last = rows[-1][0]
+
+    @property
+    def nodes(self) -> _NodeView:
+        return _NodeView(self)
+
+    @property
+    def edges(self) -> _EdgeView:
+        return _EdgeView(self)
+
+    @property
+    def adj(self) -> _Adjacency:
+        return _Adjacency(self, outgoing=True)
+
+    @property
+    def pred(self) -> _Adjacency:
+        return _Adjacency(self, outgoing=False)
+
+    def degree(self) -> Iterator[Tuple[Any, int]]:
+        self.flush()
+        rows = self._query(
+            "SELECT n.id, (SELECT COUNT(*) FROM edges WHERE source = n.id) "
+            "+ (SELECT COUNT(*) FROM edges WHERE target = n.id) FROM nodes n ORDER BY n.rowid")
+        for node, deg in rows:
+            yield (node, deg)
+
+    def out_degree(self, n: Any) -> int:
+        self.flush()
+        return self._scalar("SELECT COUNT(*) FROM edges WHERE source = ?", (n,))
+
+    def in_degree(self, n: Any) -> int:
+        self.flush()
+        return self._scalar("SELECT COUNT(*) FROM edges WHERE target = ?", (n,))
+
+    def neighbors(self, n: Any) -> List[Any]:
+        return list(self._neighbours(n, outgoing=True))
+
+    def successors(self, n: Any) -> Iterator[Any]:
+        return iter(self.neighbors(n))
+
+    def predecessors(self, n: Any) -> Iterator[Any]:
+        return iter(self._neighbours(n, outgoing=False))
+
+    def number_of_nodes(self) -> int:
+        self.flush()
+        return self._scalar("SELECT COUNT(*) FROM nodes")
+
+    def number_of_edges(self) -> int:
+        self.flush()
+        return self._scalar("SELECT COUNT(*) FROM edges")
+
+    # ------------------------------------------------------------------
+    # Queries pushed down into SQL
+    def _nodes_by_score(self, op: str, threshold: float, missing: Optional[float]) -> List[Any]:
+        # Nodes without a ``score`` attribute count as ``missing``; nodes
+        # whose score is None never match.  Both branches use the index.
+        self.flush()
+        rows = self._query(
+            f"SELECT id FROM nodes WHERE score {op} ? OR (score IS NULL "
+            f"AND json_type(attrs, '$.score') IS NULL AND ? {op} ?) ORDER BY rowid",
+            (threshold, missing, threshold))
+        return [r[0] for r in rows]
+
+    def nodes_with_score_below(self, threshold: float, missing: Optional[float] = 0.5) -> List[Any]:
+        """Return ids of nodes whose score is below ``threshold``.
+
+        A node without a score counts as ``missing`` (0.5, as in
+        ``Quarantine.evaluate``); a score of None never matches.
+        """
+        return self._nodes_by_score("<", threshold, missing)
+
+    def nodes_with_score_at_least(self, threshold: float, missing: Optional[float] = 0.0) -> List[Any]:
+        """Return ids of nodes whose score is at least ``threshold``.
+
+        A node without a score counts as ``missing`` (0.0, as in
+        ``Quarantine.reintegrate``); a score of None never matches.
+        """
+        return self._nodes_by_score(">=", threshold, missing)
+
+    def edges_with_relation(self, relation: str) -> List[Tuple[Any, Any]]:
+        self.flush()
+        rows = self._query(
+            "SELECT source, target FROM edges WHERE relation = ? ORDER BY rowid", (relation,))
+        return [(u, v) for u, v in rows]
+
+    # ------------------------------------------------------------------
+    # Copies
+    def subgraph(self, nodes: Iterable[Any]) -> Any:
+        """Return an in-memory graph induced on ``nodes``."""
+        sg = nx.DiGraph()
+        node_set = set()
+        for n in nodes:
+            attrs = self._node_attrs(n)
+            if attrs is not None:
+                sg.add_node(n, **attrs)
+                node_set.add(n)
+        for u in node_set:
+            for v, attrs in self._neighbours(u, outgoing=True).items():
+                if v in node_set:
+                    sg.add_edge(u, v, **attrs)
+        return sg
+
+    def copy(self) -> "SQLiteDiGraph":
+        """Return an independent in-memory copy of the database."""
+        clone = SQLiteDiGraph(":memory:", batch_size=self.batch_size)
+        with self._lock:
+            self._flush()
+            self.conn.backup(clone.conn)
+        return clone
+
+    def backup_to(self, path: str | Path) -> None:
+        """Replace the database at ``path`` with a consistent copy of this one.
+
+        The copy is made page by page with the SQLite backup API, so the
+        graph is never loaded into memory and readers of this database
+        see no intermediate state.
+        """
+        target = sqlite3.connect(str(path))
+        try:
+            with self._lock:
+                self._flush()
+                self.conn.backup(target)
+        finally:
+            target.close()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "SQLiteDiGraph":
+        return self.copy()
+
+    def restore_from(self, other: "SQLiteDiGraph") -> None:
+        """Replace the contents of this database with those of ``other``."""
+        with self._lock, other._lock:
+            other._flush()
+            self._pending_nodes.clear()
+            self._pending_edges.clear()
+            other.conn.backup(self.conn)
+
+
+def write_sqlite(g: Any, path: str | Path, batch_size: int = 10_000) -> SQLiteDiGraph:
+    """Copy graph ``g`` into the SQLite database at ``path``, replacing its contents."""
+    store = SQLiteDiGraph(path, batch_size=batch_size)
+    store.reset()
+    for node, attrs in g.nodes(data=True):
+        store._pending_nodes[node] = dict(attrs)
+        if len(store._pending_nodes) >= batch_size:
+            store.flush()
+    for u, v, attrs in g.edges(data=True):
+        store._pending_edges[(u, v)] = dict(attrs)
+        if len(store._pending_edges) >= batch_size:
+            store.flush()
+    store.flush()
+    return store
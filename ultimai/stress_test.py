@@ -5,15 +5,34 @@ ReasoningGraph.  It generates a small random graph, runs the memetic
 algorithm and quarantine, and returns basic metrics.  It can be used
 from tests and from the CI pipeline to ensure the system behaves
 predictably under load.
+
+``run_load_test`` is a load generator for sizing hardware.  Each of
+``concurrency`` worker processes builds a seeded synthetic graph (see
+``ultimai.bench.generators``) with the configured size, density and
+score distribution and runs reasoning cycles (critic evaluation,
+memetic evolution, quarantine and audit) until ``duration`` seconds
+have passed.  The result reports cycles and critic evaluations per
+second and per-stage latency percentiles as a JSON-ready dict::
+
+    python -m ultimai.stress_test --nodes 10000 --concurrency 4 --duration 60 --output load.json
 """
 
 from __future__ import annotations
 
+import argparse
+import json
 import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from .graph import ReasoningGraph, NodeData
+from .critic import Critic
+from .instrumentation import Recorder
 from .reasoning_modulator import MemeticEngine
 from .quarantine import Quarantine
+from .utils import clamp
 
 
 def run_stress_test(iterations: int = 3, threshold: float = 0.3) -> dict:
@@ -41,4 +60,182 @@ def run_stress_test(iterations: int = 3, threshold: float = 0.3) -> dict:
         "num_edges": rg.graph.number_of_edges(),
         "quarantined": len(quarantined),
         "reintegrated": len(reintegrated),
-    }
\ No newline at end of file
+    }
+
+SCORE_DISTRIBUTIONS: Dict[str, Callable[[random.Random], float]] = {
+    "uniform": lambda rng: rng.random(),
+    "normal": lambda rng: clamp(rng.gauss(0.5, 0.15), 0.0, 1.0),
+    # Skewed towards low scores, so many nodes end up quarantined.
+    "low": lambda rng: rng.betavariate(2, 5),
+    "bimodal": lambda rng: clamp(rng.gauss(rng.choice((0.2, 0.8)), 0.05), 0.0, 1.0),
+}
+
+LOAD_STAGES = ("evaluate", "memetic", "quarantine", "audit")
+
+
+@dataclass
+class LoadConfig:
+    nodes: int = 1000
+    # Mean total degree (edges per node times two) and graph shape, see
+    # ``ultimai.bench.generators``.
+    avg_degree: float = 4.0
+    generator: str = "er"
+    scores: str = "uniform"
+    memetic_iterations: int = 1
+    quarantine_threshold: float = 0.35
+    reintegrate_threshold: float = 0.6
+    concurrency: int = 1
+    duration: float = 10.0
+    # Stop each worker after this many cycles even if time remains.
+    max_cycles: Optional[int] = None
+    seed: int = 0
+
+
+def build_load_graph(config: LoadConfig) -> ReasoningGraph:
+    """Generate the graph described by ``config``, with its score distribution applied."""
+    from .bench.generators import generate_graph
+    try:
+        draw = SCORE_DISTRIBUTIONS[config.scores]
+    except KeyError:
+        raise ValueError(f"unknown score distribution {config.scores!r}; "
+                         f"expected one of {sorted(SCORE_DISTRIBUTIONS)}") from None
+    rg = generate_graph(config.generator, config.nodes, config.seed, config.avg_degree)
+    rng = random.Random(config.seed)
+    for node in list(rg.graph.nodes):
+        rg.graph.nodes[node]["score"] = round(draw(rng), 4)
+    return rg
+
+
+def _load_worker(args: Tuple[LoadConfig, int]) -> Dict[str, Any]:
+    """Run reasoning cycles on a private graph until time runs out (pool worker)."""
+    config, index = args
+    rg = build_load_graph(config)
+    random.seed(config.seed + index)
+    recorder = Recorder()
+    critic = Critic()
+    engine = MemeticEngine(rg, recorder)
+    quarantine = Quarantine(config.quarantine_threshold)
+    cycles = evaluations = 0
+    deadline = time.perf_counter() + config.duration
+    while True:
+        with recorder.span("evaluate"):
+            critic.evaluate_graph(rg)
+        with recorder.span("memetic"):
+            engine.run(config.memetic_iterations)
+        with recorder.span("quarantine"):
+            quarantine.evaluate(rg)
+            quarantine.reintegrate(rg, config.reintegrate_threshold)
+        with recorder.span("audit"):
+            critic.audit_graph(rg)
+        cycles += 1
+        # One evaluation per cycle, one inside the audit, plus the engine's.
+        evaluations += 2 + engine.stats["critic_calls"]
+        if time.perf_counter() >= deadline or (config.max_cycles and cycles >= config.max_cycles):
+            break
+    samples: Dict[str, List[float]] = {stage: [] for stage in LOAD_STAGES}
+    for span in recorder.spans:
+        if span.name in samples:
+            samples[span.name].append(span.wall)
+    return {
+        "cycles": cycles,
+        "critic_evaluations": evaluations,
+        "samples": samples,
+        "num_nodes": rg.graph.number_of_nodes(),
+        "num_edges": rg.graph.number_of_edges(),
+        "quarantined": len(quarantine.quarantined),
+    }
+
+
+def latency_summary(samples: List[float]) -> Dict[str, float]:
+    """Return the count, mean, p50, p95, p99 and max of ``samples`` (seconds) in ms."""
+    ordered = sorted(samples)
+    if not ordered:
+        return {"count": 0}
+    last = len(ordered) - 1
+
+    def pct(q: float) -> float:
+        return round(ordered[min(last, int(q * len(ordered)))] * 1000.0, 3)
+
+    return {
+        "count": len(ordered),
+        "mean_ms": round(sum(ordered) / len(ordered) * 1000.0, 3),
+        "p50_ms": pct(0.50),
+        "p95_ms": pct(0.95),
+        "p99_ms": pct(0.99),
+        "max_ms": round(ordered[-1] * 1000.0, 3),
+    }
+
+
+def run_load_test(config: Optional[LoadConfig] = None) -> Dict[str, Any]:
+    """Run the load test described by ``config`` and return throughput and latency metrics."""
+    config = config or LoadConfig()
+    workers = max(1, config.concurrency)
+    tasks = [(config, i) for i in range(workers)]
+    started = time.perf_counter()
+    if workers == 1:
+        results = [_load_worker(tasks[0])]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_load_worker, tasks))
+    elapsed = time.perf_counter() - started
+    cycles = sum(r["cycles"] for r in results)
+    evaluations = sum(r["critic_evaluations"] for r in results)
+    # Throughput is measured over the cycling time of the workers, not
+    # graph generation and process start-up.
+    busy = max(sum(sum(r["samples"][stage]) for stage in LOAD_STAGES) for r in results)
+    return {
+        "config": asdict(config),
+        "num_nodes": results[0]["num_nodes"],
+        "num_edges": results[0]["num_edges"],
+        "workers": workers,
+        "elapsed_s": round(elapsed, 3),
+        "cycles": cycles,
+        "cycles_per_s": round(cycles / busy, 3) if busy else 0.0,
+        "critic_evaluations": evaluations,
+        "critic_evaluations_per_s": round(evaluations / busy, 3) if busy else 0.0,
+        "quarantined": max(r["quarantined"] for r in results),
+        "stages": {stage: latency_summary([s for r in results for s in r["samples"][stage]])
+                   for stage in LOAD_STAGES},
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate reasoning-cycle load and report throughput")
+    defaults = LoadConfig()
+    parser.add_argument("--nodes", type=int, default=defaults.nodes)
+    parser.add_argument("--avg-degree", type=float, default=defaults.avg_degree,
+                        help="Mean total degree, i.e. twice the edges per node")
+    parser.add_argument("--generator", default=defaults.generator, choices=("er", "scale_free", "clustered"))
+    parser.add_argument("--scores", default=defaults.scores, choices=sorted(SCORE_DISTRIBUTIONS))
+    parser.add_argument("--memetic-iterations", type=int, default=defaults.memetic_iterations)
+    parser.add_argument("--concurrency", type=int, default=defaults.concurrency)
+    parser.add_argument("--duration", type=float, default=defaults.duration, help="Seconds per worker")
+    parser.add_argument("--max-cycles", type=int)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--output", help="Write the JSON result to this file")
+    parser.add_argument("--json", action="store_true", help="Print the JSON result instead of a summary")
+    args = parser.parse_args(argv)
+    config = LoadConfig(nodes=args.nodes, avg_degree=args.avg_degree, generator=args.generator,
+                        scores=args.scores, memetic_iterations=args.memetic_iterations,
+                        concurrency=args.concurrency, duration=args.duration,
+                        max_cycles=args.max_cycles, seed=args.seed)
+    result = run_load_test(config)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+    print(f"{result['num_nodes']} nodes, {result['num_edges']} edges, {result['workers']} worker(s): "
+          f"{result['cycles']} cycles, {result['cycles_per_s']} cycles/s, "
+          f"{result['critic_evaluations_per_s']} critic evaluations/s")
+    for stage, stats in result["stages"].items():
+        if stats["count"]:
+            print(f"  {stage:<11} p50 {stats['p50_ms']:>9.3f} ms  p95 {stats['p95_ms']:>9.3f} ms  "
+                  f"p99 {stats['p99_ms']:>9.3f} ms  max {stats['max_ms']:>9.3f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
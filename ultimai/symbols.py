@@ -0,0 +1,136 @@
+"""Shared symbol table for strings that repeat across a reasoning graph.
+
+Relations (``influences``, ``contradicts`` ...), node types and source
+file names take a handful of distinct values but are stored on every
+edge and node.  Interning them through one table lets every attribute
+dict point at the same string object instead of a fresh copy per row.
+
+The table also assigns each symbol a small integer id.  ``encode_symbols``
+and ``decode_symbols`` use file‑local ids to dictionary-encode these
+fields in node-link data written by ``ReasoningGraph.save``.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Any, Dict, List, Tuple
+
+# Attribute names whose values are dictionary-encoded when saving.  In
+# node-link data a link's ``source`` and ``target`` are its endpoints,
+# so links only encode their relation.
+SYMBOL_FIELDS: Tuple[str, ...] = ("relation", "type", "source")
+LINK_SYMBOL_FIELDS: Tuple[str, ...] = ("relation",)
+
+
+class SymbolTable:
+    """Map strings to canonical objects and dense integer ids."""
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._values: List[str] = []
+
+    def intern(self, value: Any) -> Any:
+        """Return the canonical object for ``value``; non-strings pass through."""
+        if not isinstance(value, str):
+            return value
+        idx = self._ids.get(value)
+        if idx is None:
+            value = sys.intern(value)
+            idx = len(self._values)
+            self._ids[value] = idx
+            self._values.append(value)
+        return self._values[idx]
+
+    def id_of(self, value: str) -> int:
+        """Return the id of ``value``, adding it to the table if needed."""
+        self.intern(value)
+        return self._ids[value]
+
+    def value_of(self, idx: int) -> str:
+        return self._values[idx]
+
+    def values(self) -> List[str]:
+        return list(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __contains__(self, value: object) -> bool:
+        return value in self._ids
+
+
+# Process-wide table used by the graph and the ingestion helpers.
+symbols = SymbolTable()
+
+
+def intern_symbol(value: Any) -> Any:
+    """Intern ``value`` through the shared symbol table."""
+    return symbols.intern(value)
+
+
+def links_key(data: Dict[str, Any]) -> str:
+    """Return the key of the link list: ``"edges"`` in newer NetworkX, else ``"links"``."""
+    return "edges" if "edges" in data and "links" not in data else "links"
+
+
+def encode_symbols(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Dictionary-encode symbol fields in node-link data.
+
+    String values of ``SYMBOL_FIELDS`` in nodes and ``LINK_SYMBOL_FIELDS``
+    in links are replaced by integer ids into a table stored under
+    ``graph["symbols"]``.  The input is not modified.
+    """
+    table = SymbolTable()
+
+    def encode(item: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+        out = dict(item)
+        for key in fields:
+            value = out.get(key)
+            if isinstance(value, str):
+                out[key] = table.id_of(value)
+        return out
+
+    links = links_key(data)
+    encoded = dict(data)
+    encoded["nodes"] = [encode(node, SYMBOL_FIELDS) for node in data.get("nodes", [])]
+    encoded[links] = [encode(link, LINK_SYMBOL_FIELDS) for link in data.get(links, [])]
+    graph_attrs = dict(data.get("graph") or {})
+    graph_attrs["symbols"] = table.values()
+    graph_attrs["symbol_fields"] = list(SYMBOL_FIELDS)
+    graph_attrs["link_symbol_fields"] = list(LINK_SYMBOL_FIELDS)
+    encoded["graph"] = graph_attrs
+    return encoded
+
+
+def decode_symbols(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Reverse ``encode_symbols``.
+
+    Values of ``SYMBOL_FIELDS`` are interned through the shared table
+    whether or not the data was encoded, so a loaded graph shares its
+    relation and type strings with freshly ingested ones.
+    """
+    graph_attrs = data.get("graph") or {}
+    values = [intern_symbol(v) for v in graph_attrs.get("symbols", [])]
+    node_fields = tuple(graph_attrs.get("symbol_fields", SYMBOL_FIELDS))
+    # Files written before links were encoded separately used the node
+    # fields for links as well.
+    link_fields = tuple(graph_attrs.get("link_symbol_fields",
+                                        node_fields if values else LINK_SYMBOL_FIELDS))
+
+    def decode(item: Dict[str, Any], fields: Tuple[str, ...]) -> Dict[str, Any]:
+        out = dict(item)
+        for key in fields:
+            value = out.get(key)
+            if isinstance(value, int) and not isinstance(value, bool) and values:
+                out[key] = values[value]
+            elif isinstance(value, str):
+                out[key] = intern_symbol(value)
+        return out
+
+    links = links_key(data)
+    decoded = dict(data)
+    decoded["nodes"] = [decode(node, node_fields) for node in data.get("nodes", [])]
+    decoded[links] = [decode(link, link_fields) for link in data.get(links, [])]
+    decoded["graph"] = {k: v for k, v in graph_attrs.items()
+                        if k not in ("symbols", "symbol_fields", "link_symbol_fields")}
+    return decoded
@@ -2,6 +2,41 @@
 
 from __future__ import annotations
 
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Optional, Set
+
 def clamp(value: float, lower: float, upper: float) -> float:
     """Clamp a value between a lower and upper bound."""
-    return max(lower, min(upper, value))
\ No newline at end of file
+    return max(lower, min(upper, value))
+
+# Modules ``lazy_import`` found to be missing; searching again is slow.
+_missing: Set[str] = set()
+
+
+def lazy_import(name: str) -> Optional[ModuleType]:
+    """Return module ``name``, executed on first attribute access, or None if it is not installed.
+
+    Heavy optional dependencies such as NetworkX and NumPy are bound this
+    way at module level, so importing ULTIMAI does not pay for them until
+    a code path actually uses them.
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    if name in _missing:
+        return None
+    try:
+        spec = importlib.util.find_spec(name)
+    except (ImportError, ValueError):
+        spec = None
+    if spec is None or spec.loader is None:
+        _missing.add(name)
+        return None
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
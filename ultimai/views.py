@@ -0,0 +1,272 @@
+"""Read-only subgraph views over a parent graph.
+
+``SubgraphView`` exposes a node subset of a parent graph, optionally
+restricted to edges with certain relations, through the read side of
+the ``DiGraph`` surface (``nodes``, ``edges``, ``adj``, ``pred``,
+``degree`` ...).  Nothing is copied: attribute dicts are the parent's,
+wrapped in read-only proxies, and neighbour mappings filter the
+parent's adjacency on the fly.  The critic, the explainability helpers
+and the renderers accept a view wherever they accept a graph; call
+``materialise`` when an independent, mutable copy is needed.
+
+``neighbourhood`` builds the view of all nodes within ``k`` hops of a
+node.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from .utils import lazy_import
+
+# NetworkX is loaded on first use; the local stub stands in without it.
+nx = lazy_import("networkx")
+if nx is None:  # pragma: no cover
+    from . import networkx_stub as nx  # type: ignore
+
+RelationFilter = Optional[Callable[[Dict[str, Any]], bool]]
+
+DIRECTIONS = ("out", "in", "both")
+
+
+def relation_predicate(relations: Any) -> RelationFilter:
+    """Turn a collection of relation names (or a predicate) into an edge predicate."""
+    if relations is None or callable(relations):
+        return relations
+    allowed = {relations} if isinstance(relations, str) else set(relations)
+    return lambda attrs: attrs.get("relation") in allowed
+
+
+class _Neighbours(Mapping):
+    """The parent's neighbour dict of one node, filtered by the view."""
+
+    def __init__(self, view: "SubgraphView", nbrs: Any) -> None:
+        self._view = view
+        self._nbrs = nbrs
+
+    def _keep(self, v: Any, attrs: Dict[str, Any]) -> bool:
+        view = self._view
+        return v in view._node_set and (view._edge_ok is None or view._edge_ok(attrs))
+
+    def __getitem__(self, v: Any) -> Any:
+        attrs = self._nbrs[v]
+        if not self._keep(v, attrs):
+            raise KeyError(v)
+        return MappingProxyType(attrs)
+
+    def __iter__(self) -> Iterator[Any]:
+        for v, attrs in self._nbrs.items():
+            if self._keep(v, attrs):
+                yield v
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, v: object) -> bool:
+        attrs = self._nbrs.get(v)
+        return attrs is not None and self._keep(v, attrs)
+
+
+class _Adjacency(Mapping):
+    def __init__(self, view: "SubgraphView", parent_adj: Any) -> None:
+        self._view = view
+        self._parent_adj = parent_adj
+
+    def __getitem__(self, node: Any) -> _Neighbours:
+        if node not in self._view._node_set:
+            raise KeyError(node)
+        return _Neighbours(self._view, self._parent_adj[node])
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._view._node_list)
+
+    def __len__(self) -> int:
+        return len(self._view._node_list)
+
+    def __contains__(self, node: object) -> bool:
+        return node in self._view._node_set
+
+
+class _NodeView:
+    def __init__(self, view: "SubgraphView") -> None:
+        self._view = view
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._view._node_list)
+
+    def __len__(self) -> int:
+        return len(self._view._node_list)
+
+    def __contains__(self, node: Any) -> bool:
+        return node in self._view._node_set
+
+    def __getitem__(self, node: Any) -> Any:
+        if node not in self._view._node_set:
+            raise KeyError(node)
+        return MappingProxyType(self._view._parent_attrs(node))
+
+    def __call__(self, data: bool = False) -> Iterable[Any]:
+        return self._view.nodes_iter(data=data)
+
+
+class _EdgeView:
+    def __init__(self, view: "SubgraphView") -> None:
+        self._view = view
+
+    def __iter__(self) -> Iterator[Tuple[Any, Any]]:
+        return self._view.edges_iter()
+
+    def __len__(self) -> int:
+        return self._view.number_of_edges()
+
+    def __call__(self, data: bool = False) -> Iterator[Any]:
+        return self._view.edges_iter(data=data)
+
+
+class SubgraphView:
+    """A read-only view of ``nodes`` and the edges between them in ``parent``."""
+
+    def __init__(self, parent: Any, nodes: Iterable[Any], relations: Any = None) -> None:
+        self.parent = parent
+        self._node_list: List[Any] = []
+        self._node_set: Set[Any] = set()
+        for n in nodes:
+            if n not in self._node_set and parent.has_node(n):
+                self._node_set.add(n)
+                self._node_list.append(n)
+        self._edge_ok = relation_predicate(relations)
+
+    def _parent_attrs(self, node: Any) -> Dict[str, Any]:
+        attrs = getattr(self.parent, "nodes_attr", None)
+        return attrs[node] if attrs is not None else self.parent.nodes[node]
+
+    # ------------------------------------------------------------------
+    # DiGraph surface
+    def has_node(self, node: Any) -> bool:
+        return node in self._node_set
+
+    def __contains__(self, node: Any) -> bool:
+        return node in self._node_set
+
+    def __len__(self) -> int:
+        return len(self._node_list)
+
+    def has_edge(self, u: Any, v: Any) -> bool:
+        return u in self._node_set and v in self.adj[u]
+
+    def get_edge_data(self, u: Any, v: Any) -> Optional[Any]:
+        if not self.has_edge(u, v):
+            return None
+        return self.adj[u][v]
+
+    @property
+    def adj(self) -> _Adjacency:
+        return _Adjacency(self, self.parent.adj)
+
+    @property
+    def pred(self) -> _Adjacency:
+        return _Adjacency(self, self.parent.pred)
+
+    @property
+    def nodes(self) -> _NodeView:
+        return _NodeView(self)
+
+    @property
+    def edges(self) -> _EdgeView:
+        return _EdgeView(self)
+
+    def nodes_iter(self, data: bool = False) -> Iterator[Any]:
+        for n in self._node_list:
+            yield (n, MappingProxyType(self._parent_attrs(n))) if data else n
+
+    def edges_iter(self, data: bool = False) -> Iterator[Any]:
+        adj = self.adj
+        for u in self._node_list:
+            nbrs = adj[u]
+            for v in nbrs:
+                yield (u, v, nbrs[v]) if data else (u, v)
+
+    def degree(self) -> Iterator[Tuple[Any, int]]:
+        adj, pred = self.adj, self.pred
+        for n in self._node_list:
+            yield (n, len(adj[n]) + len(pred[n]))
+
+    def out_degree(self, n: Any) -> int:
+        return len(self.adj[n])
+
+    def in_degree(self, n: Any) -> int:
+        return len(self.pred[n])
+
+    def neighbors(self, n: Any) -> List[Any]:
+        return list(self.adj[n])
+
+    def successors(self, n: Any) -> Iterator[Any]:
+        return iter(self.adj[n])
+
+    def predecessors(self, n: Any) -> Iterator[Any]:
+        return iter(self.pred[n])
+
+    def number_of_nodes(self) -> int:
+        return len(self._node_list)
+
+    def number_of_edges(self) -> int:
+        return sum(len(self.adj[u]) for u in self._node_list)
+
+    def subgraph(self, nodes: Iterable[Any]) -> "SubgraphView":
+        """Return a view of ``nodes`` restricted to this view."""
+        return SubgraphView(self.parent, (n for n in nodes if n in self._node_set), self._edge_ok)
+
+    def materialise(self) -> Any:
+        """Return an independent graph holding copies of the visible nodes and edges."""
+        g = nx.DiGraph()
+        for n in self._node_list:
+            g.add_node(n, **dict(self._parent_attrs(n)))
+        for u, v, attrs in self.edges_iter(data=True):
+            g.add_edge(u, v, **dict(attrs))
+        return g
+
+    copy = materialise
+
+    def add_node(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("SubgraphView is read-only; call materialise() for a mutable copy")
+
+    add_edge = add_node
+
+
+def neighbourhood(g: Any, node: Any, k: int = 1, direction: str = "both",
+                  relations: Any = None) -> SubgraphView:
+    """Return a view of the nodes within ``k`` hops of ``node``.
+
+    ``direction`` is ``"out"`` (follow edges forward), ``"in"``
+    (backward) or ``"both"``.  ``relations`` restricts both the edges
+    followed and the edges visible in the view to the given relation
+    names, or to edges accepted by a predicate on their attributes.
+    """
+    if direction not in DIRECTIONS:
+        raise ValueError(f"direction must be one of {DIRECTIONS}, not {direction!r}")
+    if not g.has_node(node):
+        raise nx.NodeNotFound(f"Node {node!r} not found in graph")
+    edge_ok = relation_predicate(relations)
+    sides = []
+    if direction in ("out", "both"):
+        sides.append(g.adj)
+    if direction in ("in", "both"):
+        sides.append(g.pred)
+    seen = {node}
+    order = [node]
+    frontier = [node]
+    for _ in range(k):
+        nxt = []
+        for u in frontier:
+            for side in sides:
+                for v, attrs in side[u].items():
+                    if v not in seen and (edge_ok is None or edge_ok(attrs)):
+                        seen.add(v)
+                        order.append(v)
+                        nxt.append(v)
+        if not nxt:
+            break
+        frontier = nxt
+    return SubgraphView(g, order, edge_ok)